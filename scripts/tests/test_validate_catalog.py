@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import unittest
+
+from scripts.validate_catalog import check_bundle_budget, default_budget, main, resolve_budget
+
+
+class BundleBudgetTests(unittest.TestCase):
+    def test_default_budget_follows_upload_limit(self) -> None:
+        original = os.environ.get("TOOLKIT_UPLOAD_MAX_BYTES")
+        os.environ["TOOLKIT_UPLOAD_MAX_BYTES"] = "1234"
+        try:
+            budget = default_budget()
+        finally:
+            if original is None:
+                os.environ.pop("TOOLKIT_UPLOAD_MAX_BYTES", None)
+            else:
+                os.environ["TOOLKIT_UPLOAD_MAX_BYTES"] = original
+
+        self.assertEqual(budget["max_compressed_bytes"], 1234)
+        self.assertIsNone(budget["max_files"])
+
+    def test_manifest_budget_and_overrides_merge(self) -> None:
+        manifest = {"bundle_budget": {"max_files": 50, "max_file_bytes": 1000}}
+        budget, issues = resolve_budget("sample-toolkit", manifest, {"max_files": 5, "max_file_bytes": None})
+
+        self.assertEqual(issues, [])
+        self.assertEqual(budget["max_files"], 5)
+        self.assertEqual(budget["max_file_bytes"], 1000)
+
+    def test_invalid_manifest_budget_is_reported(self) -> None:
+        manifest = {"bundle_budget": {"max_files": -1, "max_widgets": 3}}
+        _, issues = resolve_budget("sample-toolkit", manifest, {})
+
+        self.assertEqual(len(issues), 2)
+
+    def test_non_positive_overrides_are_rejected(self) -> None:
+        budget, issues = resolve_budget("sample-toolkit", {}, {"max_files": 0, "max_file_bytes": -5})
+
+        self.assertEqual(
+            issues,
+            ["--max-files must be a positive integer, got 0", "--max-file-bytes must be a positive integer, got -5"],
+        )
+        self.assertIsNone(budget["max_files"])
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            main(["--strict", "--max-files", "0"])
+
+    def test_budget_within_limits_passes(self) -> None:
+        self.assertEqual(check_bundle_budget("sample-toolkit", default_budget()), [])
+
+    def test_exceeded_budget_lists_top_contributors(self) -> None:
+        budget = default_budget()
+        budget["max_files"] = 1
+        budget["max_compressed_bytes"] = 1
+
+        issues = check_bundle_budget("sample-toolkit", budget)
+
+        self.assertTrue(any("compressed (budget 1)" in issue for issue in issues))
+        self.assertTrue(any("files (budget 1)" in issue for issue in issues))
+        self.assertIn("Top contributors by compressed size", issues[-1])
+        self.assertIn("sample-toolkit/", issues[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,30 @@
 #!/usr/bin/env python3
 import argparse
+import io
 import json
 import re
 import sys
+import zipfile
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+
+if __package__ is None or __package__ == "":  # pragma: no cover - module side effect
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.build_toolkit_bundle import build_bundle_bytes
+from toolkit_bundle_service import max_upload_bytes
+
 CATALOG_PATH = REPO_ROOT / "catalog" / "toolkits.json"
 DOCS_TOOLKIT_ROOT = REPO_ROOT / "docs" / "toolkits"
 SLUG_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]*$")
+BUDGET_KEYS = (
+    "max_compressed_bytes",
+    "max_uncompressed_bytes",
+    "max_files",
+    "max_file_bytes",
+)
+TOP_CONTRIBUTORS = 5
 
 
 def load_catalog() -> dict:
@@ -18,7 +34,91 @@ def load_catalog() -> dict:
         return json.load(handle)
 
 
-def validate_entry(slug: str, entry: dict, *, strict: bool) -> list[str]:
+def default_budget() -> dict[str, int | None]:
+    """Return bundle budgets applied when a manifest does not override them.
+
+    The compressed limit is the bundler's own ``max_upload_bytes`` so strict
+    validation fails before the bundler would answer ``413``.
+    """
+
+    budget: dict[str, int | None] = dict.fromkeys(BUDGET_KEYS)
+    budget["max_compressed_bytes"] = max_upload_bytes()
+    return budget
+
+
+def resolve_budget(
+    slug: str,
+    manifest_data: dict,
+    overrides: dict[str, int | None],
+) -> tuple[dict[str, int | None], list[str]]:
+    """Merge defaults, the manifest ``bundle_budget`` block, and CLI overrides."""
+
+    issues: list[str] = []
+    budget = default_budget()
+    manifest_budget = manifest_data.get("bundle_budget")
+    if manifest_budget is not None and not isinstance(manifest_budget, dict):
+        issues.append(f"toolkits/{slug}/toolkit.json bundle_budget must be an object")
+        manifest_budget = None
+    for key, value in (manifest_budget or {}).items():
+        if key not in BUDGET_KEYS:
+            issues.append(f"toolkits/{slug}/toolkit.json bundle_budget has unknown key '{key}'")
+        elif not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+            issues.append(f"toolkits/{slug}/toolkit.json bundle_budget.{key} must be a positive integer")
+        else:
+            budget[key] = value
+    for key, value in overrides.items():
+        if value is None:
+            continue
+        if value <= 0:
+            issues.append(f"--{key.replace('_', '-')} must be a positive integer, got {value}")
+        else:
+            budget[key] = value
+    return budget, issues
+
+
+def check_bundle_budget(slug: str, budget: dict[str, int | None]) -> list[str]:
+    """Build the bundle for *slug* and report every budget it exceeds."""
+
+    data = build_bundle_bytes(slug)
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        members = [info for info in archive.infolist() if not info.is_dir()]
+
+    uncompressed = sum(info.file_size for info in members)
+    largest = max(members, key=lambda info: info.file_size, default=None)
+
+    issues: list[str] = []
+    limit = budget.get("max_compressed_bytes")
+    if limit is not None and len(data) > limit:
+        issues.append(f"Bundle for {slug} is {len(data)} bytes compressed (budget {limit})")
+    limit = budget.get("max_uncompressed_bytes")
+    if limit is not None and uncompressed > limit:
+        issues.append(f"Bundle for {slug} is {uncompressed} bytes uncompressed (budget {limit})")
+    limit = budget.get("max_files")
+    if limit is not None and len(members) > limit:
+        issues.append(f"Bundle for {slug} contains {len(members)} files (budget {limit})")
+    limit = budget.get("max_file_bytes")
+    if limit is not None and largest is not None and largest.file_size > limit:
+        issues.append(
+            f"Largest file in {slug} bundle is {largest.filename} at {largest.file_size} bytes (budget {limit})"
+        )
+
+    if issues:
+        contributors = sorted(members, key=lambda info: info.compress_size, reverse=True)
+        lines = [
+            f"{info.filename}: {info.compress_size} bytes compressed, {info.file_size} bytes uncompressed"
+            for info in contributors[:TOP_CONTRIBUTORS]
+        ]
+        issues.append("Top contributors by compressed size:\n      " + "\n      ".join(lines))
+    return issues
+
+
+def validate_entry(
+    slug: str,
+    entry: dict,
+    *,
+    strict: bool,
+    budget_overrides: dict[str, int | None] | None = None,
+) -> list[str]:
     issues: list[str] = []
     if not SLUG_PATTERN.match(slug):
         issues.append(f"Invalid slug '{slug}': expected lowercase letters, numbers, hyphens, or underscores")
@@ -37,6 +137,10 @@ def validate_entry(slug: str, entry: dict, *, strict: bool) -> list[str]:
         else:
             if manifest_data.get("slug") != slug:
                 issues.append(f"Manifest slug mismatch for {slug}")
+            budget, budget_issues = resolve_budget(slug, manifest_data, budget_overrides or {})
+            issues.extend(budget_issues)
+            if toolkit_dir.exists():
+                issues.extend(check_bundle_budget(slug, budget))
     required_fields = {
         "name",
         "version",
@@ -91,11 +195,30 @@ def validate_entry(slug: str, entry: dict, *, strict: bool) -> list[str]:
     return issues
 
 
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}") from None
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {number}")
+    return number
+
+
 def main(argv: list[str]) -> int:
     parser = argparse.ArgumentParser(description="Validate toolkit catalog metadata")
     parser.add_argument("--toolkit", help="Validate a single toolkit slug")
-    parser.add_argument("--strict", action="store_true", help="Perform extra manifest checks")
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Perform extra manifest checks and enforce bundle size budgets",
+    )
+    parser.add_argument("--max-compressed-bytes", type=_positive_int, help="Override the compressed bundle budget")
+    parser.add_argument("--max-uncompressed-bytes", type=_positive_int, help="Override the uncompressed bundle budget")
+    parser.add_argument("--max-files", type=_positive_int, help="Override the bundle file-count budget")
+    parser.add_argument("--max-file-bytes", type=_positive_int, help="Override the largest-file budget")
     args = parser.parse_args(argv)
+    budget_overrides = {key: getattr(args, key) for key in BUDGET_KEYS}
 
     catalog = load_catalog()
     entries = catalog.get("toolkits", [])
@@ -109,7 +232,7 @@ def main(argv: list[str]) -> int:
     failures = 0
     for slug in slugs:
         entry = entry_map[slug]
-        issues = validate_entry(slug, entry, strict=args.strict)
+        issues = validate_entry(slug, entry, strict=args.strict, budget_overrides=budget_overrides)
         if issues:
             failures += 1
             print(f"[FAIL] {slug}")
@@ -17,6 +17,18 @@ DEFAULT_MAX_BYTES = 50 * 1024 * 1024
 SLUG_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]*$")
 
 
+def max_upload_bytes() -> int:
+    """Largest bundle served, from ``TOOLKIT_UPLOAD_MAX_BYTES`` or the default."""
+
+    max_bytes_env = os.getenv("TOOLKIT_UPLOAD_MAX_BYTES")
+    if max_bytes_env:
+        try:
+            return int(max_bytes_env)
+        except ValueError:
+            return DEFAULT_MAX_BYTES
+    return DEFAULT_MAX_BYTES
+
+
 def _parse_slug(path: str) -> str | None:
     if not path.startswith("/toolkits/"):
         return None
@@ -103,16 +115,7 @@ def application(environ: Environ, start_response: StartResponse) -> Iterable[byt
     except FileNotFoundError:
         return _not_found(start_response)
 
-    max_bytes_env = os.getenv("TOOLKIT_UPLOAD_MAX_BYTES")
-    if max_bytes_env:
-        try:
-            max_bytes = int(max_bytes_env)
-        except ValueError:
-            max_bytes = DEFAULT_MAX_BYTES
-    else:
-        max_bytes = DEFAULT_MAX_BYTES
-
-    if len(bundle) > max_bytes:
+    if len(bundle) > max_upload_bytes():
         return _payload_too_large(start_response)
 
     headers = [
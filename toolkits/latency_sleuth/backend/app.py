@@ -1,38 +1,88 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import asyncio
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Literal, Optional
 
-from fastapi import APIRouter, HTTPException, Response, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
 
 from toolkit_runtime import jobs as job_store
 from toolkit_runtime import enqueue_job
 
+from . import codec
+from .job_events import job_event_hub
 from .models import (
+    DriftState,
     LatencyHeatmap,
+    LatencyPercentiles,
     ProbeExecutionSummary,
+    ProbeMode,
     ProbeTemplate,
     ProbeTemplateCreate,
+    ProbeTemplatePage,
     ProbeTemplateUpdate,
+    SlaReplay,
+    utcnow,
 )
+from .notifications import preview_notifications
 from .probes import execute_probe
+from .replay import replay_sla
 from .storage import (
     build_heatmap,
+    build_rollup_heatmap,
+    claim_job_index_backfill,
     create_template,
     delete_template,
+    encode_cursor,
+    get_drift_state,
     get_template,
+    import_templates,
+    index_job,
+    index_jobs,
+    is_valid_template_id,
+    iter_history_samples,
+    iter_template_ids,
+    iter_template_records,
+    latency_percentiles,
     list_history,
+    list_template_tags,
     list_templates,
+    load_replay_log,
+    publish_job_event,
+    release_job_index_backfill,
+    request_job_cancellation,
+    scan_job_index,
+    search_templates,
+    set_active_job,
+    unindex_jobs,
     update_template,
 )
 
 
 router = APIRouter()
 
+IMPORT_CHUNK_SIZE = 500
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+JOB_PAGE_SCAN_LIMIT = 1000
+JOB_FETCH_CONCURRENCY = 16
+JOB_EVENTS_KEEPALIVE_SECONDS = 15.0
+MAX_SLA_REPLAY_CANDIDATES = 1000
+HISTORY_EXPORT_BATCH_ROWS = 1000
+HISTORY_EXPORT_FIELDS = ("template_id", "recorded_at", "attempt", "latency_ms", "failed")
+
 
 class ProbeRunRequest(BaseModel):
     sample_size: int = Field(default=3, ge=1, le=20)
     latency_overrides: Optional[List[float]] = None
+    mode: Optional[ProbeMode] = None
 
 
 @router.get("/probe-templates", response_model=List[ProbeTemplate])
@@ -40,6 +90,216 @@ def probe_templates_index() -> List[ProbeTemplate]:
     return sorted(list_templates(), key=lambda template: template.created_at)
 
 
+@router.get("/probe-templates:search", response_model=ProbeTemplatePage)
+def probe_templates_search(
+    tag: List[str] = Query(default=[]),
+    name_prefix: Optional[str] = None,
+    sla_min: Optional[int] = Query(default=None, ge=0),
+    sla_max: Optional[int] = Query(default=None, ge=0),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> ProbeTemplatePage:
+    try:
+        templates, next_cursor = search_templates(
+            tags=tag,
+            name_prefix=name_prefix,
+            sla_min=sla_min,
+            sla_max=sla_max,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from None
+    return ProbeTemplatePage(templates=templates, next_cursor=next_cursor, tags=list_template_tags())
+
+
+class TemplateImportError(BaseModel):
+    line: int
+    error: str
+
+
+class TemplateImportResult(BaseModel):
+    imported: int
+    errors: List[TemplateImportError] = Field(default_factory=list)
+
+
+_TEMPLATE_BATCH = TypeAdapter(List[ProbeTemplateCreate])
+TEMPLATE_ID_ERROR = "id: must be 1-128 letters, digits, '-' or '_'"
+
+
+def _describe_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
+
+
+def _import_id(data: Dict[str, Any]) -> Optional[str]:
+    template_id = data.get("id")
+    return template_id if isinstance(template_id, str) and template_id else None
+
+
+def _import_chunk(rows: List[tuple[int, Dict[str, Any]]]) -> tuple[int, List[TemplateImportError]]:
+    """Validate a chunk of parsed lines as one batch and write the valid ones in one pipeline."""
+
+    errors: List[TemplateImportError] = []
+    valid_rows = []
+    for line, data in rows:
+        template_id = _import_id(data)
+        if template_id and not is_valid_template_id(template_id):
+            errors.append(TemplateImportError(line=line, error=TEMPLATE_ID_ERROR))
+        else:
+            valid_rows.append((line, data))
+    rows = valid_rows
+    try:
+        payloads = _TEMPLATE_BATCH.validate_python([data for _, data in rows])
+        items = [(_import_id(data), payload) for (_, data), payload in zip(rows, payloads)]
+    except ValidationError:
+        # Fall back to line-by-line validation only to attribute errors to their lines.
+        items = []
+        for line, data in rows:
+            try:
+                items.append((_import_id(data), ProbeTemplateCreate.model_validate(data)))
+            except ValidationError as exc:
+                errors.append(TemplateImportError(line=line, error=_describe_validation_error(exc)))
+    return import_templates(items), errors
+
+
+async def _ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+@router.post("/probe-templates:import", response_model=TemplateImportResult)
+async def probe_templates_import(request: Request) -> TemplateImportResult:
+    """Create or replace templates from newline-delimited JSON, one template per line.
+
+    The body is read as a stream and written in chunks of ``IMPORT_CHUNK_SIZE``
+    lines. Lines that are not valid templates are reported with their line
+    number and skipped; the rest of the stream is still imported.
+    """
+
+    result = TemplateImportResult(imported=0)
+    rows: List[tuple[int, Dict[str, Any]]] = []
+
+    async def flush() -> None:
+        imported, errors = await run_in_threadpool(_import_chunk, rows.copy())
+        result.imported += imported
+        result.errors.extend(errors)
+        rows.clear()
+
+    line_number = 0
+    async for line in _ndjson_lines(request.stream()):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            result.errors.append(TemplateImportError(line=line_number, error=f"Invalid JSON: {exc}"))
+            continue
+        if not isinstance(data, dict):
+            result.errors.append(TemplateImportError(line=line_number, error="Expected a JSON object"))
+            continue
+        rows.append((line_number, data))
+        if len(rows) >= IMPORT_CHUNK_SIZE:
+            await flush()
+    if rows:
+        await flush()
+    result.errors.sort(key=lambda error: error.line)
+    return result
+
+
+@router.get("/probe-templates:export")
+def probe_templates_export() -> StreamingResponse:
+    """Stream every template as newline-delimited JSON, in the format the import accepts."""
+
+    return StreamingResponse(
+        (f"{record}\n" for record in iter_template_records()),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="latency-sleuth-templates.ndjson"'},
+    )
+
+
+def _history_export_rows(
+    template_ids: Iterable[str], start: Optional[datetime], end: Optional[datetime]
+) -> Iterator[tuple]:
+    for template_id in template_ids:
+        for sample in iter_history_samples(template_id, start, end):
+            recorded_at = datetime.fromtimestamp(sample.sampled_at_ms / 1000, timezone.utc)
+            yield (
+                template_id,
+                recorded_at.isoformat(timespec="milliseconds"),
+                sample.attempt,
+                sample.latency_ms,
+                sample.failed,
+            )
+
+
+def _ndjson_batches(rows: Iterator[tuple]) -> Iterator[str]:
+    batch: List[str] = []
+    for row in rows:
+        batch.append(codec.dumps(dict(zip(HISTORY_EXPORT_FIELDS, row))))
+        if len(batch) >= HISTORY_EXPORT_BATCH_ROWS:
+            yield "\n".join(batch) + "\n"
+            batch.clear()
+    if batch:
+        yield "\n".join(batch) + "\n"
+
+
+def _csv_batches(rows: Iterator[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(HISTORY_EXPORT_FIELDS)
+    for count, (template_id, recorded_at, attempt, latency_ms, failed) in enumerate(rows, start=1):
+        writer.writerow((template_id, recorded_at, attempt, latency_ms, "true" if failed else "false"))
+        if count % HISTORY_EXPORT_BATCH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get("/probe-history:export")
+def probe_history_export(
+    template_id: List[str] = Query(default=[]),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    export_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+) -> StreamingResponse:
+    """Stream retained samples in ``[start, end)`` for the given templates, or the whole fleet.
+
+    Rows are ordered by template, then oldest first; templates and samples are
+    read incrementally so memory stays flat for any range.
+    """
+
+    window_start = _as_utc(start) if start else None
+    window_end = _as_utc(end) if end else None
+    if window_start and window_end and window_start >= window_end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    template_ids = list(dict.fromkeys(template_id))
+    for requested in template_ids:
+        if not get_template(requested):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Template {requested} not found")
+
+    rows = _history_export_rows(template_ids or iter_template_ids(), window_start, window_end)
+    if export_format == "csv":
+        body, media_type = _csv_batches(rows), "text/csv"
+    else:
+        body, media_type = _ndjson_batches(rows), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="latency-sleuth-history.{export_format}"'},
+    )
+
+
 @router.post(
     "/probe-templates",
     response_model=ProbeTemplate,
@@ -82,11 +342,15 @@ def probe_templates_preview(template_id: str, payload: ProbeRunRequest | None =
     if not template:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
     params = payload or ProbeRunRequest()
-    return execute_probe(
+    # Previews answer inside the API request, so they only reach the target when asked to.
+    summary = execute_probe(
         template,
         sample_size=params.sample_size,
         overrides=params.latency_overrides,
+        mode=params.mode or "simulated",
     )
+    summary.notified_channels = [event.channel for event in preview_notifications(template, summary)]
+    return summary
 
 
 @router.post(
@@ -105,17 +369,119 @@ def probe_templates_run(template_id: str, payload: ProbeRunRequest | None = None
             "template_id": template_id,
             "sample_size": params.sample_size,
             "latency_overrides": params.latency_overrides,
+            "mode": params.mode,
         },
     )
+    index_job(job)
+    set_active_job(template_id, job["id"])
     return {"job": job}
 
 
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _resolve_window(start: Optional[datetime], end: Optional[datetime]) -> tuple[datetime, datetime]:
+    """Default to the 24 hours before *end* (or now); naive timestamps are taken as UTC."""
+
+    window_end = _as_utc(end) if end else utcnow()
+    window_start = _as_utc(start) if start else window_end - timedelta(hours=24)
+    if window_start >= window_end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    return window_start, window_end
+
+
 @router.get("/probe-templates/{template_id}/heatmap", response_model=LatencyHeatmap)
-def probe_templates_heatmap(template_id: str, columns: int = 6) -> LatencyHeatmap:
+def probe_templates_heatmap(
+    template_id: str,
+    columns: int = 6,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket_seconds: Optional[int] = Query(default=None, ge=60),
+) -> LatencyHeatmap:
+    template = get_template(template_id)
+    if not template:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    if start is None and end is None and bucket_seconds is None:
+        return build_heatmap(template_id, columns=columns)
+    window_start, window_end = _resolve_window(start, end)
+    return build_rollup_heatmap(
+        template_id, window_start, window_end, bucket_seconds=bucket_seconds, columns=columns
+    )
+
+
+@router.get("/probe-templates/{template_id}/drift", response_model=DriftState)
+def probe_templates_drift(template_id: str) -> DriftState:
+    template = get_template(template_id)
+    if not template:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    return get_drift_state(template_id)
+
+
+@router.get("/probe-templates/{template_id}/percentiles", response_model=LatencyPercentiles)
+def probe_templates_percentiles(
+    template_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> LatencyPercentiles:
     template = get_template(template_id)
     if not template:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
-    return build_heatmap(template_id, columns=columns)
+    window_start, window_end = _resolve_window(start, end)
+    return latency_percentiles(template_id, window_start, window_end)
+
+
+@router.get("/probe-templates/{template_id}/sla-replay", response_model=SlaReplay)
+def probe_templates_sla_replay(
+    template_id: str,
+    sla_ms: List[int] = Query(default=[]),
+    sweep_start: Optional[int] = Query(default=None, ge=1),
+    sweep_stop: Optional[int] = Query(default=None, ge=1),
+    sweep_step: int = Query(default=50, ge=1),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> SlaReplay:
+    """Replay the stored samples against candidate SLAs (``sla_ms`` and/or an inclusive sweep).
+
+    Without candidates the current SLA is replayed; without a window every
+    retained sample is.
+    """
+
+    template = get_template(template_id)
+    if not template:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    if (sweep_start is None) != (sweep_stop is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="sweep_start and sweep_stop go together"
+        )
+    candidates = set(sla_ms)
+    if sweep_start is not None and sweep_stop is not None:
+        if sweep_start > sweep_stop:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="sweep_start must not exceed sweep_stop"
+            )
+        if (sweep_stop - sweep_start) // sweep_step >= MAX_SLA_REPLAY_CANDIDATES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Too many candidate SLAs")
+        candidates.update(range(sweep_start, sweep_stop + 1, sweep_step))
+    if any(candidate < 1 for candidate in candidates):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Candidate SLAs must be positive")
+    if len(candidates) > MAX_SLA_REPLAY_CANDIDATES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Too many candidate SLAs")
+    window_start = _as_utc(start) if start else None
+    window_end = _as_utc(end) if end else None
+    if window_start and window_end and window_start >= window_end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+
+    log = load_replay_log(template_id, window_start, window_end)
+    return SlaReplay(
+        template_id=template_id,
+        current_sla_ms=template.sla_ms,
+        start=window_start or (datetime.fromtimestamp(log.epochs[0], timezone.utc) if log.epochs else None),
+        end=window_end or (datetime.fromtimestamp(log.epochs[-1], timezone.utc) if log.epochs else None),
+        run_count=log.run_count,
+        sample_count=len(log.latencies),
+        candidates=replay_sla(log, sorted(candidates or {template.sla_ms}), template.notification_rules),
+    )
 
 
 @router.get("/probe-templates/{template_id}/history", response_model=List[ProbeExecutionSummary])
@@ -127,12 +493,92 @@ def probe_templates_history(template_id: str, limit: int = 10) -> List[ProbeExec
     return [entry.summary for entry in history]
 
 
+def _ensure_job_index() -> None:
+    """Index jobs created before the job indexes existed, once per deployment."""
+
+    if claim_job_index_backfill():
+        try:
+            jobs, _ = job_store.list_jobs(toolkits=["latency-sleuth"])
+            index_jobs(jobs)
+        except Exception:
+            release_job_index_backfill()
+            raise
+
+
+def _get_jobs(job_ids: List[str]) -> List[Optional[dict]]:
+    """Fetch the records for *job_ids* in order, ``None`` for jobs that no longer exist.
+
+    The runtime owns the job record layout, so a page is read through its bulk
+    reader when it offers one; otherwise the per-job reads overlap instead of
+    paying one round trip after another.
+    """
+
+    get_jobs = getattr(job_store, "get_jobs", None)
+    if get_jobs is not None:
+        return list(get_jobs(job_ids))
+    if len(job_ids) <= 1:
+        return [job_store.get_job(job_id) for job_id in job_ids]
+    with ThreadPoolExecutor(max_workers=min(len(job_ids), JOB_FETCH_CONCURRENCY)) as pool:
+        return list(pool.map(job_store.get_job, job_ids))
+
+
 @router.get("/jobs")
-def list_jobs(template_id: Optional[str] = None) -> List[dict]:
-    jobs, _ = job_store.list_jobs(toolkits=["latency-sleuth"])
-    if template_id:
-        jobs = [job for job in jobs if job.get("payload", {}).get("template_id") == template_id]
-    return jobs
+def list_jobs(
+    template_id: Optional[str] = None,
+    job_status: Optional[List[str]] = Query(default=None, alias="status"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> dict:
+    """Page through jobs newest first using the creation-time indexes.
+
+    Template and time filters are answered by the index itself. Status lives
+    on the job record, so status-filtered pages examine at most
+    ``JOB_PAGE_SCAN_LIMIT`` index entries and may come back short with a
+    ``next_cursor`` to continue from. Each index batch's records are fetched
+    together, and one job beyond *limit* is looked for so the last page never
+    carries a cursor to an empty one.
+    """
+
+    _ensure_job_index()
+    statuses = set(job_status or [])
+    jobs: List[dict] = []
+    missing: List[str] = []
+    scan_cursor = cursor
+    page_cursor: Optional[str] = None
+    scanned = 0
+    try:
+        while len(jobs) <= limit and scanned < JOB_PAGE_SCAN_LIMIT:
+            count = limit + 1 - len(jobs) if not statuses else limit + 1
+            batch = scan_job_index(
+                template_id=template_id,
+                since=_as_utc(since) if since else None,
+                until=_as_utc(until) if until else None,
+                cursor=scan_cursor,
+                count=count,
+            )
+            for (job_id, score), job in zip(batch, _get_jobs([job_id for job_id, _ in batch])):
+                scanned += 1
+                scan_cursor = encode_cursor(score, job_id)
+                if job is None:
+                    missing.append(job_id)
+                elif not statuses or job.get("status") in statuses:
+                    jobs.append(job)
+                    if len(jobs) == limit:
+                        page_cursor = scan_cursor
+                    elif len(jobs) > limit:
+                        break
+            if len(batch) < count:
+                # The index is exhausted, so there is no further page.
+                scan_cursor = None
+                break
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from None
+    unindex_jobs(missing, template_id=template_id)
+    if len(jobs) > limit:
+        return {"jobs": jobs[:limit], "next_cursor": page_cursor}
+    return {"jobs": jobs, "next_cursor": scan_cursor}
 
 
 @router.get("/jobs/{job_id}")
@@ -141,3 +587,75 @@ def get_job(job_id: str) -> dict:
     if not job:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
     return job
+
+
+@router.post("/jobs/{job_id}/actions/cancel", status_code=status.HTTP_202_ACCEPTED)
+def cancel_job(job_id: str) -> dict:
+    job = job_store.get_job(job_id)
+    if not job or not str(job.get("type", "")).startswith("latency-sleuth."):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if job.get("status") in job_store.TERMINAL_STATUSES:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job already finished")
+    request_job_cancellation(job_id)
+    if job.get("status") != "cancelling":
+        job = job_store.mark_cancelling(job, "Cancellation requested by operator")
+        logs = job.get("logs") or []
+        publish_job_event(
+            job_id,
+            {
+                "log_offset": max(len(logs) - 1, 0),
+                "logs": logs[-1:],
+                "progress": job.get("progress"),
+                "status": job["status"],
+            },
+        )
+    return {"job": job}
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _job_event_stream(job_id: str) -> AsyncIterator[str]:
+    """Yield a snapshot of the job, then worker deltas until it reaches a terminal status.
+
+    The stream registers with the shared listener before the snapshot is read
+    so no delta can fall between the two; clients drop log lines they already
+    hold using ``log_offset``. Idle periods send keep-alive comments and
+    re-check the job, which also ends streams for jobs that finished without
+    publishing.
+    """
+
+    events = job_event_hub.subscribe(job_id)
+    try:
+        job = await run_in_threadpool(job_store.get_job, job_id) or {}
+        yield _sse("snapshot", job)
+        if job.get("status") in job_store.TERMINAL_STATUSES:
+            return
+        while True:
+            try:
+                data = await asyncio.wait_for(events.get(), timeout=JOB_EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                job = await run_in_threadpool(job_store.get_job, job_id) or {}
+                if job.get("status") in job_store.TERMINAL_STATUSES:
+                    yield _sse("snapshot", job)
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            delta = json.loads(data)
+            yield _sse("delta", delta)
+            if delta.get("status") in job_store.TERMINAL_STATUSES:
+                return
+    finally:
+        job_event_hub.unsubscribe(job_id, events)
+
+
+@router.get("/jobs/{job_id}/events")
+def stream_job_events(job_id: str) -> StreamingResponse:
+    if not job_store.get_job(job_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return StreamingResponse(
+        _job_event_stream(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,82 @@
+"""JSON codec for records the toolkit writes to Redis.
+
+The fastest installed backend wins: ``orjson``, then ``msgspec``, then the
+standard library. ``LATENCY_SLEUTH_JSON_BACKEND`` pins one explicitly (for
+example to compare them). Every backend emits compact JSON and reads what the
+others wrote, so switching needs no migration.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, Dict, Tuple
+
+JSON_BACKEND_ENV = "LATENCY_SLEUTH_JSON_BACKEND"
+
+Dumps = Callable[[Any], str]
+Loads = Callable[[Any], Any]
+
+
+def _stdlib_dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _stdlib() -> Tuple[Dumps, Loads]:
+    return _stdlib_dumps, json.loads
+
+
+def _orjson() -> Tuple[Dumps, Loads]:
+    import orjson
+
+    options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(value: Any) -> str:
+        try:
+            return orjson.dumps(value, option=options).decode("utf-8")
+        except TypeError:
+            # Integers beyond 64 bits and other types orjson refuses.
+            return _stdlib_dumps(value)
+
+    return dumps, orjson.loads
+
+
+def _msgspec() -> Tuple[Dumps, Loads]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps(value: Any) -> str:
+        try:
+            return encoder.encode(value).decode("utf-8")
+        except (TypeError, OverflowError):
+            return _stdlib_dumps(value)
+
+    return dumps, decoder.decode
+
+
+_BACKENDS: Dict[str, Callable[[], Tuple[Dumps, Loads]]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "json": _stdlib,
+}
+
+
+def _select(preferred: str | None) -> Tuple[str, Dumps, Loads]:
+    names = [preferred] if preferred else list(_BACKENDS)
+    for name in names:
+        factory = _BACKENDS.get(name)
+        if factory is None:
+            raise ValueError(f"Unknown JSON backend {name!r}; expected one of {sorted(_BACKENDS)}")
+        try:
+            dumps, loads = factory()
+        except ImportError:
+            continue
+        return name, dumps, loads
+    return "json", *_stdlib()
+
+
+JSON_BACKEND, dumps, loads = _select(os.environ.get(JSON_BACKEND_ENV) or None)
+
+__all__ = ["JSON_BACKEND", "JSON_BACKEND_ENV", "dumps", "loads"]
@@ -1,41 +1,21 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import Iterable
 
-from .models import ProbeHistoryEntry, utcnow
-from .storage import list_history, list_templates
-
-
-def _count_breaches(entry: ProbeHistoryEntry) -> int:
-    return sum(1 for sample in entry.summary.samples if sample.breach)
+from .models import utcnow
+from .storage import count_regressing_templates, count_scheduled_before, count_templates, fleet_run_counts
 
 
 def build_context() -> dict:
-    templates = list_templates()
+    template_count = count_templates()
     now = utcnow()
-    window_start = now - timedelta(hours=24)
-    upcoming_threshold = now + timedelta(minutes=15)
-
-    runs_last_day = 0
-    breaches_last_day = 0
-    for template in templates:
-        history: Iterable[ProbeHistoryEntry] = list_history(template.id, limit=96)
-        for entry in history:
-            if entry.recorded_at < window_start:
-                continue
-            runs_last_day += 1
-            breaches_last_day += _count_breaches(entry)
-
-    upcoming_runs = sum(
-        1
-        for template in templates
-        if template.next_run_at is not None and template.next_run_at <= upcoming_threshold
-    )
+    runs_last_day, breaches_last_day = fleet_run_counts(now - timedelta(hours=24), now=now)
+    upcoming_runs = count_scheduled_before(now + timedelta(minutes=15))
+    regressing = count_regressing_templates()
 
     templates_description = (
         "Author probe templates to start scheduled latency checks."
-        if not templates
+        if not template_count
         else "Templates actively scheduling synthetic probes."
     )
 
@@ -43,7 +23,7 @@ def build_context() -> dict:
         "metrics": [
             {
                 "label": "Templates",
-                "value": len(templates),
+                "value": template_count,
                 "description": templates_description,
             },
             {
@@ -54,6 +34,11 @@ def build_context() -> dict:
                     f"Upcoming runs (15m): {upcoming_runs}."
                 ),
             },
+            {
+                "label": "Drifting",
+                "value": regressing,
+                "description": "Templates whose latency is trending up from their baseline, before any SLA breach.",
+            },
         ]
     }
 
@@ -0,0 +1,122 @@
+"""Incremental latency drift detection.
+
+Each run contributes one observation, the mean latency of its successful
+samples (failures are already counted as breaches and say nothing about
+latency). A slow exponentially weighted mean and variance track the
+template's baseline, and a two-sided CUSUM accumulates standardised
+deviations from it. The upper sum crossing ``CUSUM_THRESHOLD`` flags a
+regression long before a gradual slowdown reaches the SLA; once the shift
+persists the baseline catches up and the flag clears on its own.
+
+The whole state is a handful of numbers stored per template, so an update is
+constant time and never rescans history.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from .models import DriftState, ProbeExecutionSample
+
+EWMA_ALPHA = 0.05
+# Deviations are measured in baseline standard deviations.
+CUSUM_SLACK = 0.5
+CUSUM_THRESHOLD = 5.0
+WARMUP_RUNS = 10
+# Floors the deviation so very steady probes are not flagged over a few milliseconds.
+MIN_RELATIVE_DEVIATION = 0.05
+MIN_DEVIATION_MS = 1.0
+# A single outlier moves the sums and the baseline by at most this many deviations.
+MAX_STEP = 4.0
+
+
+def run_latency(samples: Iterable[ProbeExecutionSample]) -> Optional[float]:
+    latencies = [sample.latency_ms for sample in samples if not sample.error and (sample.status_code or 0) < 400]
+    return math.fsum(latencies) / len(latencies) if latencies else None
+
+
+class DriftDetector:
+    __slots__ = ("runs", "mean", "variance", "upper", "lower", "latest", "since")
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.upper = 0.0
+        self.lower = 0.0
+        self.latest: Optional[float] = None
+        self.since: Optional[int] = None
+
+    @property
+    def deviation(self) -> float:
+        return max(math.sqrt(self.variance), self.mean * MIN_RELATIVE_DEVIATION, MIN_DEVIATION_MS)
+
+    @property
+    def status(self) -> str:
+        if self.runs < WARMUP_RUNS:
+            return "learning"
+        if self.upper > CUSUM_THRESHOLD:
+            return "regressing"
+        if self.lower > CUSUM_THRESHOLD:
+            return "improving"
+        return "stable"
+
+    def update(self, latency_ms: float, recorded_at: datetime) -> None:
+        previous = self.status
+        delta = latency_ms - self.mean
+        if self.runs >= WARMUP_RUNS:
+            limit = MAX_STEP * self.deviation
+            delta = max(min(delta, limit), -limit)
+            step = delta / self.deviation
+            self.upper = max(0.0, self.upper + step - CUSUM_SLACK)
+            self.lower = max(0.0, self.lower - step - CUSUM_SLACK)
+        # Warm-up uses a plain running mean so the baseline does not start from zero.
+        alpha = max(EWMA_ALPHA, 1.0 / (self.runs + 1))
+        self.mean += alpha * delta
+        self.variance = (1 - alpha) * (self.variance + alpha * delta * delta)
+        self.runs += 1
+        self.latest = latency_ms
+        if self.status != previous:
+            self.since = int(recorded_at.timestamp())
+
+    def to_record(self) -> dict:
+        return {
+            "n": self.runs,
+            "m": self.mean,
+            "v": self.variance,
+            "u": self.upper,
+            "l": self.lower,
+            "x": self.latest,
+            "t": self.since,
+        }
+
+    @classmethod
+    def from_record(cls, data: Optional[dict]) -> "DriftDetector":
+        detector = cls()
+        if data:
+            detector.runs = data["n"]
+            detector.mean = data["m"]
+            detector.variance = data["v"]
+            detector.upper = data["u"]
+            detector.lower = data["l"]
+            detector.latest = data.get("x")
+            detector.since = data.get("t")
+        return detector
+
+    def state(self, template_id: str) -> DriftState:
+        return DriftState(
+            template_id=template_id,
+            status=self.status,
+            runs=self.runs,
+            baseline_ms=round(self.mean, 3) if self.runs else None,
+            deviation_ms=round(self.deviation, 3) if self.runs else None,
+            latest_ms=round(self.latest, 3) if self.latest is not None else None,
+            regression_score=round(self.upper / CUSUM_THRESHOLD, 3),
+            improvement_score=round(self.lower / CUSUM_THRESHOLD, 3),
+            since=datetime.fromtimestamp(self.since, timezone.utc) if self.since is not None else None,
+        )
+
+
+__all__ = ["CUSUM_THRESHOLD", "DriftDetector", "WARMUP_RUNS", "run_latency"]
@@ -0,0 +1,221 @@
+"""Compact, versioned encoding for probe history entries.
+
+Version 2 stores each run column-wise instead of as a dump of
+:class:`ProbeHistoryEntry`::
+
+    {"v": 2, "r": <recorded_at µs>, "n": <template name>, "s": <SLA ms>,
+     "t": <first sample µs>, "d": [<µs since previous sample>, ...],
+     "l": <base64 little-endian float64 latencies>, "b": <breach bitset,
+     as a hex string once it outgrows 63 bits>,
+     "a": [...attempts, only when not 1..n], "c": [...status codes],
+     "e": {"<index>": error}, "p": <base64 float64 dns/connect/tls/ttfb per
+     sample, NaN for a skipped phase, -1 for no timings>,
+     "ch": [...notified channels]}
+
+Optional columns are omitted when empty. Messages, averages and breach counts
+are derived on read. Entries without ``"v"`` are legacy full dumps and still
+decode through pydantic.
+"""
+
+from __future__ import annotations
+
+import base64
+import math
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from .models import ProbeHistoryEntry, describe_sample
+
+HISTORY_FORMAT_VERSION = 2
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_PHASE_FIELDS = ("dns_ms", "connect_ms", "tls_ms", "ttfb_ms")
+_NO_PHASES = -1.0
+# JSON backends such as orjson only round-trip integers up to 64 bits.
+_MAX_INT_BITSET = (1 << 63) - 1
+
+
+class RunPoints(NamedTuple):
+    """Plain view of one stored run used by aggregations that skip pydantic."""
+
+    recorded_at: datetime
+    timestamps: List[datetime]
+    latencies: List[float]
+    breaches: List[bool]
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _pack(values: Sequence[float]) -> str:
+    return base64.b64encode(struct.pack(f"<{len(values)}d", *values)).decode("ascii")
+
+
+def _unpack(encoded: str) -> List[float]:
+    raw = base64.b64decode(encoded)
+    return list(struct.unpack(f"<{len(raw) // 8}d", raw))
+
+
+def _encode_bits(bits: int) -> int | str:
+    return bits if bits <= _MAX_INT_BITSET else format(bits, "x")
+
+
+def _decode_bits(value: int | str) -> int:
+    return int(value, 16) if isinstance(value, str) else value
+
+
+def encode_entry(entry: ProbeHistoryEntry) -> Dict[str, Any]:
+    summary = entry.summary
+    samples = summary.samples
+    micros = [_to_micros(sample.timestamp) for sample in samples]
+    data: Dict[str, Any] = {
+        "v": HISTORY_FORMAT_VERSION,
+        "r": _to_micros(entry.recorded_at),
+        "n": summary.template_name,
+        "s": summary.sla_ms,
+        "t": micros[0] if micros else 0,
+        "d": [current - previous for previous, current in zip(micros, micros[1:])],
+        "l": _pack([sample.latency_ms for sample in samples]),
+        "b": _encode_bits(sum(1 << index for index, sample in enumerate(samples) if sample.breach)),
+    }
+    attempts = [sample.attempt for sample in samples]
+    if attempts != list(range(1, len(samples) + 1)):
+        data["a"] = attempts
+    if any(sample.status_code is not None for sample in samples):
+        data["c"] = [sample.status_code for sample in samples]
+    errors = {str(index): sample.error for index, sample in enumerate(samples) if sample.error}
+    if errors:
+        data["e"] = errors
+    if any(sample.phases is not None for sample in samples):
+        phases: List[float] = []
+        for sample in samples:
+            if sample.phases is None:
+                phases.extend([_NO_PHASES] * len(_PHASE_FIELDS))
+                continue
+            for field in _PHASE_FIELDS:
+                value = getattr(sample.phases, field)
+                phases.append(math.nan if value is None else value)
+        data["p"] = _pack(phases)
+    if summary.notified_channels:
+        data["ch"] = list(summary.notified_channels)
+    return data
+
+
+def _timestamps(data: Dict[str, Any]) -> List[int]:
+    current = data["t"]
+    micros = [current]
+    for delta in data["d"]:
+        current += delta
+        micros.append(current)
+    return micros
+
+
+def decode_points(data: Dict[str, Any]) -> RunPoints:
+    """Decode only timestamps, latencies and breaches, without building models."""
+
+    if "v" not in data:
+        samples = data["summary"]["samples"]
+        return RunPoints(
+            recorded_at=datetime.fromisoformat(data["recorded_at"]),
+            timestamps=[datetime.fromisoformat(sample["timestamp"]) for sample in samples],
+            latencies=[float(sample["latency_ms"]) for sample in samples],
+            breaches=[bool(sample["breach"]) for sample in samples],
+        )
+    latencies = _unpack(data["l"])
+    bits = _decode_bits(data["b"])
+    return RunPoints(
+        recorded_at=_from_micros(data["r"]),
+        timestamps=[_from_micros(value) for value in _timestamps(data)] if latencies else [],
+        latencies=latencies,
+        breaches=[bool(bits >> index & 1) for index in range(len(latencies))],
+    )
+
+
+def decode_run_stats(data: Dict[str, Any]) -> tuple[datetime, int]:
+    """Return ``(recorded_at, breach_count)`` for a stored run."""
+
+    if "v" not in data:
+        samples = data["summary"]["samples"]
+        return datetime.fromisoformat(data["recorded_at"]), sum(1 for sample in samples if sample["breach"])
+    return _from_micros(data["r"]), bin(_decode_bits(data["b"])).count("1")
+
+
+def decode_entry(template_id: str, data: Dict[str, Any]) -> ProbeHistoryEntry:
+    """Rebuild the full history entry, deriving per-sample messages.
+
+    The entry is assembled as plain data and validated in a single call, which
+    keeps the per-sample work inside pydantic-core; constructing each nested
+    model separately (even through ``model_construct``) is slower.
+    """
+
+    if "v" not in data:
+        return ProbeHistoryEntry.model_validate(data)
+
+    points = decode_points(data)
+    sla_ms = data["s"]
+    attempts: Optional[List[int]] = data.get("a")
+    status_codes: Optional[List[Optional[int]]] = data.get("c")
+    errors: Dict[str, str] = data.get("e", {})
+    phases = _unpack(data["p"]) if "p" in data else None
+
+    samples: List[Dict[str, Any]] = []
+    for index, (timestamp, latency, breach) in enumerate(
+        zip(points.timestamps, points.latencies, points.breaches)
+    ):
+        status_code = status_codes[index] if status_codes else None
+        error = errors.get(str(index))
+        sample_phases = None
+        if phases is not None:
+            values = phases[index * 4 : index * 4 + 4]
+            if values[0] != _NO_PHASES:
+                sample_phases = {
+                    field: None if math.isnan(value) else value
+                    for field, value in zip(_PHASE_FIELDS, values)
+                }
+                sample_phases["total_ms"] = latency
+        samples.append(
+            {
+                "attempt": attempts[index] if attempts else index + 1,
+                "timestamp": timestamp,
+                "latency_ms": latency,
+                "breach": breach,
+                "message": describe_sample(latency, sla_ms, status_code=status_code, error=error),
+                "status_code": status_code,
+                "error": error,
+                "phases": sample_phases,
+            }
+        )
+
+    breach_count = sum(points.breaches)
+    summary = {
+        "template_id": template_id,
+        "template_name": data["n"],
+        "sla_ms": sla_ms,
+        "samples": samples,
+        # ``statistics.mean`` works in exact fractions; ``fsum`` agrees once rounded to two decimals.
+        "average_latency_ms": round(math.fsum(points.latencies) / len(samples), 2) if samples else 0.0,
+        "breach_count": breach_count,
+        "met_sla": breach_count == 0,
+        "notified_channels": data.get("ch") or [],
+    }
+    return ProbeHistoryEntry.model_validate(
+        {"template_id": template_id, "recorded_at": points.recorded_at, "summary": summary}
+    )
+
+
+__all__ = [
+    "HISTORY_FORMAT_VERSION",
+    "RunPoints",
+    "decode_entry",
+    "decode_points",
+    "decode_run_stats",
+    "encode_entry",
+]
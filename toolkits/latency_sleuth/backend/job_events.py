@@ -0,0 +1,80 @@
+"""Fan job deltas out to open event streams over one pub/sub connection.
+
+While any stream is open, each API process holds a single pattern
+subscription to every job's event channel, read by one daemon thread. Streams
+register an ``asyncio.Queue`` for their job and await it, so an open stream
+ties up neither a threadpool worker nor a Redis connection of its own. The
+subscription is dropped as soon as the last stream closes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Dict
+
+from .storage import job_event_job_id, subscribe_job_events
+
+# How long the listener blocks on the subscription before re-checking it is still wanted.
+JOB_EVENTS_POLL_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+class JobEventHub:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._queues: Dict[str, Dict[asyncio.Queue, asyncio.AbstractEventLoop]] = {}
+        self._subscription = None
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Return a queue that receives the raw deltas published for *job_id* from now on.
+
+        Must be called on the event loop that will read the queue.
+        """
+
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._subscription is None:
+                self._subscription = subscribe_job_events()
+                threading.Thread(
+                    target=self._listen, args=(self._subscription,), name="latency_sleuth_job_events", daemon=True
+                ).start()
+            self._queues.setdefault(job_id, {})[queue] = loop
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            queues = self._queues.get(job_id, {})
+            queues.pop(queue, None)
+            if not queues:
+                self._queues.pop(job_id, None)
+            if not self._queues:
+                # The listener notices on its next poll and closes the connection.
+                self._subscription = None
+
+    def _listen(self, subscription) -> None:
+        try:
+            while self._subscription is subscription:
+                message = subscription.get_message(timeout=JOB_EVENTS_POLL_SECONDS)
+                if message is None or message.get("type") != "pmessage":
+                    continue
+                with self._lock:
+                    targets = list(self._queues.get(job_event_job_id(message["channel"]), {}).items())
+                for queue, loop in targets:
+                    loop.call_soon_threadsafe(queue.put_nowait, message["data"])
+        except Exception:  # noqa: BLE001 - open streams fall back to their periodic re-check
+            logger.warning("latency-sleuth job event listener stopped", exc_info=True)
+            with self._lock:
+                if self._subscription is subscription:
+                    self._subscription = None
+        finally:
+            subscription.close()
+
+
+job_event_hub = JobEventHub()
+
+
+__all__ = ["JOB_EVENTS_POLL_SECONDS", "JobEventHub", "job_event_hub"]
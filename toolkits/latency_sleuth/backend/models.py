@@ -2,13 +2,17 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from statistics import mean
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
 
 NotificationChannel = Literal["slack", "pagerduty", "email", "webhook"]
 NotificationThreshold = Literal["always", "breach", "recovery"]
+# "recovery" marks the first run within SLA after a breaching one; "ok" any other passing run.
+NotificationKind = Literal["breach", "recovery", "ok"]
+ProbeMode = Literal["live", "simulated"]
+DriftStatus = Literal["learning", "stable", "regressing", "improving"]
 
 
 class NotificationRule(BaseModel):
@@ -74,12 +78,52 @@ class ProbeTemplate(ProbeTemplateBase):
     next_run_at: Optional[datetime] = None
 
 
+class ProbeTemplatePage(BaseModel):
+    """One page of a filtered template listing, newest first."""
+
+    templates: List[ProbeTemplate]
+    next_cursor: Optional[str] = None
+    tags: List[str] = Field(default_factory=list)
+
+
+class ProbePhaseTimings(BaseModel):
+    """Per-attempt timing breakdown; phases skipped by a reused connection stay ``None``."""
+
+    dns_ms: Optional[float] = None
+    connect_ms: Optional[float] = None
+    tls_ms: Optional[float] = None
+    ttfb_ms: Optional[float] = None
+    total_ms: float
+
+
+def describe_sample(
+    latency_ms: float,
+    sla_ms: int,
+    *,
+    status_code: Optional[int] = None,
+    error: Optional[str] = None,
+) -> str:
+    """Human readable outcome for one attempt, as shown in job logs and history."""
+
+    if error:
+        return f"{latency_ms:.2f} ms (request failed: {error})"
+    if status_code is not None and status_code >= 400:
+        return f"{latency_ms:.2f} ms (HTTP {status_code})"
+    difference = latency_ms - sla_ms
+    if difference <= 0:
+        return f"{latency_ms:.2f} ms (within SLA)"
+    return f"{latency_ms:.2f} ms (breach by {difference:.2f} ms)"
+
+
 class ProbeExecutionSample(BaseModel):
     attempt: int
     timestamp: datetime
     latency_ms: float
     breach: bool
     message: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    phases: Optional[ProbePhaseTimings] = None
 
 
 class ProbeExecutionSummary(BaseModel):
@@ -121,16 +165,88 @@ class ProbeHistoryEntry(BaseModel):
     summary: ProbeExecutionSummary
 
 
+class NotificationEvent(BaseModel):
+    """One alert queued for delivery to a single channel target."""
+
+    template_id: str
+    template_name: str
+    kind: NotificationKind
+    channel: NotificationChannel
+    target: str
+    threshold: NotificationThreshold
+    sla_ms: int
+    average_latency_ms: float
+    breach_count: int
+    sample_count: int
+    recorded_at: datetime
+    # Number of queued events this one stands for after deduplication.
+    occurrences: int = 1
+
+
 class HeatmapCell(BaseModel):
     timestamp: datetime
     latency_ms: float
     breach: bool
+    # Populated for rolled-up cells, where ``latency_ms`` is the bucket median.
+    sample_count: Optional[int] = None
+    breach_count: Optional[int] = None
+    p90_ms: Optional[float] = None
 
 
 class LatencyHeatmap(BaseModel):
     template_id: str
     columns: int
     rows: List[List[HeatmapCell]]
+    bucket_seconds: Optional[int] = None
+
+
+class LatencyPercentiles(BaseModel):
+    """Latency quantiles merged from the per-template sketches covering a window."""
+
+    template_id: str
+    start: datetime
+    end: datetime
+    sample_count: int
+    breach_count: int
+    mean_ms: Optional[float] = None
+    p50_ms: Optional[float] = None
+    p90_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+
+
+class SlaReplayCandidate(BaseModel):
+    sla_ms: int
+    breach_count: int
+    breach_rate: float
+    breaching_runs: int
+    notifications: int
+    notifications_by_channel: Dict[NotificationChannel, int] = Field(default_factory=dict)
+
+
+class SlaReplay(BaseModel):
+    """Stored samples replayed against candidate SLAs, as if each had been in force."""
+
+    template_id: str
+    current_sla_ms: int
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    run_count: int
+    sample_count: int
+    candidates: List[SlaReplayCandidate]
+
+
+class DriftState(BaseModel):
+    """Incremental drift detector state; scores reach 1.0 when a shift is flagged."""
+
+    template_id: str
+    status: DriftStatus
+    runs: int
+    baseline_ms: Optional[float] = None
+    deviation_ms: Optional[float] = None
+    latest_ms: Optional[float] = None
+    regression_score: float = 0.0
+    improvement_score: float = 0.0
+    since: Optional[datetime] = None
 
 
 def utcnow() -> datetime:
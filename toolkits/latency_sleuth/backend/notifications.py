@@ -0,0 +1,396 @@
+"""Asynchronous delivery of breach and recovery alerts.
+
+Probe workers call :func:`queue_notifications` after recording a run: it
+compares the run with the template's previous health and pushes one
+:class:`NotificationEvent` per firing rule onto a Redis list, so a probe never
+waits on an alert endpoint. Rules fire on state changes — ``breach`` when a
+template starts breaching, ``recovery`` on its first passing run afterwards —
+while ``always`` rules fire on every run. :func:`preview_notifications` applies
+the same rules to a preview run without queueing anything or moving the state.
+
+The scheduler leader drains the list with :class:`NotificationDispatcher`,
+which sends each channel target one request per batch (repeats of the same
+template and kind collapse into a single event with ``occurrences``), spaces
+requests per channel with a token bucket, and retries timeouts, 429 and 5xx
+responses with exponential backoff before parking the batch in a dead-letter
+list. Events are taken off the queue before delivery, so a worker that dies
+mid-batch drops that batch rather than repeating it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import smtplib
+import time
+from email.message import EmailMessage
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from .models import (
+    NotificationChannel,
+    NotificationEvent,
+    NotificationKind,
+    NotificationRule,
+    ProbeExecutionSummary,
+    ProbeTemplate,
+    utcnow,
+)
+from .storage import (
+    enqueue_notifications,
+    get_template_health,
+    pop_notifications,
+    record_dead_notifications,
+    swap_template_health,
+)
+
+NOTIFICATION_BATCH_SIZE = 100
+NOTIFICATION_POLL_SECONDS = 1.0
+NOTIFICATION_TIMEOUT_SECONDS = 10.0
+NOTIFICATION_MAX_ATTEMPTS = 5
+NOTIFICATION_BACKOFF_SECONDS = 0.5
+NOTIFICATION_MAX_BACKOFF_SECONDS = 30.0
+# (requests per second, burst) allowed per channel across the whole deployment.
+CHANNEL_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "slack": (1.0, 3),
+    "pagerduty": (2.0, 5),
+    "email": (0.2, 2),
+    "webhook": (10.0, 20),
+}
+SLACK_WEBHOOK_URL = os.getenv("LATENCY_SLEUTH_SLACK_WEBHOOK_URL")
+PAGERDUTY_EVENTS_URL = os.getenv("LATENCY_SLEUTH_PAGERDUTY_EVENTS_URL", "https://events.pagerduty.com/v2/enqueue")
+SMTP_HOST = os.getenv("LATENCY_SLEUTH_SMTP_HOST")
+SMTP_PORT = int(os.getenv("LATENCY_SLEUTH_SMTP_PORT", "25"))
+SMTP_SENDER = os.getenv("LATENCY_SLEUTH_SMTP_SENDER", "latency-sleuth@localhost")
+NOTIFICATION_USER_AGENT = "latency-sleuth/1.0"
+
+Sender = Callable[[httpx.AsyncClient, str, List[NotificationEvent]], Awaitable[None]]
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationError(Exception):
+    """A failed delivery; ``retryable`` decides whether the dispatcher tries again."""
+
+    def __init__(self, message: str, *, retryable: bool = True, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def _run_kind(breach_count: int, previous: Optional[str]) -> NotificationKind:
+    if breach_count:
+        return "breach"
+    return "recovery" if previous == "breach" else "ok"
+
+
+def _rule_fires(rule: NotificationRule, kind: NotificationKind, previous: Optional[str]) -> bool:
+    if rule.threshold == "always":
+        return True
+    if rule.threshold == "breach":
+        return kind == "breach" and previous != "breach"
+    return kind == "recovery"
+
+
+def build_events(
+    template: ProbeTemplate, summary: ProbeExecutionSummary, previous: Optional[str]
+) -> List[NotificationEvent]:
+    """Events for the rules of *template* that fire given the previous health state."""
+
+    kind = _run_kind(summary.breach_count, previous)
+    recorded_at = utcnow()
+    return [
+        NotificationEvent(
+            template_id=template.id,
+            template_name=template.name,
+            kind=kind,
+            channel=rule.channel,
+            target=rule.target,
+            threshold=rule.threshold,
+            sla_ms=summary.sla_ms,
+            average_latency_ms=summary.average_latency_ms,
+            breach_count=summary.breach_count,
+            sample_count=len(summary.samples),
+            recorded_at=recorded_at,
+        )
+        for rule in template.notification_rules
+        if _rule_fires(rule, kind, previous)
+    ]
+
+
+def queue_notifications(template: ProbeTemplate, summary: ProbeExecutionSummary) -> List[NotificationEvent]:
+    """Queue the alerts a recorded run triggers; delivery happens in the dispatcher."""
+
+    if not template.notification_rules:
+        return []
+    previous = swap_template_health(template.id, "breach" if summary.breach_count else "ok")
+    events = build_events(template, summary, previous)
+    enqueue_notifications(events)
+    return events
+
+
+def preview_notifications(template: ProbeTemplate, summary: ProbeExecutionSummary) -> List[NotificationEvent]:
+    """The alerts *summary* would queue if it were recorded now; nothing is queued or stored."""
+
+    if not template.notification_rules:
+        return []
+    return build_events(template, summary, get_template_health(template.id))
+
+
+def coalesce_events(
+    events: Sequence[NotificationEvent],
+) -> Dict[Tuple[NotificationChannel, str], List[NotificationEvent]]:
+    """Group events by channel target, folding repeats of a template and kind into the latest one."""
+
+    groups: Dict[Tuple[NotificationChannel, str], Dict[Tuple[str, str], NotificationEvent]] = {}
+    for event in events:
+        group = groups.setdefault((event.channel, event.target), {})
+        earlier = group.pop((event.template_id, event.kind), None)
+        if earlier is not None:
+            event = event.model_copy(update={"occurrences": earlier.occurrences + event.occurrences})
+        group[(event.template_id, event.kind)] = event
+    return {target: list(group.values()) for target, group in groups.items()}
+
+
+class TokenBucket:
+    """Reservation-based token bucket; callers sleep for the delay ``reserve`` returns."""
+
+    def __init__(self, rate: float, burst: int, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+
+    def reserve(self) -> float:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+def describe_event(event: NotificationEvent) -> str:
+    text = (
+        f"[{event.kind.upper()}] {event.template_name}: {event.breach_count}/{event.sample_count} samples "
+        f"over the {event.sla_ms} ms SLA (average {event.average_latency_ms:.2f} ms)"
+    )
+    if event.occurrences > 1:
+        text += f" — {event.occurrences} runs"
+    return text
+
+
+def _check_response(response: httpx.Response) -> None:
+    if response.is_success:
+        return
+    message = f"{response.request.url} answered {response.status_code}"
+    if response.status_code == 429 or response.status_code >= 500:
+        retry_after = response.headers.get("Retry-After")
+        try:
+            delay = float(retry_after) if retry_after else None
+        except ValueError:
+            delay = None
+        raise NotificationError(message, retry_after=delay)
+    raise NotificationError(message, retryable=False)
+
+
+async def send_webhook(client: httpx.AsyncClient, target: str, events: List[NotificationEvent]) -> None:
+    payload = {"source": "latency-sleuth", "events": [event.model_dump(mode="json") for event in events]}
+    _check_response(await client.post(target, json=payload))
+
+
+async def send_slack(client: httpx.AsyncClient, target: str, events: List[NotificationEvent]) -> None:
+    """Post to *target* when it is an incoming-webhook URL, else to the configured webhook as that channel."""
+
+    payload: Dict[str, str] = {"text": "\n".join(describe_event(event) for event in events)}
+    url = target
+    if not target.startswith(("https://", "http://")):
+        if not SLACK_WEBHOOK_URL:
+            raise NotificationError("LATENCY_SLEUTH_SLACK_WEBHOOK_URL is not configured", retryable=False)
+        url = SLACK_WEBHOOK_URL
+        payload["channel"] = target
+    _check_response(await client.post(url, json=payload))
+
+
+async def send_pagerduty(client: httpx.AsyncClient, target: str, events: List[NotificationEvent]) -> None:
+    """Trigger or resolve one PagerDuty incident per template; *target* is the routing key."""
+
+    for event in events:
+        if event.kind == "ok":
+            continue
+        body = {
+            "routing_key": target,
+            "event_action": "trigger" if event.kind == "breach" else "resolve",
+            "dedup_key": f"latency-sleuth:{event.template_id}",
+            "payload": {"summary": describe_event(event), "source": "latency-sleuth", "severity": "error"},
+        }
+        _check_response(await client.post(PAGERDUTY_EVENTS_URL, json=body))
+
+
+def _send_mail(target: str, events: List[NotificationEvent]) -> None:
+    message = EmailMessage()
+    message["From"] = SMTP_SENDER
+    message["To"] = target
+    message["Subject"] = f"Latency Sleuth: {describe_event(events[-1])}"
+    message.set_content("\n".join(describe_event(event) for event in events))
+    try:
+        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=NOTIFICATION_TIMEOUT_SECONDS) as smtp:
+            smtp.send_message(message)
+    except smtplib.SMTPRecipientsRefused as exc:
+        raise NotificationError(f"SMTP refused {target}", retryable=False) from exc
+    except (OSError, smtplib.SMTPException) as exc:
+        raise NotificationError(f"SMTP delivery failed: {exc}") from exc
+
+
+async def send_email(client: httpx.AsyncClient, target: str, events: List[NotificationEvent]) -> None:
+    if not SMTP_HOST:
+        raise NotificationError("LATENCY_SLEUTH_SMTP_HOST is not configured", retryable=False)
+    await asyncio.to_thread(_send_mail, target, events)
+
+
+DEFAULT_SENDERS: Dict[str, Sender] = {
+    "webhook": send_webhook,
+    "slack": send_slack,
+    "pagerduty": send_pagerduty,
+    "email": send_email,
+}
+
+
+def notification_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=NOTIFICATION_TIMEOUT_SECONDS,
+        follow_redirects=False,
+        headers={"User-Agent": NOTIFICATION_USER_AGENT},
+    )
+
+
+class NotificationDispatcher:
+    """Drain queued notifications, delivering one batch per channel target."""
+
+    def __init__(
+        self,
+        *,
+        senders: Optional[Dict[str, Sender]] = None,
+        rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        batch_size: int = NOTIFICATION_BATCH_SIZE,
+        max_attempts: int = NOTIFICATION_MAX_ATTEMPTS,
+        backoff_seconds: float = NOTIFICATION_BACKOFF_SECONDS,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.senders = dict(DEFAULT_SENDERS if senders is None else senders)
+        self.rate_limits = dict(CHANNEL_RATE_LIMITS if rate_limits is None else rate_limits)
+        self.batch_size = max(batch_size, 1)
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff_seconds = backoff_seconds
+        self._sleep = sleep
+        self._clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, channel: str) -> Optional[TokenBucket]:
+        if channel not in self.rate_limits:
+            return None
+        bucket = self._buckets.get(channel)
+        if bucket is None:
+            rate, burst = self.rate_limits[channel]
+            bucket = self._buckets[channel] = TokenBucket(rate, burst, clock=self._clock)
+        return bucket
+
+    def _backoff(self, attempt: int, error: NotificationError) -> float:
+        if error.retry_after is not None:
+            return min(error.retry_after, NOTIFICATION_MAX_BACKOFF_SECONDS)
+        return min(self.backoff_seconds * 2 ** (attempt - 1), NOTIFICATION_MAX_BACKOFF_SECONDS)
+
+    async def deliver(
+        self, client: httpx.AsyncClient, channel: str, target: str, events: List[NotificationEvent]
+    ) -> bool:
+        """Send *events* to one target, retrying transient failures; returns whether it succeeded."""
+
+        sender = self.senders.get(channel)
+        if sender is None:
+            await self._give_up(channel, target, events, 0, NotificationError(f"no sender for channel {channel!r}"))
+            return False
+        bucket = self._bucket(channel)
+        for attempt in range(1, self.max_attempts + 1):
+            if bucket is not None:
+                delay = bucket.reserve()
+                if delay:
+                    await self._sleep(delay)
+            try:
+                await sender(client, target, events)
+                return True
+            except NotificationError as exc:
+                error = exc
+            except httpx.HTTPError as exc:
+                error = NotificationError(f"{type(exc).__name__}: {exc}")
+            if not error.retryable or attempt == self.max_attempts:
+                break
+            await self._sleep(self._backoff(attempt, error))
+        await self._give_up(channel, target, events, attempt, error)
+        return False
+
+    async def _give_up(
+        self, channel: str, target: str, events: List[NotificationEvent], attempts: int, error: NotificationError
+    ) -> None:
+        logger.warning(
+            "latency-sleuth dropped %d %s notification(s) for %s after %d attempt(s): %s",
+            len(events),
+            channel,
+            target,
+            attempts,
+            error,
+        )
+        await asyncio.to_thread(record_dead_notifications, events, str(error))
+
+    async def dispatch_once(self, client: Optional[httpx.AsyncClient] = None) -> int:
+        """Deliver one batch from the queue and return how many events it held."""
+
+        events = await asyncio.to_thread(pop_notifications, self.batch_size)
+        if not events:
+            return 0
+        if client is None:
+            async with notification_client() as owned:
+                await self._deliver_groups(owned, events)
+        else:
+            await self._deliver_groups(client, events)
+        return len(events)
+
+    async def _deliver_groups(self, client: httpx.AsyncClient, events: List[NotificationEvent]) -> None:
+        groups = coalesce_events(events)
+        await asyncio.gather(
+            *(self.deliver(client, channel, target, batch) for (channel, target), batch in groups.items())
+        )
+
+    async def run(
+        self,
+        *,
+        active: Callable[[], bool] = lambda: True,
+        poll_seconds: float = NOTIFICATION_POLL_SECONDS,
+    ) -> None:
+        """Deliver forever while *active* holds, polling the queue when it runs dry."""
+
+        async with notification_client() as client:
+            while True:
+                delivered = 0
+                if active():
+                    try:
+                        delivered = await self.dispatch_once(client)
+                    except Exception:  # pragma: no cover - defensive guard
+                        logger.exception("latency-sleuth notification dispatch failed")
+                if delivered < self.batch_size:
+                    await self._sleep(poll_seconds)
+
+
+__all__ = [
+    "CHANNEL_RATE_LIMITS",
+    "NotificationDispatcher",
+    "NotificationError",
+    "TokenBucket",
+    "build_events",
+    "coalesce_events",
+    "describe_event",
+    "preview_notifications",
+    "queue_notifications",
+]
@@ -1,19 +1,44 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import os
 import random
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Iterable, List, Optional, Sequence
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar, Union
+from urllib.parse import urlsplit
+
+import httpx
 
 from .models import (
-    NotificationChannel,
-    NotificationRule,
     ProbeExecutionSample,
     ProbeExecutionSummary,
+    ProbeMode,
+    ProbePhaseTimings,
     ProbeTemplate,
+    describe_sample,
     utcnow,
 )
 
 
+DEFAULT_PROBE_MODE = os.getenv("LATENCY_SLEUTH_PROBE_MODE", "live")
+DEFAULT_PROBE_CONCURRENCY = 4
+DEFAULT_BATCH_CONCURRENCY = 32
+PROBE_TIMEOUT_SECONDS = 30.0
+PROBE_USER_AGENT = "latency-sleuth/1.0"
+CANCEL_POLL_SECONDS = 0.25
+
+CancelCheck = Callable[[], bool]
+_T = TypeVar("_T")
+
+
+class ProbeCancelled(Exception):
+    """Raised when a probe run is interrupted by a cancellation request."""
+
+
 def _deterministic_latency(template: ProbeTemplate, attempt: int) -> float:
     seed = f"{template.id}:{attempt}:{template.sla_ms}:{template.interval_seconds}"
     rng = random.Random(seed)
@@ -33,32 +58,12 @@ def _choose_latency(
     return _deterministic_latency(template, attempt)
 
 
-def _format_message(latency: float, sla_ms: int) -> str:
-    difference = latency - sla_ms
-    if difference <= 0:
-        return f"{latency:.2f} ms (within SLA)"
-    return f"{latency:.2f} ms (breach by {difference:.2f} ms)"
-
-
-def _should_notify(rule: NotificationRule, breach_count: int) -> bool:
-    if rule.threshold == "always":
-        return True
-    if rule.threshold == "breach":
-        return breach_count > 0
-    if rule.threshold == "recovery":
-        return breach_count == 0
-    return False
-
-
-def execute_probe(
+def _simulate_samples(
     template: ProbeTemplate,
     sample_size: int,
     overrides: Optional[Sequence[float]] = None,
     clock: Optional[Iterable[datetime]] = None,
-) -> ProbeExecutionSummary:
-    if sample_size <= 0:
-        raise ValueError("sample_size must be positive")
-
+) -> List[ProbeExecutionSample]:
     timestamps = list(clock) if clock else []
     samples: List[ProbeExecutionSample] = []
     for attempt in range(1, sample_size + 1):
@@ -71,24 +76,284 @@ def execute_probe(
                 timestamp=timestamp,
                 latency_ms=latency,
                 breach=breach,
-                message=_format_message(latency, template.sla_ms),
+                message=describe_sample(latency, template.sla_ms),
             )
         )
+    return samples
+
+
+class _PhaseTrace:
+    """Collect httpcore ``trace`` events into per-phase durations."""
+
+    def __init__(self) -> None:
+        self._started: Dict[str, float] = {}
+        self.durations: Dict[str, float] = {}
+        self.marks: Dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: dict) -> None:
+        now = time.perf_counter()
+        phase, _, stage = event_name.rpartition(".")
+        if stage == "started":
+            self._started[phase] = now
+        elif stage == "complete" and phase in self._started:
+            self.durations[phase] = (now - self._started.pop(phase)) * 1000
+            self.marks[phase] = now
+
+    def duration(self, suffix: str) -> Optional[float]:
+        for phase, value in self.durations.items():
+            if phase.endswith(suffix):
+                return round(value, 2)
+        return None
+
+    def mark(self, suffix: str) -> Optional[float]:
+        for phase, value in self.marks.items():
+            if phase.endswith(suffix):
+                return value
+        return None
+
 
-    summary = ProbeExecutionSummary.from_samples(
+async def _resolve_host(url: str) -> Optional[float]:
+    """Time a DNS lookup for *url*'s host; ``None`` for IP literals or failures."""
+
+    parts = urlsplit(url)
+    host = parts.hostname
+    if not host:
+        return None
+    try:
+        socket.inet_pton(socket.AF_INET6 if ":" in host else socket.AF_INET, host)
+        return None
+    except OSError:
+        pass
+    started = time.perf_counter()
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except OSError:
+        return None
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+async def _measure_attempt(
+    client: httpx.AsyncClient,
+    template: ProbeTemplate,
+    attempt: int,
+    dns_ms: Optional[float],
+) -> ProbeExecutionSample:
+    trace = _PhaseTrace()
+    timestamp = utcnow()
+    started = time.perf_counter()
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    try:
+        async with client.stream(
+            template.method,
+            str(template.url),
+            extensions={"trace": trace},
+        ) as response:
+            status_code = response.status_code
+            await response.aread()
+    except httpx.HTTPError as exc:
+        error = f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+    total_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    headers_received = trace.mark("receive_response_headers")
+    phases = ProbePhaseTimings(
+        dns_ms=dns_ms,
+        connect_ms=trace.duration("connect_tcp"),
+        tls_ms=trace.duration("start_tls"),
+        ttfb_ms=round((headers_received - started) * 1000, 2) if headers_received else None,
+        total_ms=total_ms,
+    )
+    return ProbeExecutionSample(
+        attempt=attempt,
+        timestamp=timestamp,
+        latency_ms=total_ms,
+        breach=bool(error) or (status_code or 0) >= 400 or total_ms > template.sla_ms,
+        message=describe_sample(total_ms, template.sla_ms, status_code=status_code, error=error),
+        status_code=status_code,
+        error=error,
+        phases=phases,
+    )
+
+
+def probe_client(*, concurrency: int = DEFAULT_PROBE_CONCURRENCY) -> httpx.AsyncClient:
+    """Return an ``AsyncClient`` whose pool can be shared across probe runs on one event loop."""
+
+    pool_size = max(concurrency, 1) * 4
+    return httpx.AsyncClient(
+        timeout=PROBE_TIMEOUT_SECONDS,
+        follow_redirects=False,
+        headers={"User-Agent": PROBE_USER_AGENT},
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+    )
+
+
+async def _measure_samples(
+    template: ProbeTemplate,
+    sample_size: int,
+    client: httpx.AsyncClient,
+    concurrency: int,
+) -> List[ProbeExecutionSample]:
+    dns_ms = await _resolve_host(str(template.url))
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _bounded(attempt: int) -> ProbeExecutionSample:
+        async with semaphore:
+            # Only the first attempt pays for the lookup; later ones reuse the result.
+            return await _measure_attempt(client, template, attempt, dns_ms if attempt == 1 else None)
+
+    return list(await asyncio.gather(*(_bounded(attempt) for attempt in range(1, sample_size + 1))))
+
+
+def _summarise(template: ProbeTemplate, samples: List[ProbeExecutionSample]) -> ProbeExecutionSummary:
+    return ProbeExecutionSummary.from_samples(
         template_id=template.id,
         template_name=template.name,
         sla_ms=template.sla_ms,
         samples=samples,
-        notified_channels=_select_channels(template.notification_rules, samples),
     )
-    return summary
 
 
-def _select_channels(rules: Iterable[NotificationRule], samples: List[ProbeExecutionSample]) -> List[NotificationChannel]:
-    breach_count = sum(1 for sample in samples if sample.breach)
-    channels: List[NotificationChannel] = []
-    for rule in rules:
-        if _should_notify(rule, breach_count):
-            channels.append(rule.channel)
-    return channels
+async def execute_probe_async(
+    template: ProbeTemplate,
+    sample_size: int,
+    *,
+    client: Optional[httpx.AsyncClient] = None,
+    concurrency: int = DEFAULT_PROBE_CONCURRENCY,
+) -> ProbeExecutionSummary:
+    """Issue *sample_size* real requests against the template URL."""
+
+    if sample_size <= 0:
+        raise ValueError("sample_size must be positive")
+    if client is not None:
+        samples = await _measure_samples(template, sample_size, client, concurrency)
+    else:
+        async with probe_client(concurrency=concurrency) as owned:
+            samples = await _measure_samples(template, sample_size, owned, concurrency)
+    return _summarise(template, samples)
+
+
+async def _run_cancellable(work: Awaitable[_T], should_cancel: Optional[CancelCheck]) -> _T:
+    """Await *work*, polling *should_cancel* off-loop and cancelling in-flight requests when it fires."""
+
+    if should_cancel is None:
+        return await work
+    task = asyncio.ensure_future(work)
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=CANCEL_POLL_SECONDS)
+        if done:
+            return task.result()
+        if await asyncio.to_thread(should_cancel):
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            raise ProbeCancelled()
+
+
+def execute_probe(
+    template: ProbeTemplate,
+    sample_size: int,
+    overrides: Optional[Sequence[float]] = None,
+    clock: Optional[Iterable[datetime]] = None,
+    mode: Optional[ProbeMode] = None,
+    should_cancel: Optional[CancelCheck] = None,
+) -> ProbeExecutionSummary:
+    """Run a probe synchronously.
+
+    Latency overrides always use the simulated path; otherwise *mode* (or the
+    ``LATENCY_SLEUTH_PROBE_MODE`` default) picks between real requests and the
+    deterministic simulation. When *should_cancel* returns true the run stops,
+    aborting outstanding requests, and :class:`ProbeCancelled` is raised.
+    """
+
+    if sample_size <= 0:
+        raise ValueError("sample_size must be positive")
+
+    if overrides or (mode or DEFAULT_PROBE_MODE) == "simulated":
+        if should_cancel is not None and should_cancel():
+            raise ProbeCancelled()
+        return _summarise(template, _simulate_samples(template, sample_size, overrides=overrides, clock=clock))
+    return asyncio.run(_run_cancellable(execute_probe_async(template, sample_size), should_cancel))
+
+
+ProbeOutcome = Union[ProbeExecutionSummary, Exception]
+ProbeResultCallback = Callable[[ProbeTemplate, ProbeOutcome], None]
+
+
+async def execute_probes_async(
+    templates: Sequence[ProbeTemplate],
+    sample_size: int,
+    *,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    on_result: Optional[ProbeResultCallback] = None,
+) -> List[ProbeOutcome]:
+    """Probe many templates on one event loop through a shared connection pool.
+
+    At most *concurrency* templates are in flight at once and each template's
+    samples run back to back. A template that fails unexpectedly yields its
+    exception instead of aborting the batch. *on_result* is invoked as each
+    template finishes, in completion order, on a single worker thread so its
+    blocking I/O never stalls the loop while other samples are being timed;
+    every result has been delivered by the time this returns.
+    """
+
+    if sample_size <= 0:
+        raise ValueError("sample_size must be positive")
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    loop = asyncio.get_running_loop()
+    delivery = ThreadPoolExecutor(max_workers=1, thread_name_prefix="latency-sleuth-results")
+    delivered: List[asyncio.Future] = []
+
+    try:
+        async with probe_client(concurrency=concurrency) as client:
+
+            async def _run(template: ProbeTemplate) -> ProbeOutcome:
+                async with semaphore:
+                    try:
+                        outcome: ProbeOutcome = await execute_probe_async(
+                            template, sample_size, client=client, concurrency=1
+                        )
+                    except Exception as exc:  # noqa: BLE001 - isolate failures per template
+                        outcome = exc
+                if on_result is not None:
+                    delivered.append(loop.run_in_executor(delivery, on_result, template, outcome))
+                return outcome
+
+            outcomes = list(await asyncio.gather(*(_run(template) for template in templates)))
+        await asyncio.gather(*delivered)
+        return outcomes
+    finally:
+        # On cancellation, results not yet handed to *on_result* are abandoned.
+        delivery.shutdown(wait=True, cancel_futures=True)
+
+
+def execute_probes(
+    templates: Sequence[ProbeTemplate],
+    sample_size: int,
+    *,
+    mode: Optional[ProbeMode] = None,
+    on_result: Optional[ProbeResultCallback] = None,
+    should_cancel: Optional[CancelCheck] = None,
+) -> List[ProbeOutcome]:
+    """Synchronous wrapper around :func:`execute_probes_async` honouring *mode*.
+
+    Results already delivered to *on_result* stand when *should_cancel* fires;
+    the remaining templates are abandoned and :class:`ProbeCancelled` is raised.
+    """
+
+    if sample_size <= 0:
+        raise ValueError("sample_size must be positive")
+
+    if (mode or DEFAULT_PROBE_MODE) == "simulated":
+        outcomes: List[ProbeOutcome] = []
+        for template in templates:
+            if should_cancel is not None and should_cancel():
+                raise ProbeCancelled()
+            outcome = _summarise(template, _simulate_samples(template, sample_size))
+            if on_result is not None:
+                on_result(template, outcome)
+            outcomes.append(outcome)
+        return outcomes
+    return asyncio.run(
+        _run_cancellable(execute_probes_async(templates, sample_size, on_result=on_result), should_cancel)
+    )
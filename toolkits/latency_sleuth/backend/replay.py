@@ -0,0 +1,221 @@
+"""SLA what-if replay over the compact per-sample log.
+
+Every recorded run appends one fixed-size record per sample to a Redis
+string: the run's ``recorded_at`` (epoch seconds, ``uint32``, on the run's
+first record only; later records of the run hold 0), when the sample was
+taken (``int32`` milliseconds from that second) and the sample latency
+(``float64``, negated when the request itself failed, since a failure
+breaches whatever the SLA). Two pad bytes make eighteen, which encode to
+exactly twenty-four base64 characters, so appended chunks decode as one
+string.
+
+A replay sorts the latencies and per-run maxima once and answers each
+candidate SLA with a binary search, so a sweep costs ``O((n + k) log n)``
+rather than a pass over every sample per candidate. Notification volume uses
+the rules' state-change semantics: a run at threshold ``s`` starts a breach
+when its maximum exceeds ``s`` and the previous run's did not, which holds
+exactly for ``s`` in ``[previous max, max)``; counting those intervals with
+two more sorted arrays keeps the whole sweep logarithmic per candidate.
+"""
+
+from __future__ import annotations
+
+import base64
+import math
+import struct
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from .models import NotificationRule, ProbeExecutionSample, SlaReplayCandidate
+
+_RECORD = struct.Struct("<Iid2x")
+RECORD_CHARS = 24
+_MAX_OFFSET_MS = 2**31 - 1
+
+
+class ReplayLog(NamedTuple):
+    """Samples in recording order; ``run_starts`` holds the index of each run's first sample."""
+
+    epochs: List[int]
+    latencies: List[float]
+    failed: List[bool]
+    run_starts: List[int]
+
+    @property
+    def run_count(self) -> int:
+        return len(self.run_starts)
+
+
+class LoggedSample(NamedTuple):
+    """One sample; ``recorded_at`` is its run's epoch second, ``sampled_at_ms`` its own epoch milliseconds."""
+
+    recorded_at: int
+    attempt: int
+    latency_ms: float
+    failed: bool
+    sampled_at_ms: int
+
+
+def sample_failed(sample: ProbeExecutionSample) -> bool:
+    return bool(sample.error) or (sample.status_code or 0) >= 400
+
+
+def sampled_at_ms(sample: ProbeExecutionSample) -> int:
+    return round(sample.timestamp.timestamp() * 1000)
+
+
+def encode_samples(recorded_at: datetime, samples: Iterable[ProbeExecutionSample]) -> str:
+    epoch = int(recorded_at.timestamp())
+    # Negating keeps the sign even for 0.0, so a failed zero-latency sample stays failed.
+    payload = b"".join(
+        _RECORD.pack(
+            epoch if index == 0 else 0,
+            max(min(sampled_at_ms(sample) - epoch * 1000, _MAX_OFFSET_MS), -_MAX_OFFSET_MS),
+            -sample.latency_ms if sample_failed(sample) else sample.latency_ms,
+        )
+        for index, sample in enumerate(samples)
+    )
+    return base64.b64encode(payload).decode("ascii")
+
+
+def first_epoch(raw: str) -> Optional[int]:
+    """``recorded_at`` of the oldest sample in the log, or ``None`` when it is empty."""
+
+    # Trimming can cut a run short; its remaining records carry no timestamp.
+    for offset in range(0, len(raw) - RECORD_CHARS + 1, RECORD_CHARS):
+        epoch = _RECORD.unpack(base64.b64decode(raw[offset : offset + RECORD_CHARS]))[0]
+        if epoch:
+            return epoch
+    return None
+
+
+def decode_log(raw: str, *, start: int | None = None, end: int | None = None) -> ReplayLog:
+    """Decode the samples whose run falls in ``[start, end)`` epoch seconds."""
+
+    epochs: List[int] = []
+    latencies: List[float] = []
+    failed: List[bool] = []
+    run_starts: List[int] = []
+    current = 0
+    in_window = False
+    for epoch, _, value in _RECORD.iter_unpack(base64.b64decode(raw)) if raw else ():
+        if epoch:
+            current = epoch
+            in_window = (start is None or epoch >= start) and (end is None or epoch < end)
+            if in_window:
+                run_starts.append(len(latencies))
+        # Also skips the tail of a run cut short by trimming, which precedes any timestamp.
+        if not in_window:
+            continue
+        epochs.append(current)
+        latencies.append(abs(value))
+        failed.append(math.copysign(1.0, value) < 0)
+    return ReplayLog(epochs, latencies, failed, run_starts)
+
+
+def iter_records(chunks: Iterable[str]) -> Iterator[LoggedSample]:
+    """Yield the samples in consecutive slices of the log; slices hold whole records, runs may span them."""
+
+    epoch = 0
+    attempt = 0
+    for chunk in chunks:
+        for stamp, offset_ms, value in _RECORD.iter_unpack(base64.b64decode(chunk)):
+            if stamp:
+                epoch, attempt = stamp, 0
+            elif not epoch:
+                continue
+            attempt += 1
+            yield LoggedSample(epoch, attempt, abs(value), math.copysign(1.0, value) < 0, epoch * 1000 + offset_ms)
+
+
+def expired_records(chunks: Iterable[str], cutoff: int) -> int:
+    """Number of leading records in the log before the first run recorded at or after *cutoff*."""
+
+    count = 0
+    for chunk in chunks:
+        for stamp, _, _ in _RECORD.iter_unpack(base64.b64decode(chunk)):
+            # A trimmed run's leftover records hold 0, so they count as expired too.
+            if stamp >= cutoff:
+                return count
+            count += 1
+    return count
+
+
+def _run_maxima(log: ReplayLog) -> List[float]:
+    """Per-run maximum latency in order; a run with a failed sample breaches at any SLA."""
+
+    bounds = [*log.run_starts, len(log.latencies)]
+    return [
+        max(math.inf if log.failed[index] else log.latencies[index] for index in range(first, last))
+        for first, last in zip(bounds, bounds[1:])
+    ]
+
+
+def _covering(starts: List[float], ends: List[float], value: float) -> int:
+    return bisect_right(starts, value) - bisect_right(ends, value)
+
+
+def replay_sla(
+    log: ReplayLog, candidates: Sequence[int], rules: Sequence[NotificationRule]
+) -> List[SlaReplayCandidate]:
+    passed = sorted(latency for latency, failed in zip(log.latencies, log.failed) if not failed)
+    failures = len(log.latencies) - len(passed)
+    maxima = _run_maxima(log)
+    sorted_maxima = sorted(maxima)
+
+    # Thresholds at which each run starts or ends a breach streak; the state
+    # before the first run counts as passing, as it does for a new template.
+    breach_starts: List[float] = []
+    breach_ends: List[float] = []
+    recovery_starts: List[float] = []
+    recovery_ends: List[float] = []
+    previous = -math.inf
+    for current in maxima:
+        if current > previous:
+            breach_starts.append(previous)
+            breach_ends.append(current)
+        elif current < previous:
+            recovery_starts.append(current)
+            recovery_ends.append(previous)
+        previous = current
+    for values in (breach_starts, breach_ends, recovery_starts, recovery_ends):
+        values.sort()
+
+    results: List[SlaReplayCandidate] = []
+    for sla_ms in candidates:
+        breach_count = failures + len(passed) - bisect_right(passed, sla_ms)
+        fired = {
+            "always": len(maxima),
+            "breach": _covering(breach_starts, breach_ends, sla_ms),
+            "recovery": _covering(recovery_starts, recovery_ends, sla_ms),
+        }
+        by_channel: Dict[str, int] = {}
+        for rule in rules:
+            by_channel[rule.channel] = by_channel.get(rule.channel, 0) + fired[rule.threshold]
+        results.append(
+            SlaReplayCandidate(
+                sla_ms=sla_ms,
+                breach_count=breach_count,
+                breach_rate=round(breach_count / len(log.latencies), 4) if log.latencies else 0.0,
+                breaching_runs=len(sorted_maxima) - bisect_right(sorted_maxima, sla_ms),
+                notifications=sum(by_channel.values()),
+                notifications_by_channel=by_channel,
+            )
+        )
+    return results
+
+
+__all__ = [
+    "LoggedSample",
+    "RECORD_CHARS",
+    "ReplayLog",
+    "decode_log",
+    "encode_samples",
+    "expired_records",
+    "first_epoch",
+    "iter_records",
+    "replay_sla",
+    "sample_failed",
+    "sampled_at_ms",
+]
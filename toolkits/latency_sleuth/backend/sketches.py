@@ -0,0 +1,110 @@
+"""Mergeable log-bucketed latency sketches.
+
+Latencies are counted in logarithmic buckets whose boundaries grow by a
+constant ratio, so any quantile is answered within ``RELATIVE_ACCURACY`` of
+the true value and two sketches merge by adding their bucket counts. The
+sketches persist as Redis hashes (bucket index → count plus ``n``/``s``/``b``
+totals) so they can be updated with ``HINCRBY`` and merged across time
+buckets on read.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, Mapping, Optional
+
+RELATIVE_ACCURACY = 0.01
+MIN_TRACKED_LATENCY_MS = 0.01
+
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+COUNT_FIELD = "n"
+SUM_FIELD = "s"
+BREACH_FIELD = "b"
+_TOTAL_FIELDS = (COUNT_FIELD, SUM_FIELD, BREACH_FIELD)
+
+
+def bucket_index(latency_ms: float) -> int:
+    return math.ceil(math.log(max(latency_ms, MIN_TRACKED_LATENCY_MS)) / _LOG_GAMMA)
+
+
+def bucket_value(index: int) -> float:
+    """Representative latency for *index*, within the relative accuracy of every value it holds."""
+
+    return 2 * _GAMMA**index / (_GAMMA + 1)
+
+
+class LatencySketch:
+    __slots__ = ("counts", "count", "total", "breaches")
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.breaches = 0
+
+    def add(self, latency_ms: float, breach: bool = False) -> None:
+        index = bucket_index(latency_ms)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += latency_ms
+        if breach:
+            self.breaches += 1
+
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.breaches += other.breaches
+        return self
+
+    def to_fields(self) -> Dict[str, float]:
+        """Hash increments for this sketch, suitable for ``HINCRBY``/``HINCRBYFLOAT``."""
+
+        fields: Dict[str, float] = {str(index): count for index, count in self.counts.items()}
+        fields[COUNT_FIELD] = self.count
+        fields[SUM_FIELD] = self.total
+        if self.breaches:
+            fields[BREACH_FIELD] = self.breaches
+        return fields
+
+    @classmethod
+    def from_fields(cls, fields: Mapping[str, str]) -> "LatencySketch":
+        sketch = cls()
+        for key, value in fields.items():
+            if key in _TOTAL_FIELDS:
+                continue
+            sketch.counts[int(key)] = int(value)
+        sketch.count = int(fields.get(COUNT_FIELD, 0) or 0)
+        sketch.total = float(fields.get(SUM_FIELD, 0) or 0)
+        sketch.breaches = int(fields.get(BREACH_FIELD, 0) or 0)
+        return sketch
+
+    @classmethod
+    def merged(cls, sketches: Iterable["LatencySketch"]) -> "LatencySketch":
+        result = cls()
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Nearest-rank quantile: the smallest value with at least ``q`` of the samples at or below it."""
+
+        if not self.counts:
+            return None
+        rank = max(math.ceil(min(max(q, 0.0), 1.0) * self.count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return bucket_value(index)
+        return bucket_value(max(self.counts))
+
+
+__all__ = ["LatencySketch", "RELATIVE_ACCURACY", "bucket_index", "bucket_value"]
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
-import json
-from datetime import timedelta
-from typing import Iterable, List, Optional
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 from uuid import uuid4
 
 from toolkit_runtime.redis import get_redis, redis_key
-from redis.exceptions import WatchError
 
+from . import codec
+from .drift import DriftDetector, run_latency
+from .history_codec import RunPoints, decode_entry, decode_points, decode_run_stats, encode_entry
 from .models import (
+    DriftState,
     HeatmapCell,
     LatencyHeatmap,
+    LatencyPercentiles,
+    NotificationEvent,
     ProbeExecutionSummary,
     ProbeHistoryEntry,
     ProbeTemplate,
@@ -18,13 +27,291 @@ from .models import (
     ProbeTemplateUpdate,
     utcnow,
 )
+from .replay import (
+    RECORD_CHARS,
+    LoggedSample,
+    ReplayLog,
+    decode_log,
+    encode_samples,
+    expired_records,
+    first_epoch,
+    iter_records,
+    sample_failed,
+    sampled_at_ms,
+)
+from .sketches import LatencySketch
 
 
 TEMPLATES_KEY = redis_key("toolkits", "latency_sleuth", "templates")
+TEMPLATE_VERSIONS_KEY = redis_key("toolkits", "latency_sleuth", "template_versions")
+TEMPLATE_CACHE_SIZE = 1024
 HISTORY_KEY_PREFIX = redis_key("toolkits", "latency_sleuth", "history")
-MAX_HISTORY_ENTRIES = 96
+SCHEDULE_KEY = redis_key("toolkits", "latency_sleuth", "schedule")
+ACTIVE_JOBS_KEY = redis_key("toolkits", "latency_sleuth", "active_jobs")
+SCHEDULE_CHANNEL = redis_key("toolkits", "latency_sleuth", "schedule_changed")
+SCHEDULER_LEASE_KEY = redis_key("toolkits", "latency_sleuth", "scheduler_lease")
+CANCEL_KEY_PREFIX = redis_key("toolkits", "latency_sleuth", "cancel")
+CANCEL_SIGNAL_TTL_SECONDS = 3600
+JOB_EVENTS_CHANNEL_PREFIX = redis_key("toolkits", "latency_sleuth", "job_events")
+TEMPLATE_CREATED_KEY = redis_key("toolkits", "latency_sleuth", "template_index", "created")
+TEMPLATE_NAMES_KEY = redis_key("toolkits", "latency_sleuth", "template_index", "names")
+TEMPLATE_SLA_KEY = redis_key("toolkits", "latency_sleuth", "template_index", "sla")
+TEMPLATE_TAGS_KEY = redis_key("toolkits", "latency_sleuth", "template_index", "tags")
+TEMPLATE_TAG_KEY_PREFIX = redis_key("toolkits", "latency_sleuth", "template_index", "tag")
+TEMPLATE_INDEX_BUILT_KEY = redis_key("toolkits", "latency_sleuth", "template_index", "built")
+JOB_INDEX_KEY = redis_key("toolkits", "latency_sleuth", "jobs")
+TEMPLATE_JOBS_KEY_PREFIX = redis_key("toolkits", "latency_sleuth", "template_jobs")
+JOB_INDEX_BACKFILL_KEY = redis_key("toolkits", "latency_sleuth", "jobs_backfilled")
+TEMPLATE_HEALTH_KEY = redis_key("toolkits", "latency_sleuth", "template_health")
+TEMPLATE_DRIFT_KEY = redis_key("toolkits", "latency_sleuth", "template_drift")
+REGRESSING_TEMPLATES_KEY = redis_key("toolkits", "latency_sleuth", "template_drift", "regressing")
+NOTIFICATION_QUEUE_KEY = redis_key("toolkits", "latency_sleuth", "notifications", "queue")
+NOTIFICATION_DEAD_LETTER_KEY = redis_key("toolkits", "latency_sleuth", "notifications", "dead_letter")
+MAX_DEAD_NOTIFICATIONS = 500
+REPLAY_LOG_KEY_PREFIX = redis_key("toolkits", "latency_sleuth", "replay_log")
+# Samples kept per template for SLA replays (24 characters each); trimmed in 25%
+# steps, and runs past the raw retention tier are dropped like raw history.
+REPLAY_LOG_MAX_SAMPLES = max(int(os.getenv("LATENCY_SLEUTH_REPLAY_SAMPLES", "100000")), 1)
+EXPORT_CHUNK_RECORDS = 4096
+# Supplied template ids end up in key names, SCAN patterns and NUL-separated index
+# members, so they may not contain glob characters, ':' or NUL.
+TEMPLATE_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,128}")
+SKETCH_KEY_PREFIX = redis_key("toolkits", "latency_sleuth", "sketch")
+# Per-template sorted set of live sketch keys, scored by when each expires.
+SKETCH_INDEX_KEY_PREFIX = redis_key("toolkits", "latency_sleuth", "sketch_index")
+SKETCH_DELETE_BATCH = 500
+RETENTION_ENV = "LATENCY_SLEUTH_RETENTION"
+# Seconds each tier is kept: raw runs, then minute/hour/day sketch aggregates.
+DEFAULT_RETENTION = {"raw": 86_400, "minute": 2 * 86_400, "hour": 35 * 86_400, "day": 400 * 86_400}
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3_600, "d": 86_400}
+
+
+def parse_retention(spec: str) -> Dict[str, int]:
+    """Parse ``"raw=12h,minute=3d"`` over the defaults; bare numbers are seconds."""
+
+    retention = dict(DEFAULT_RETENTION)
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        tier, _, value = item.partition("=")
+        tier, value = tier.strip(), value.strip().lower()
+        if tier not in retention:
+            raise ValueError(f"Unknown retention tier {tier!r}; expected one of {sorted(retention)}")
+        unit = _DURATION_UNITS.get(value[-1:])
+        try:
+            seconds = int(value[:-1]) * unit if unit else int(value)
+        except ValueError:
+            raise ValueError(f"Invalid retention for {tier!r}: {value!r}") from None
+        if seconds <= 0:
+            raise ValueError(f"Retention for {tier!r} must be positive")
+        retention[tier] = seconds
+    return retention
+
+
+RETENTION = parse_retention(os.getenv(RETENTION_ENV, ""))
+# (name, bucket width, retention) from coarsest to finest; all in seconds.
+SKETCH_RESOLUTIONS = (
+    ("day", 86_400, RETENTION["day"]),
+    ("hour", 3_600, RETENTION["hour"]),
+    ("minute", 60, RETENTION["minute"]),
+)
+FLEET_COUNTER_PREFIX = redis_key("toolkits", "latency_sleuth", "fleet")
+FLEET_COUNTER_BUCKET_SECONDS = 300
+FLEET_COUNTER_TTL_SECONDS = 25 * 3600
+# Heatmap bucket sizes served from the sketches; each is a multiple of a resolution.
+HEATMAP_BUCKET_SECONDS = (60, 300, 900, 3_600, 21_600, 86_400, 604_800)
+MAX_ROLLUP_HEATMAP_CELLS = 336
+# Raw runs older than the raw tier are compacted away on write, at most a batch
+# at a time and only once they are past the tier by the slack, so most writes
+# skip the extra round trip. The entry cap bounds fast probes regardless.
+MAX_HISTORY_ENTRIES = max(int(os.getenv("LATENCY_SLEUTH_HISTORY_MAX_RUNS", "1440")), 1)
+HISTORY_COMPACTION_BATCH = 16
+HISTORY_COMPACTION_SLACK = 0.05
 MAX_HEATMAP_CELLS = 48
 DEFAULT_HEATMAP_COLUMNS = 6
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class _TemplateCache:
+    """LRU of validated templates, each tagged with the version it was read at.
+
+    Every write bumps the template's counter in ``TEMPLATE_VERSIONS_KEY``, so
+    an entry is served only while its version still matches Redis; a stale
+    entry written by another process is dropped on the next read. Cached
+    templates are shared and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple[int, ProbeTemplate]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, template_id: str, version: Optional[int]) -> Optional[ProbeTemplate]:
+        with self._lock:
+            entry = self._entries.get(template_id)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                del self._entries[template_id]
+                return None
+            self._entries.move_to_end(template_id)
+            return entry[1]
+
+    def put(self, template_id: str, version: Optional[int], template: ProbeTemplate) -> None:
+        # Templates written before versioning have no counter until their next write.
+        if version is None:
+            return
+        with self._lock:
+            self._entries[template_id] = (version, template)
+            self._entries.move_to_end(template_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, template_id: str) -> None:
+        with self._lock:
+            self._entries.pop(template_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_template_cache = _TemplateCache(TEMPLATE_CACHE_SIZE)
+
+# Claims templates for a scheduled run in one round trip. KEYS are the schedule
+# index and the templates hash; ARGV carries the reservation time in epoch
+# microseconds, its ISO form, a batch limit and optionally explicit template
+# ids. Each claimed record has ``next_run_at``/``updated_at`` rewritten in place
+# (so field order and encoding survive) and its index score advanced, which
+# means concurrent schedulers can never claim the same run twice.
+RESERVE_TEMPLATES_SCRIPT = """
+local schedule_key = KEYS[1]
+local templates_key = KEYS[2]
+local versions_key = KEYS[3]
+local now_us = tonumber(ARGV[1])
+local now_iso = ARGV[2]
+local limit = tonumber(ARGV[3])
+local now_score = string.format('%.0f.%06d', math.floor(now_us / 1000000), now_us % 1000000)
+
+local function isoformat(us)
+  local secs = math.floor(us / 1000000)
+  local micros = us - secs * 1000000
+  local days = math.floor(secs / 86400)
+  local rem = secs - days * 86400
+  local z = days + 719468
+  local era = math.floor(z / 146097)
+  local doe = z - era * 146097
+  local yoe = math.floor((doe - math.floor(doe / 1460) + math.floor(doe / 36524) - math.floor(doe / 146096)) / 365)
+  local doy = doe - (365 * yoe + math.floor(yoe / 4) - math.floor(yoe / 100))
+  local mp = math.floor((5 * doy + 2) / 153)
+  local day = doy - math.floor((153 * mp + 2) / 5) + 1
+  local month = mp < 10 and mp + 3 or mp - 9
+  local year = yoe + era * 400
+  if month <= 2 then year = year + 1 end
+  return string.format('%04d-%02d-%02dT%02d:%02d:%02d.%06d+00:00', year, month, day,
+    math.floor(rem / 3600), math.floor((rem % 3600) / 60), rem % 60, micros), secs, micros
+end
+
+local candidates = {}
+if #ARGV > 3 then
+  for index = 4, #ARGV do
+    local score = redis.call('ZSCORE', schedule_key, ARGV[index])
+    if score and tonumber(score) <= tonumber(now_score) then
+      table.insert(candidates, ARGV[index])
+    end
+  end
+else
+  candidates = redis.call('ZRANGEBYSCORE', schedule_key, '-inf', now_score, 'LIMIT', 0, limit)
+end
+
+local claimed = {}
+for _, template_id in ipairs(candidates) do
+  local raw = redis.call('HGET', templates_key, template_id)
+  if not raw then
+    redis.call('ZREM', schedule_key, template_id)
+  else
+    local interval = tonumber(cjson.decode(raw)['interval_seconds']) or 0
+    local next_value = 'null'
+    if interval > 0 then
+      local next_iso, secs, micros = isoformat(now_us + interval * 1000000)
+      next_value = '"' .. next_iso .. '"'
+      redis.call('ZADD', schedule_key, string.format('%.0f.%06d', secs, micros), template_id)
+    end
+    raw = string.gsub(raw, '"next_run_at":%s*[^,}]*', '"next_run_at": ' .. next_value, 1)
+    raw = string.gsub(raw, '"updated_at":%s*"[^"]*"', '"updated_at": "' .. now_iso .. '"', 1)
+    redis.call('HSET', templates_key, template_id, raw)
+    table.insert(claimed, raw)
+    table.insert(claimed, redis.call('HINCRBY', versions_key, template_id, 1))
+  end
+end
+return claimed
+"""
+
+
+# Removes the active job mapping of each template in ARGV[2..] only while it
+# still points at the finishing job ARGV[1], so a newer run registered in the
+# meantime is left intact. Returns the number of mappings removed.
+CLEAR_ACTIVE_JOB_SCRIPT = """
+local cleared = 0
+for i = 2, #ARGV do
+  if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[1] then
+    cleared = cleared + redis.call('HDEL', KEYS[1], ARGV[i])
+  end
+end
+return cleared
+"""
+
+
+# Acquires the scheduler lease for ARGV[1], or extends it when ARGV[1] already
+# holds it. Returns 1 while the caller is leader.
+HOLD_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  redis.call('PEXPIRE', KEYS[1], ARGV[2])
+  return 1
+end
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+  return 1
+end
+return 0
+"""
+
+# Drops the scheduler lease only when ARGV[1] still owns it.
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Drops the ARGV[1] oldest history entries unless a concurrent writer already
+# did (the entry at that position is no longer ARGV[2]).
+COMPACT_HISTORY_SCRIPT = """
+local count = tonumber(ARGV[1])
+if redis.call('LINDEX', KEYS[1], -count) == ARGV[2] then
+  redis.call('LTRIM', KEYS[1], 0, -count - 1)
+  return count
+end
+return 0
+"""
+
+# Drops the first ARGV[2] characters of the replay log unless a concurrent
+# writer already trimmed it (the log no longer starts with ARGV[1]).
+EXPIRE_REPLAY_LOG_SCRIPT = """
+local head = ARGV[1]
+if redis.call('GETRANGE', KEYS[1], 0, #head - 1) ~= head then
+  return 0
+end
+redis.call('SET', KEYS[1], redis.call('GETRANGE', KEYS[1], tonumber(ARGV[2]), -1))
+return tonumber(ARGV[2])
+"""
+
+# Keeps the newest ARGV[1] characters of the replay log once it grows past them.
+TRIM_REPLAY_LOG_SCRIPT = """
+local length = redis.call('STRLEN', KEYS[1])
+local keep = tonumber(ARGV[1])
+if length > keep then
+  redis.call('SET', KEYS[1], redis.call('GETRANGE', KEYS[1], length - keep, -1))
+end
+return length
+"""
 
 
 def _history_key(template_id: str) -> str:
@@ -32,11 +319,11 @@ def _history_key(template_id: str) -> str:
 
 
 def _dump(data) -> str:
-    return json.dumps(data)
+    return codec.dumps(data)
 
 
 def _load(raw: str):
-    return json.loads(raw)
+    return codec.loads(raw)
 
 
 def _template_to_record(template: ProbeTemplate) -> dict:
@@ -47,12 +334,98 @@ def _record_to_template(record: dict) -> ProbeTemplate:
     return ProbeTemplate.model_validate(record)
 
 
+def _raw_to_template(raw: str) -> ProbeTemplate:
+    """Parse a stored record in one pass of pydantic's JSON parser.
+
+    Records are only written by this module, but ``model_construct`` is no
+    faster here: rebuilding the URL and datetimes by hand costs more than
+    validating straight from the JSON text.
+    """
+
+    return ProbeTemplate.model_validate_json(raw)
+
+
+def _schedule_score(value: datetime) -> float:
+    return value.timestamp()
+
+
+def _epoch_micros(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _schedule_due_at(template: ProbeTemplate) -> datetime:
+    return template.next_run_at or template.created_at
+
+
+def _index_schedule(client, template: ProbeTemplate) -> None:
+    """Mirror *template*'s next run into the due index sorted set."""
+
+    client.zadd(SCHEDULE_KEY, {template.id: _schedule_score(_schedule_due_at(template))})
+
+
+def _template_tag_key(tag: str) -> str:
+    return f"{TEMPLATE_TAG_KEY_PREFIX}:{tag.lower()}"
+
+
+def _index_tags(template: ProbeTemplate) -> Dict[str, str]:
+    """Distinct non-empty tags of *template*, keyed case-insensitively."""
+
+    tags: Dict[str, str] = {}
+    for raw in template.tags:
+        tag = raw.strip()
+        if tag:
+            tags.setdefault(tag.lower(), tag)
+    return tags
+
+
+def _name_entry(template: ProbeTemplate) -> str:
+    return f"{template.name.lower()}\x00{template.id}"
+
+
+def _unindex_template(client, template: ProbeTemplate) -> None:
+    client.zrem(TEMPLATE_CREATED_KEY, template.id)
+    client.zrem(TEMPLATE_NAMES_KEY, _name_entry(template))
+    client.zrem(TEMPLATE_SLA_KEY, template.id)
+    for tag in _index_tags(template).values():
+        client.srem(_template_tag_key(tag), template.id)
+        client.zincrby(TEMPLATE_TAGS_KEY, -1, tag)
+    client.zremrangebyscore(TEMPLATE_TAGS_KEY, "-inf", 0)
+
+
+def _index_template(client, template: ProbeTemplate, previous: Optional[ProbeTemplate] = None) -> None:
+    """Mirror *template* into the search indexes, replacing *previous*'s entries."""
+
+    if previous is not None:
+        _unindex_template(client, previous)
+    client.zadd(TEMPLATE_CREATED_KEY, {template.id: _epoch_micros(template.created_at)})
+    client.zadd(TEMPLATE_NAMES_KEY, {_name_entry(template): 0})
+    client.zadd(TEMPLATE_SLA_KEY, {template.id: template.sla_ms})
+    for tag in _index_tags(template).values():
+        client.sadd(_template_tag_key(tag), template.id)
+        client.zincrby(TEMPLATE_TAGS_KEY, 1, tag)
+
+
+def _write_template(client, template: ProbeTemplate, previous: Optional[ProbeTemplate] = None) -> None:
+    client.hset(TEMPLATES_KEY, template.id, _dump(_template_to_record(template)))
+    client.hincrby(TEMPLATE_VERSIONS_KEY, template.id, 1)
+    _template_cache.discard(template.id)
+    _index_schedule(client, template)
+    _index_template(client, template, previous)
+
+
+def _save_template(template: ProbeTemplate, previous: Optional[ProbeTemplate] = None) -> None:
+    redis = get_redis()
+    with redis.pipeline() as pipe:
+        _write_template(pipe, template, previous)
+        pipe.publish(SCHEDULE_CHANNEL, template.id)
+        pipe.execute()
+
+
 def _summary_to_entry(summary: ProbeExecutionSummary) -> ProbeHistoryEntry:
     return ProbeHistoryEntry(template_id=summary.template_id, recorded_at=utcnow(), summary=summary)
 
 
 def create_template(payload: ProbeTemplateCreate) -> ProbeTemplate:
-    redis = get_redis()
     template_id = str(uuid4())
     now = utcnow()
     template = ProbeTemplate(
@@ -62,22 +435,207 @@ def create_template(payload: ProbeTemplateCreate) -> ProbeTemplate:
         next_run_at=now,
         **payload.model_dump(),
     )
-    redis.hset(TEMPLATES_KEY, template_id, _dump(_template_to_record(template)))
+    _save_template(template)
     return template
 
 
+def is_valid_template_id(template_id: str) -> bool:
+    """Whether *template_id* is safe to embed in Redis keys, key patterns and index members."""
+
+    return TEMPLATE_ID_PATTERN.fullmatch(template_id) is not None
+
+
+def import_templates(items: Sequence[tuple[Optional[str], ProbeTemplateCreate]]) -> int:
+    """Create or replace templates in one pipeline, indexes included.
+
+    Items with an id replace that template (keeping its creation time and
+    schedule) or create it under that id; items without one get a new id.
+    Raises ``ValueError`` before writing anything if a supplied id fails
+    :func:`is_valid_template_id`.
+    """
+
+    if not items:
+        return 0
+    for template_id, _ in items:
+        if template_id and not is_valid_template_id(template_id):
+            raise ValueError(f"Invalid template id {template_id!r}")
+    redis = get_redis()
+    ids = list(dict.fromkeys(template_id for template_id, _ in items if template_id))
+    existing: Dict[str, ProbeTemplate] = {}
+    if ids:
+        for template_id, raw in zip(ids, redis.hmget(TEMPLATES_KEY, ids)):
+            if raw:
+                existing[template_id] = _raw_to_template(raw)
+    now = utcnow()
+    with redis.pipeline() as pipe:
+        for template_id, payload in items:
+            previous = existing.get(template_id) if template_id else None
+            template = ProbeTemplate(
+                id=template_id or str(uuid4()),
+                created_at=previous.created_at if previous else now,
+                updated_at=now,
+                next_run_at=previous.next_run_at if previous else now,
+                **payload.model_dump(),
+            )
+            _write_template(pipe, template, previous)
+            existing[template.id] = template
+        pipe.publish(SCHEDULE_CHANNEL, "")
+        pipe.execute()
+    return len(items)
+
+
+def iter_template_records(batch_size: int = 500) -> Iterator[str]:
+    """Yield stored template records as JSON text, scanning the hash incrementally."""
+
+    for _, raw in get_redis().hscan_iter(TEMPLATES_KEY, count=batch_size):
+        yield raw
+
+
 def list_templates() -> List[ProbeTemplate]:
     redis = get_redis()
     values = redis.hvals(TEMPLATES_KEY) or []
-    return [_record_to_template(_load(value)) for value in values]
+    return [_raw_to_template(value) for value in values]
+
+
+def _version(value) -> Optional[int]:
+    return int(value) if value is not None else None
 
 
 def get_template(template_id: str) -> Optional[ProbeTemplate]:
+    """Return *template_id*, skipping deserialisation while the cached version is current."""
+
     redis = get_redis()
+    version = _version(redis.hget(TEMPLATE_VERSIONS_KEY, template_id))
+    cached = _template_cache.get(template_id, version)
+    if cached is not None:
+        return cached
+    # Reading the record after its version means a concurrent write can only
+    # pair a newer record with an older version, which the next read evicts.
     raw = redis.hget(TEMPLATES_KEY, template_id)
     if not raw:
         return None
-    return _record_to_template(_load(raw))
+    template = _raw_to_template(raw)
+    _template_cache.put(template_id, version, template)
+    return template
+
+
+def get_templates(template_ids: Sequence[str]) -> List[ProbeTemplate]:
+    """Fetch several templates, skipping ids that no longer exist.
+
+    One ``HMGET`` of the version counters decides which cached entries are
+    current; only the rest are read and validated, in a second round trip.
+    """
+
+    if not template_ids:
+        return []
+    redis = get_redis()
+    ids = list(template_ids)
+    versions = [_version(value) for value in redis.hmget(TEMPLATE_VERSIONS_KEY, ids)]
+    found: Dict[str, ProbeTemplate] = {}
+    misses = []
+    for template_id, version in zip(ids, versions):
+        cached = _template_cache.get(template_id, version)
+        if cached is not None:
+            found[template_id] = cached
+        else:
+            misses.append((template_id, version))
+    if misses:
+        raws = redis.hmget(TEMPLATES_KEY, [template_id for template_id, _ in misses])
+        for (template_id, version), raw in zip(misses, raws):
+            if raw:
+                template = _raw_to_template(raw)
+                _template_cache.put(template_id, version, template)
+                found[template_id] = template
+    return [found[template_id] for template_id in ids if template_id in found]
+
+
+def rebuild_template_indexes() -> int:
+    """Recreate every template search index from the template hash."""
+
+    redis = get_redis()
+    templates = list_templates()
+    with redis.pipeline() as pipe:
+        pipe.delete(TEMPLATE_CREATED_KEY, TEMPLATE_NAMES_KEY, TEMPLATE_SLA_KEY, TEMPLATE_TAGS_KEY)
+        for key in list(redis.scan_iter(f"{TEMPLATE_TAG_KEY_PREFIX}:*")):
+            pipe.delete(key)
+        for template in templates:
+            _index_template(pipe, template)
+        pipe.set(TEMPLATE_INDEX_BUILT_KEY, "1")
+        pipe.execute()
+    return len(templates)
+
+
+def _ensure_template_indexes() -> None:
+    # Templates written before the indexes existed are picked up once.
+    if not get_redis().exists(TEMPLATE_INDEX_BUILT_KEY):
+        rebuild_template_indexes()
+
+
+def _name_prefix_ids(prefix: str) -> List[str]:
+    prefix = prefix.lower()
+    members = get_redis().zrangebylex(TEMPLATE_NAMES_KEY, f"[{prefix}", f"[{prefix}\U0010ffff")
+    return [member.rsplit("\x00", 1)[1] for member in members]
+
+
+def search_templates(
+    *,
+    tags: Sequence[str] = (),
+    name_prefix: Optional[str] = None,
+    sla_min: Optional[int] = None,
+    sla_max: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int,
+) -> tuple[List[ProbeTemplate], Optional[str]]:
+    """Page through templates newest first, narrowed by the secondary indexes.
+
+    Tags must all match (case-insensitively), *name_prefix* matches the start
+    of the name and the SLA bounds are inclusive. Only the ids are combined;
+    just the returned page is loaded from the template hash.
+    """
+
+    _ensure_template_indexes()
+    redis = get_redis()
+    candidates: Optional[set[str]] = None
+
+    def narrow(ids: Iterable[str]) -> None:
+        nonlocal candidates
+        candidates = set(ids) if candidates is None else candidates.intersection(ids)
+
+    wanted_tags = [tag.strip() for tag in tags if tag.strip()]
+    if wanted_tags:
+        narrow(redis.sinter([_template_tag_key(tag) for tag in wanted_tags]))
+    if name_prefix:
+        narrow(_name_prefix_ids(name_prefix))
+    if sla_min is not None or sla_max is not None:
+        low = sla_min if sla_min is not None else "-inf"
+        high = sla_max if sla_max is not None else "+inf"
+        narrow(redis.zrangebyscore(TEMPLATE_SLA_KEY, low, high))
+
+    if candidates is None:
+        page = _scan_newest_first(TEMPLATE_CREATED_KEY, low="-inf", high="+inf", cursor=cursor, count=limit + 1)
+    else:
+        ids = sorted(candidates)
+        scores = redis.zmscore(TEMPLATE_CREATED_KEY, ids) if ids else []
+        after = decode_cursor(cursor) if cursor else None
+        ranked = sorted(
+            (
+                (int(score), template_id)
+                for template_id, score in zip(ids, scores)
+                if score is not None and _after_cursor(int(score), template_id, after)
+            ),
+            reverse=True,
+        )
+        page = [(template_id, score) for score, template_id in ranked[: limit + 1]]
+
+    next_cursor = encode_cursor(page[limit - 1][1], page[limit - 1][0]) if len(page) > limit else None
+    return get_templates([template_id for template_id, _ in page[:limit]]), next_cursor
+
+
+def list_template_tags() -> List[str]:
+    """Every tag in use, sorted case-insensitively."""
+
+    _ensure_template_indexes()
+    return sorted(get_redis().zrangebyscore(TEMPLATE_TAGS_KEY, 1, "+inf"), key=str.lower)
 
 
 def update_template(template_id: str, payload: ProbeTemplateUpdate) -> Optional[ProbeTemplate]:
@@ -101,117 +659,776 @@ def update_template(template_id: str, payload: ProbeTemplateUpdate) -> Optional[
         "updated_at": utcnow(),
         "next_run_at": next_run_at,
     })
-    redis = get_redis()
-    redis.hset(TEMPLATES_KEY, template_id, _dump(_template_to_record(updated)))
+    _save_template(updated, current)
     return updated
 
 
-def _compute_next_run(template: ProbeTemplate, *, base_time=None) -> Optional[str]:
-    if template.interval_seconds <= 0:
-        return None
-    origin = base_time or utcnow()
-    next_run = origin + timedelta(seconds=template.interval_seconds)
-    return next_run.isoformat()
+def _run_reserve_script(timestamp: datetime, *, limit: int = 0, template_ids: Sequence[str] = ()) -> List[ProbeTemplate]:
+    redis = get_redis()
+    script = redis.register_script(RESERVE_TEMPLATES_SCRIPT)
+    claimed = script(
+        keys=[SCHEDULE_KEY, TEMPLATES_KEY, TEMPLATE_VERSIONS_KEY],
+        args=[_epoch_micros(timestamp), timestamp.isoformat(), limit, *template_ids],
+    ) or []
+    templates = []
+    # The script returns each claimed record followed by its new version.
+    for raw, version in zip(claimed[::2], claimed[1::2]):
+        template = _raw_to_template(raw)
+        _template_cache.put(template.id, int(version), template)
+        templates.append(template)
+    return templates
+
+
+def reserve_due_templates(limit: int, *, now=None) -> List[ProbeTemplate]:
+    """Atomically claim up to *limit* due templates and advance their next run."""
+
+    if limit <= 0:
+        return []
+    return _run_reserve_script(now or utcnow(), limit=limit)
+
+
+def reserve_templates_for_run(template_ids: Sequence[str], *, now=None) -> List[ProbeTemplate]:
+    """Claim the given templates that are still due, skipping any already claimed."""
+
+    if not template_ids:
+        return []
+    return _run_reserve_script(now or utcnow(), template_ids=template_ids)
 
 
 def reserve_template_for_run(template_id: str, *, now=None) -> Optional[ProbeTemplate]:
-    timestamp = now or utcnow()
-    redis = get_redis()
+    reserved = reserve_templates_for_run([template_id], now=now)
+    return reserved[0] if reserved else None
+
+
+def next_due_at(*, after=None) -> Optional[datetime]:
+    """Return the earliest scheduled run strictly later than *after*.
+
+    Only scores after *after* count, so templates that are already due are
+    ignored whether they were just claimed or are still blocked by an active
+    job, and the scheduler does not wake in a loop for them.
+    """
+
+    score = _schedule_score(after or utcnow())
+    entries = get_redis().zrangebyscore(SCHEDULE_KEY, f"({score}", "+inf", start=0, num=1, withscores=True)
+    if not entries:
+        return None
+    _, next_score = entries[0]
+    return datetime.fromtimestamp(float(next_score), tz=timezone.utc)
 
-    while True:
-        with redis.pipeline() as pipe:
-            try:
-                pipe.watch(TEMPLATES_KEY)
-                raw = pipe.hget(TEMPLATES_KEY, template_id)
-                if not raw:
-                    pipe.unwatch()
-                    return None
 
-                record = _load(raw)
-                template = ProbeTemplate.model_validate(record)
+def subscribe_schedule_changes():
+    """Return a pub/sub subscription notified whenever the schedule may move earlier."""
 
-                current_next = template.next_run_at or template.created_at
-                if current_next and current_next > timestamp:
-                    pipe.unwatch()
-                    return None
+    subscription = get_redis().pubsub(ignore_subscribe_messages=True)
+    subscription.subscribe(SCHEDULE_CHANNEL)
+    return subscription
 
-                record["next_run_at"] = _compute_next_run(template, base_time=timestamp)
-                record["updated_at"] = timestamp.isoformat()
 
-                pipe.multi()
-                pipe.hset(TEMPLATES_KEY, template_id, _dump(record))
-                pipe.execute()
-                return ProbeTemplate.model_validate(record)
-            except WatchError:
-                continue
+def list_due_template_ids(limit: Optional[int] = None, *, now=None) -> List[str]:
+    """Return ids of templates due at or before *now*, earliest first."""
+
+    score = _schedule_score(now or utcnow())
+    redis = get_redis()
+    if limit is not None:
+        return redis.zrangebyscore(SCHEDULE_KEY, "-inf", score, start=0, num=limit)
+    return redis.zrangebyscore(SCHEDULE_KEY, "-inf", score)
 
 
 def list_due_templates(limit: Optional[int] = None, *, now=None) -> List[ProbeTemplate]:
-    timestamp = now or utcnow()
+    """Return templates whose next run is at or before *now*, earliest first.
+
+    Only the ids scored as due in the schedule index are fetched, so the cost
+    tracks the number of due templates rather than the size of the fleet.
+    """
+
+    template_ids = list_due_template_ids(limit, now=now)
+    if not template_ids:
+        return []
+
+    redis = get_redis()
     due: List[ProbeTemplate] = []
-    for template in list_templates():
-        next_run = template.next_run_at or template.created_at
-        if not next_run or next_run <= timestamp:
-            due.append(template)
-            if limit is not None and len(due) >= limit:
-                break
+    stale: List[str] = []
+    for template_id, raw in zip(template_ids, redis.hmget(TEMPLATES_KEY, template_ids)):
+        if not raw:
+            stale.append(template_id)
+            continue
+        due.append(_raw_to_template(raw))
+    if stale:
+        redis.zrem(SCHEDULE_KEY, *stale)
     return due
 
 
 def bootstrap_schedule(*, now=None) -> int:
+    """Backfill missing ``next_run_at`` values and rebuild the due index."""
+
     timestamp = now or utcnow()
     redis = get_redis()
     updated = 0
+    scores = {}
     for template in list_templates():
-        if template.next_run_at is not None:
-            continue
-        record = _template_to_record(template)
-        record["next_run_at"] = timestamp.isoformat()
-        redis.hset(TEMPLATES_KEY, template.id, _dump(record))
-        updated += 1
+        if template.next_run_at is None:
+            record = _template_to_record(template)
+            record["next_run_at"] = timestamp.isoformat()
+            redis.hset(TEMPLATES_KEY, template.id, _dump(record))
+            redis.hincrby(TEMPLATE_VERSIONS_KEY, template.id, 1)
+            template = _record_to_template(record)
+            updated += 1
+        scores[template.id] = _schedule_score(_schedule_due_at(template))
+    if scores:
+        redis.zadd(SCHEDULE_KEY, scores)
     return updated
 
 
+def hold_scheduler_lease(owner: str, ttl_seconds: float) -> bool:
+    """Acquire or renew the scheduler lease for *owner*; ``True`` while leader."""
+
+    redis = get_redis()
+    script = redis.register_script(HOLD_LEASE_SCRIPT)
+    return bool(script(keys=[SCHEDULER_LEASE_KEY], args=[owner, int(ttl_seconds * 1000)]))
+
+
+def release_scheduler_lease(owner: str) -> bool:
+    """Give up the scheduler lease so a standby process can take over at once."""
+
+    redis = get_redis()
+    script = redis.register_script(RELEASE_LEASE_SCRIPT)
+    released = bool(script(keys=[SCHEDULER_LEASE_KEY], args=[owner]))
+    if released:
+        redis.publish(SCHEDULE_CHANNEL, "")
+    return released
+
+
+def set_active_job(template_id: str, job_id: str) -> None:
+    """Record *job_id* as the in-flight run for *template_id*."""
+
+    get_redis().hset(ACTIVE_JOBS_KEY, template_id, job_id)
+
+
+def get_active_jobs(template_ids: Sequence[str]) -> Dict[str, str]:
+    """Return the recorded in-flight job id for each template that has one."""
+
+    if not template_ids:
+        return {}
+    values = get_redis().hmget(ACTIVE_JOBS_KEY, list(template_ids))
+    return {template_id: job_id for template_id, job_id in zip(template_ids, values) if job_id}
+
+
+def clear_active_job(template_id: str, job_id: str) -> bool:
+    """Forget *job_id* as the active run for *template_id* if it is still recorded."""
+
+    return clear_active_jobs([template_id], job_id) > 0
+
+
+def clear_active_jobs(template_ids: Sequence[str], job_id: str) -> int:
+    """Forget *job_id* as the active run for each of *template_ids*; returns how many were cleared."""
+
+    if not template_ids:
+        return 0
+    redis = get_redis()
+    script = redis.register_script(CLEAR_ACTIVE_JOB_SCRIPT)
+    cleared = int(script(keys=[ACTIVE_JOBS_KEY], args=[job_id, *template_ids]))
+    if cleared:
+        # A template skipped while its job ran may be overdue; wake the scheduler.
+        redis.publish(SCHEDULE_CHANNEL, job_id)
+    return cleared
+
+
+def _cancel_key(job_id: str) -> str:
+    return f"{CANCEL_KEY_PREFIX}:{job_id}"
+
+
+def request_job_cancellation(job_id: str) -> None:
+    """Raise the cancellation flag that running workers poll for *job_id*."""
+
+    get_redis().set(_cancel_key(job_id), "1", ex=CANCEL_SIGNAL_TTL_SECONDS)
+
+
+def is_job_cancellation_requested(job_id: str) -> bool:
+    return bool(get_redis().exists(_cancel_key(job_id)))
+
+
+def clear_job_cancellation(job_id: str) -> None:
+    get_redis().delete(_cancel_key(job_id))
+
+
+def _job_events_channel(job_id: str) -> str:
+    return f"{JOB_EVENTS_CHANNEL_PREFIX}:{job_id}"
+
+
+def publish_job_event(job_id: str, event: dict) -> None:
+    """Broadcast a job delta (new log lines, progress, status) to open event streams."""
+
+    get_redis().publish(_job_events_channel(job_id), _dump(event))
+
+
+def subscribe_job_events():
+    """Return one pub/sub subscription to every job's deltas; see :func:`job_event_job_id`."""
+
+    subscription = get_redis().pubsub(ignore_subscribe_messages=True)
+    subscription.psubscribe(_job_events_channel("*"))
+    return subscription
+
+
+def job_event_job_id(channel: str) -> str:
+    """The job a message received through :func:`subscribe_job_events` belongs to."""
+
+    return channel[len(JOB_EVENTS_CHANNEL_PREFIX) + 1 :]
+
+
+def _template_jobs_key(template_id: str) -> str:
+    return f"{TEMPLATE_JOBS_KEY_PREFIX}:{template_id}"
+
+
+def _job_template_ids(job: dict) -> List[str]:
+    payload = job.get("payload") or {}
+    if payload.get("template_id"):
+        return [payload["template_id"]]
+    return list(payload.get("template_ids") or [])
+
+
+def index_jobs(jobs: Iterable[dict]) -> None:
+    """Add *jobs* to the creation-ordered job index and to each targeted template's index."""
+
+    with get_redis().pipeline() as pipe:
+        for job in jobs:
+            created_at = datetime.fromisoformat(job["created_at"]) if job.get("created_at") else utcnow()
+            score = _epoch_micros(created_at)
+            pipe.zadd(JOB_INDEX_KEY, {job["id"]: score})
+            for template_id in _job_template_ids(job):
+                pipe.zadd(_template_jobs_key(template_id), {job["id"]: score})
+        pipe.execute()
+
+
+def index_job(job: dict) -> None:
+    index_jobs([job])
+
+
+def claim_job_index_backfill() -> bool:
+    """Return ``True`` exactly once, for the caller that should index pre-existing jobs."""
+
+    return bool(get_redis().set(JOB_INDEX_BACKFILL_KEY, "1", nx=True))
+
+
+def release_job_index_backfill() -> None:
+    """Give the backfill claim back after a failed attempt so the next caller retries it."""
+
+    get_redis().delete(JOB_INDEX_BACKFILL_KEY)
+
+
+def unindex_jobs(job_ids: Sequence[str], *, template_id: Optional[str] = None) -> None:
+    """Drop ids whose job records no longer exist from the job index and *template_id*'s index.
+
+    Only the indexes a listing reads are cleaned; a pruned job left in another
+    template's index is dropped when that index is listed.
+    """
+
+    if not job_ids:
+        return
+    keys = [JOB_INDEX_KEY]
+    if template_id:
+        keys.append(_template_jobs_key(template_id))
+    with get_redis().pipeline() as pipe:
+        for key in keys:
+            pipe.zrem(key, *job_ids)
+        pipe.execute()
+
+
+def encode_cursor(score: int, member: str) -> str:
+    return f"{score}:{member}"
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    """Parse a cursor from :func:`encode_cursor`; raises ``ValueError`` when malformed."""
+
+    score, separator, member = cursor.partition(":")
+    if not separator or not member:
+        raise ValueError("Malformed cursor")
+    return int(score), member
+
+
+def _after_cursor(score: int, member: str, after: Optional[tuple[int, str]]) -> bool:
+    # Newest-first order: higher scores first, ties by member descending.
+    return after is None or (score, member) < after
+
+
+def _scan_newest_first(
+    key: str, *, low: float | str, high: float | str, cursor: Optional[str], count: int
+) -> List[tuple[str, int]]:
+    """Return up to *count* ``(member, score)`` pairs of sorted set *key*, highest score first, after *cursor*."""
+
+    after = decode_cursor(cursor) if cursor else None
+    if after is not None:
+        high = after[0] if high == "+inf" else min(high, after[0])
+    redis = get_redis()
+    entries: List[tuple[str, int]] = []
+    offset = 0
+    while len(entries) < count:
+        batch = redis.zrevrangebyscore(key, high, low, start=offset, num=count, withscores=True)
+        if not batch:
+            break
+        offset += len(batch)
+        entries.extend(
+            (member, int(score)) for member, score in batch if _after_cursor(int(score), member, after)
+        )
+        if len(batch) < count:
+            break
+    return entries[:count]
+
+
+def scan_job_index(
+    *,
+    template_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    count: int,
+) -> List[tuple[str, int]]:
+    """Return up to *count* ``(job_id, score)`` pairs, newest first, strictly after *cursor*.
+
+    Scores are creation times in epoch microseconds, so *since*/*until* become
+    score bounds. Jobs created in the same microsecond are ordered by id,
+    which keeps the cursor stable across ties.
+    """
+
+    return _scan_newest_first(
+        _template_jobs_key(template_id) if template_id else JOB_INDEX_KEY,
+        low=_epoch_micros(since) if since else "-inf",
+        high=_epoch_micros(until) if until else "+inf",
+        cursor=cursor,
+        count=count,
+    )
+
+
 def delete_template(template_id: str) -> bool:
+    template = get_template(template_id)
     redis = get_redis()
     removed = redis.hdel(TEMPLATES_KEY, template_id)
+    redis.hdel(TEMPLATE_VERSIONS_KEY, template_id)
+    _template_cache.discard(template_id)
+    if template is not None:
+        with redis.pipeline() as pipe:
+            _unindex_template(pipe, template)
+            pipe.execute()
+    redis.zrem(SCHEDULE_KEY, template_id)
+    redis.hdel(ACTIVE_JOBS_KEY, template_id)
+    redis.hdel(TEMPLATE_HEALTH_KEY, template_id)
+    redis.hdel(TEMPLATE_DRIFT_KEY, template_id)
+    redis.srem(REGRESSING_TEMPLATES_KEY, template_id)
     redis.delete(_history_key(template_id))
+    redis.delete(_template_jobs_key(template_id))
+    redis.delete(_replay_log_key(template_id))
+    _delete_sketches(redis, template_id)
     return bool(removed)
 
 
+def get_template_health(template_id: str) -> Optional[str]:
+    """Whether the latest recorded run of *template_id* breached, without changing it."""
+
+    return get_redis().hget(TEMPLATE_HEALTH_KEY, template_id)
+
+
+def swap_template_health(template_id: str, state: str) -> Optional[str]:
+    """Store whether the latest run of *template_id* breached, returning the previous state."""
+
+    with get_redis().pipeline() as pipe:
+        pipe.hget(TEMPLATE_HEALTH_KEY, template_id)
+        pipe.hset(TEMPLATE_HEALTH_KEY, template_id, state)
+        previous, _ = pipe.execute()
+    return previous
+
+
+def enqueue_notifications(events: Sequence[NotificationEvent]) -> None:
+    if not events:
+        return
+    with get_redis().pipeline() as pipe:
+        for event in events:
+            pipe.lpush(NOTIFICATION_QUEUE_KEY, event.model_dump_json())
+        pipe.execute()
+
+
+def pop_notifications(limit: int) -> List[NotificationEvent]:
+    """Atomically take up to *limit* of the oldest queued notifications, oldest first."""
+
+    if limit <= 0:
+        return []
+    with get_redis().pipeline() as pipe:
+        pipe.lrange(NOTIFICATION_QUEUE_KEY, -limit, -1)
+        pipe.ltrim(NOTIFICATION_QUEUE_KEY, 0, -limit - 1)
+        raws, _ = pipe.execute()
+    return [NotificationEvent.model_validate_json(raw) for raw in reversed(raws)]
+
+
+def record_dead_notifications(events: Sequence[NotificationEvent], error: str) -> None:
+    """Keep the most recent undeliverable notifications for inspection."""
+
+    if not events:
+        return
+    with get_redis().pipeline() as pipe:
+        for event in events:
+            pipe.lpush(NOTIFICATION_DEAD_LETTER_KEY, _dump({"error": error, "event": event.model_dump(mode="json")}))
+        pipe.ltrim(NOTIFICATION_DEAD_LETTER_KEY, 0, MAX_DEAD_NOTIFICATIONS - 1)
+        pipe.execute()
+
+
+def _replay_log_key(template_id: str) -> str:
+    return f"{REPLAY_LOG_KEY_PREFIX}:{template_id}"
+
+
 def record_probe_result(summary: ProbeExecutionSummary) -> ProbeHistoryEntry:
     redis = get_redis()
     entry = _summary_to_entry(summary)
     key = _history_key(summary.template_id)
-    redis.lpush(key, _dump(entry.model_dump(mode="json")))
-    redis.ltrim(key, 0, MAX_HISTORY_ENTRIES - 1)
+    replay_key = _replay_log_key(summary.template_id)
+    latency_ms = run_latency(summary.samples)
+    detector = None
+    if latency_ms is not None:
+        raw_drift = redis.hget(TEMPLATE_DRIFT_KEY, summary.template_id)
+        detector = DriftDetector.from_record(_load(raw_drift) if raw_drift else None)
+        detector.update(latency_ms, entry.recorded_at)
+    with redis.pipeline() as pipe:
+        pipe.append(replay_key, encode_samples(entry.recorded_at, summary.samples))
+        pipe.getrange(replay_key, 0, RECORD_CHARS - 1)
+        pipe.lpush(key, _dump(encode_entry(entry)))
+        pipe.ltrim(key, 0, MAX_HISTORY_ENTRIES - 1)
+        pipe.lindex(key, -1)
+        _record_sketches(pipe, summary)
+        _record_fleet_counters(pipe, entry.recorded_at, summary.breach_count)
+        if detector is not None:
+            _record_drift(pipe, summary.template_id, detector)
+        replay_length, replay_head, _, _, oldest, *_ = pipe.execute()
+    replay_length -= _expire_replay_log(redis, replay_key, replay_head, entry.recorded_at)
+    keep = REPLAY_LOG_MAX_SAMPLES * RECORD_CHARS
+    if replay_length > keep * 5 // 4:
+        redis.register_script(TRIM_REPLAY_LOG_SCRIPT)(keys=[replay_key], args=[keep])
+    if oldest is not None:
+        _compact_history(redis, key, oldest, entry.recorded_at)
     return entry
 
 
-def list_history(template_id: str, limit: int = MAX_HISTORY_ENTRIES) -> List[ProbeHistoryEntry]:
+def _compact_history(redis, key: str, oldest: str, now: datetime) -> int:
+    """Drop raw runs past the raw tier; the sketches already hold their aggregates."""
+
+    cutoff = now - timedelta(seconds=RETENTION["raw"])
+    if decode_run_stats(_load(oldest))[0] >= cutoff - timedelta(seconds=RETENTION["raw"] * HISTORY_COMPACTION_SLACK):
+        return 0
+    expired = 0
+    # Newest first, so the oldest entries are at the end of the tail.
+    tail = redis.lrange(key, -HISTORY_COMPACTION_BATCH, -1)
+    for raw in reversed(tail):
+        if decode_run_stats(_load(raw))[0] >= cutoff:
+            break
+        expired += 1
+    if not expired:
+        return 0
+    return int(redis.register_script(COMPACT_HISTORY_SCRIPT)(keys=[key], args=[expired, tail[-expired]]))
+
+
+def _expire_replay_log(redis, key: str, head: str, now: datetime) -> int:
+    """Drop runs past the raw tier from the front of the replay log; returns the characters removed."""
+
+    cutoff = int((now - timedelta(seconds=RETENTION["raw"])).timestamp())
+    epoch = first_epoch(head)
+    if epoch is not None and epoch >= cutoff - int(RETENTION["raw"] * HISTORY_COMPACTION_SLACK):
+        return 0
+    expired = expired_records(_iter_replay_log(redis, key, EXPORT_CHUNK_RECORDS), cutoff)
+    if not expired:
+        return 0
+    return int(redis.register_script(EXPIRE_REPLAY_LOG_SCRIPT)(keys=[key], args=[head, expired * RECORD_CHARS]))
+
+
+def _record_drift(pipe, template_id: str, detector: DriftDetector) -> None:
+    pipe.hset(TEMPLATE_DRIFT_KEY, template_id, _dump(detector.to_record()))
+    if detector.status == "regressing":
+        pipe.sadd(REGRESSING_TEMPLATES_KEY, template_id)
+    else:
+        pipe.srem(REGRESSING_TEMPLATES_KEY, template_id)
+
+
+def get_drift_state(template_id: str) -> DriftState:
+    raw = get_redis().hget(TEMPLATE_DRIFT_KEY, template_id)
+    return DriftDetector.from_record(_load(raw) if raw else None).state(template_id)
+
+
+def count_regressing_templates() -> int:
+    return int(get_redis().scard(REGRESSING_TEMPLATES_KEY))
+
+
+def _runs_before_log(template_id: str, oldest: Optional[str], log_start: Optional[int]) -> List[ProbeHistoryEntry]:
+    """History runs, oldest first, recorded before the replay log's first sample."""
+
+    # Runs recorded before the log existed are only in history.
+    if not oldest or (log_start is not None and int(decode_run_stats(_load(oldest))[0].timestamp()) >= log_start):
+        return []
+    return [
+        entry
+        for entry in reversed(list_history(template_id))
+        if log_start is None or int(entry.recorded_at.timestamp()) < log_start
+    ]
+
+
+def load_replay_log(template_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> ReplayLog:
+    """Samples recorded in ``[start, end)``, including stored history older than the log itself."""
+
+    redis = get_redis()
+    with redis.pipeline() as pipe:
+        pipe.get(_replay_log_key(template_id))
+        pipe.lrange(_history_key(template_id), -1, -1)
+        raw, oldest = pipe.execute()
+    raw = raw or ""
+    older = _runs_before_log(template_id, oldest[0] if oldest else None, first_epoch(raw))
+    if older:
+        raw = "".join(encode_samples(entry.recorded_at, entry.summary.samples) for entry in older) + raw
+    return decode_log(
+        raw,
+        start=int(start.timestamp()) if start else None,
+        end=math.ceil(end.timestamp()) if end else None,
+    )
+
+
+def _iter_replay_log(redis, key: str, chunk_records: int) -> Iterator[str]:
+    # The byte offset is the cursor. A trim racing the export shifts the log, so
+    # a long export may repeat or skip a few samples near that point.
+    size = chunk_records * RECORD_CHARS
+    offset = 0
+    while True:
+        chunk = redis.getrange(key, offset, offset + size - 1)
+        if chunk:
+            yield chunk
+        if len(chunk) < size:
+            return
+        offset += size
+
+
+def iter_history_samples(
+    template_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    *,
+    chunk_records: int = EXPORT_CHUNK_RECORDS,
+) -> Iterator[LoggedSample]:
+    """Yield every retained sample of *template_id* in ``[start, end)``, oldest first.
+
+    The replay log is read in fixed-size slices, so memory stays flat however
+    long the range is.
+    """
+
     redis = get_redis()
-    raw_values = redis.lrange(_history_key(template_id), 0, limit - 1)
-    history: List[ProbeHistoryEntry] = []
-    for raw in raw_values:
-        history.append(ProbeHistoryEntry.model_validate(_load(raw)))
-    return history
+    key = _replay_log_key(template_id)
+    with redis.pipeline() as pipe:
+        pipe.getrange(key, 0, chunk_records * RECORD_CHARS - 1)
+        pipe.lrange(_history_key(template_id), -1, -1)
+        head, oldest = pipe.execute()
+    first = int(start.timestamp()) if start else None
+    last = math.ceil(end.timestamp()) if end else None
+
+    def _in_window(epoch: int) -> bool:
+        return (first is None or epoch >= first) and (last is None or epoch < last)
+
+    for entry in _runs_before_log(template_id, oldest[0] if oldest else None, first_epoch(head or "")):
+        epoch = int(entry.recorded_at.timestamp())
+        if _in_window(epoch):
+            for sample in entry.summary.samples:
+                yield LoggedSample(
+                    epoch, sample.attempt, sample.latency_ms, sample_failed(sample), sampled_at_ms(sample)
+                )
+    if head:
+        for sample in iter_records(_iter_replay_log(redis, key, chunk_records)):
+            if _in_window(sample.recorded_at):
+                yield sample
+
+
+def iter_template_ids(batch_size: int = 500) -> Iterator[str]:
+    for template_id, _ in get_redis().hscan_iter(TEMPLATES_KEY, count=batch_size):
+        yield template_id
+
+
+def _fleet_counter_key(kind: str, bucket: int) -> str:
+    return f"{FLEET_COUNTER_PREFIX}:{kind}:{bucket}"
+
+
+def _record_fleet_counters(pipe, recorded_at: datetime, breach_count: int) -> None:
+    bucket = int(recorded_at.timestamp()) // FLEET_COUNTER_BUCKET_SECONDS
+    runs_key = _fleet_counter_key("runs", bucket)
+    pipe.incrby(runs_key, 1)
+    pipe.expire(runs_key, FLEET_COUNTER_TTL_SECONDS)
+    if breach_count:
+        breaches_key = _fleet_counter_key("breaches", bucket)
+        pipe.incrby(breaches_key, breach_count)
+        pipe.expire(breaches_key, FLEET_COUNTER_TTL_SECONDS)
+
+
+def fleet_run_counts(since: datetime, *, now=None) -> tuple[int, int]:
+    """Return ``(runs, sample breaches)`` recorded fleet-wide since *since*.
+
+    Counts come from five-minute buckets read with a single ``MGET``, so the
+    window edge is accurate to one bucket and the cost does not depend on the
+    number of templates.
+    """
+
+    first = int(since.timestamp()) // FLEET_COUNTER_BUCKET_SECONDS
+    last = int((now or utcnow()).timestamp()) // FLEET_COUNTER_BUCKET_SECONDS
+    buckets = range(first, last + 1)
+    keys = [_fleet_counter_key("runs", bucket) for bucket in buckets]
+    keys += [_fleet_counter_key("breaches", bucket) for bucket in buckets]
+    values = get_redis().mget(keys)
+    runs = sum(int(value) for value in values[: len(buckets)] if value)
+    breaches = sum(int(value) for value in values[len(buckets) :] if value)
+    return runs, breaches
+
+
+def count_templates() -> int:
+    return int(get_redis().hlen(TEMPLATES_KEY))
+
+
+def count_scheduled_before(until: datetime) -> int:
+    """Number of templates whose next run (overdue included) is at or before *until*."""
+
+    return int(get_redis().zcount(SCHEDULE_KEY, "-inf", _schedule_score(until)))
+
+
+def _sketch_index_key(template_id: str) -> str:
+    return f"{SKETCH_INDEX_KEY_PREFIX}:{template_id}"
+
+
+def _sketch_key(template_id: str, resolution: str, bucket_start: int) -> str:
+    return f"{SKETCH_KEY_PREFIX}:{template_id}:{resolution}:{bucket_start}"
+
+
+def _record_sketches(pipe, summary: ProbeExecutionSummary) -> None:
+    """Queue sketch increments for every resolution bucket the samples fall in."""
+
+    sketches: Dict[str, tuple[LatencySketch, int]] = {}
+    for sample in summary.samples:
+        epoch = int(sample.timestamp.timestamp())
+        for resolution, width, retention in SKETCH_RESOLUTIONS:
+            key = _sketch_key(summary.template_id, resolution, epoch - epoch % width)
+            if key not in sketches:
+                sketches[key] = (LatencySketch(), retention)
+            sketches[key][0].add(sample.latency_ms, sample.breach)
+
+    now = int(utcnow().timestamp())
+    index_key = _sketch_index_key(summary.template_id)
+    for key, (sketch, retention) in sketches.items():
+        for field, amount in sketch.to_fields().items():
+            if isinstance(amount, float):
+                pipe.hincrbyfloat(key, field, amount)
+            else:
+                pipe.hincrby(key, field, amount)
+        pipe.expire(key, retention)
+        pipe.zadd(index_key, {key: now + retention})
+    # Keys that have expired leave the index, so it stays as bounded as the sketches.
+    pipe.zremrangebyscore(index_key, "-inf", now)
+    pipe.expire(index_key, max(retention for _, _, retention in SKETCH_RESOLUTIONS))
+
+
+def _delete_sketches(redis, template_id: str) -> None:
+    """Delete *template_id*'s sketches through its index rather than a keyspace scan."""
+
+    index_key = _sketch_index_key(template_id)
+    keys = redis.zrange(index_key, 0, -1)
+    with redis.pipeline() as pipe:
+        for offset in range(0, len(keys), SKETCH_DELETE_BATCH):
+            pipe.delete(*keys[offset : offset + SKETCH_DELETE_BATCH])
+        pipe.delete(index_key)
+        pipe.execute()
+
+
+def _plan_sketch_buckets(template_id: str, start: int, end: int, now: int) -> List[str]:
+    """Cover ``[start, end)`` with the fewest retained sketch buckets.
+
+    Whole days and hours use the coarse buckets; the ragged edges fall back to
+    the finest resolution still retained, so partial edge buckets are counted
+    in full.
+    """
+
+    keys: List[str] = []
+    cursor = start
+    while cursor < end:
+        chosen = None
+        for resolution, width, retention in SKETCH_RESOLUTIONS:
+            if cursor % width == 0 and cursor + width <= end and now - cursor < retention:
+                chosen = (resolution, width)
+                break
+        if chosen is None:
+            for resolution, width, retention in reversed(SKETCH_RESOLUTIONS):
+                if now - (cursor - cursor % width) < retention:
+                    chosen = (resolution, width)
+                    break
+        if chosen is None:
+            # Older than every retention window; skip ahead to the next day.
+            width = SKETCH_RESOLUTIONS[0][1]
+            cursor = cursor - cursor % width + width
+            continue
+        resolution, width = chosen
+        bucket_start = cursor - cursor % width
+        keys.append(_sketch_key(template_id, resolution, bucket_start))
+        cursor = bucket_start + width
+    return keys
+
+
+def load_latency_sketch(template_id: str, start: datetime, end: datetime, *, now=None) -> LatencySketch:
+    """Merge the stored sketches covering ``[start, end)`` for *template_id*."""
+
+    timestamp = int((now or utcnow()).timestamp())
+    # Round the end up so a window ending mid-second still covers that second's bucket.
+    keys = _plan_sketch_buckets(template_id, int(start.timestamp()), math.ceil(end.timestamp()), timestamp)
+    if not keys:
+        return LatencySketch()
+    with get_redis().pipeline() as pipe:
+        for key in keys:
+            pipe.hgetall(key)
+        buckets = pipe.execute()
+    return LatencySketch.merged(LatencySketch.from_fields(fields) for fields in buckets if fields)
+
+
+def latency_percentiles(template_id: str, start: datetime, end: datetime, *, now=None) -> LatencyPercentiles:
+    sketch = load_latency_sketch(template_id, start, end, now=now)
+
+    def _rounded(value: Optional[float]) -> Optional[float]:
+        return round(value, 2) if value is not None else None
+
+    return LatencyPercentiles(
+        template_id=template_id,
+        start=start,
+        end=end,
+        sample_count=sketch.count,
+        breach_count=sketch.breaches,
+        mean_ms=_rounded(sketch.mean),
+        p50_ms=_rounded(sketch.quantile(0.5)),
+        p90_ms=_rounded(sketch.quantile(0.9)),
+        p99_ms=_rounded(sketch.quantile(0.99)),
+    )
+
+
+def _history_raw(template_id: str, limit: int) -> List[str]:
+    return get_redis().lrange(_history_key(template_id), 0, limit - 1)
+
+
+def list_history(template_id: str, limit: int = MAX_HISTORY_ENTRIES) -> List[ProbeHistoryEntry]:
+    return [decode_entry(template_id, _load(raw)) for raw in _history_raw(template_id, limit)]
+
+
+def list_history_points(template_id: str, limit: int = MAX_HISTORY_ENTRIES) -> List[RunPoints]:
+    """Newest-first runs as plain timestamps/latencies/breaches, skipping model validation."""
+
+    return [decode_points(_load(raw)) for raw in _history_raw(template_id, limit)]
+
+
+def list_history_stats(template_id: str, limit: int = MAX_HISTORY_ENTRIES) -> List[tuple[datetime, int]]:
+    """Newest-first ``(recorded_at, breach_count)`` pairs for cheap aggregations."""
+
+    return [decode_run_stats(_load(raw)) for raw in _history_raw(template_id, limit)]
 
 
 def build_heatmap(template_id: str, columns: int = DEFAULT_HEATMAP_COLUMNS) -> LatencyHeatmap:
-    history = list_history(template_id, limit=MAX_HEATMAP_CELLS)
-    if not history:
+    runs = list_history_points(template_id, limit=MAX_HEATMAP_CELLS)
+    if not runs:
         return LatencyHeatmap(template_id=template_id, columns=columns, rows=[])
 
     samples: List[HeatmapCell] = []
-    for entry in reversed(history):
-        for sample in entry.summary.samples:
-            samples.append(
-                HeatmapCell(
-                    timestamp=sample.timestamp,
-                    latency_ms=sample.latency_ms,
-                    breach=sample.breach,
-                )
-            )
+    for run in reversed(runs):
+        for timestamp, latency, breach in zip(run.timestamps, run.latencies, run.breaches):
+            samples.append(HeatmapCell.model_construct(timestamp=timestamp, latency_ms=latency, breach=breach))
     samples = samples[-MAX_HEATMAP_CELLS:]
 
     rows: List[List[HeatmapCell]] = []
@@ -222,11 +1439,112 @@ def build_heatmap(template_id: str, columns: int = DEFAULT_HEATMAP_COLUMNS) -> L
     return LatencyHeatmap(template_id=template_id, columns=columns, rows=rows)
 
 
+def _heatmap_bucket(requested: Optional[int], span: int) -> int:
+    minimum = max(requested or 0, -(-span // MAX_ROLLUP_HEATMAP_CELLS))
+    for size in HEATMAP_BUCKET_SECONDS:
+        if size >= minimum:
+            return size
+    return HEATMAP_BUCKET_SECONDS[-1]
+
+
+def build_rollup_heatmap(
+    template_id: str,
+    start: datetime,
+    end: datetime,
+    *,
+    bucket_seconds: Optional[int] = None,
+    columns: int = DEFAULT_HEATMAP_COLUMNS,
+    now=None,
+) -> LatencyHeatmap:
+    """Heatmap over ``[start, end)`` built from the latency sketches.
+
+    The bucket size is rounded up to a supported size and widened until the
+    range fits in :data:`MAX_ROLLUP_HEATMAP_CELLS`, so the response stays
+    bounded however long the range is. Each cell merges the buckets
+    :func:`_plan_sketch_buckets` picks for it, so once a cell's finer sketches
+    expire it falls back to the coarser bucket holding it, as
+    :func:`latency_percentiles` does. A fallback bucket wider than the cell is
+    counted once, in the first cell it covers; empty buckets are omitted.
+    """
+
+    if columns <= 0:
+        columns = DEFAULT_HEATMAP_COLUMNS
+    timestamp = int((now or utcnow()).timestamp())
+    range_start, range_end = int(start.timestamp()), int(end.timestamp())
+    bucket = _heatmap_bucket(bucket_seconds, max(range_end - range_start, 1))
+
+    first = range_start - range_start % bucket
+    cell_starts = list(range(first, range_end, bucket))[-MAX_ROLLUP_HEATMAP_CELLS:]
+    plan: List[tuple[int, List[str]]] = []
+    planned: set[str] = set()
+    for cell_start in cell_starts:
+        keys = [
+            key
+            for key in _plan_sketch_buckets(template_id, cell_start, cell_start + bucket, timestamp)
+            if key not in planned
+        ]
+        planned.update(keys)
+        plan.append((cell_start, keys))
+
+    with get_redis().pipeline() as pipe:
+        for _, keys in plan:
+            for key in keys:
+                pipe.hgetall(key)
+        fetched = iter(pipe.execute())
+
+    cells: List[HeatmapCell] = []
+    for cell_start, keys in plan:
+        buckets = [next(fetched) for _ in keys]
+        sketch = LatencySketch.merged(LatencySketch.from_fields(fields) for fields in buckets if fields)
+        if not sketch.count:
+            continue
+        cells.append(
+            HeatmapCell.model_construct(
+                timestamp=_EPOCH + timedelta(seconds=cell_start),
+                latency_ms=round(sketch.quantile(0.5), 2),
+                breach=sketch.breaches > 0,
+                sample_count=sketch.count,
+                breach_count=sketch.breaches,
+                p90_ms=round(sketch.quantile(0.9), 2),
+            )
+        )
+
+    rows = [cells[index : index + columns] for index in range(0, len(cells), columns)]
+    return LatencyHeatmap(template_id=template_id, columns=columns, rows=rows, bucket_seconds=bucket)
+
+
 def reset_storage() -> None:
     """Utility used in tests to clear stored data."""
 
     redis = get_redis()
     redis.delete(TEMPLATES_KEY)
+    redis.delete(TEMPLATE_VERSIONS_KEY)
+    _template_cache.clear()
+    redis.delete(SCHEDULE_KEY)
+    redis.delete(ACTIVE_JOBS_KEY)
+    redis.delete(SCHEDULER_LEASE_KEY)
+    redis.delete(JOB_INDEX_KEY)
+    for key in (TEMPLATE_CREATED_KEY, TEMPLATE_NAMES_KEY, TEMPLATE_SLA_KEY, TEMPLATE_TAGS_KEY, TEMPLATE_INDEX_BUILT_KEY):
+        redis.delete(key)
+    redis.delete(JOB_INDEX_BACKFILL_KEY)
+    for key in (
+        TEMPLATE_HEALTH_KEY,
+        TEMPLATE_DRIFT_KEY,
+        REGRESSING_TEMPLATES_KEY,
+        NOTIFICATION_QUEUE_KEY,
+        NOTIFICATION_DEAD_LETTER_KEY,
+    ):
+        redis.delete(key)
     history_keys: Iterable[str] = redis.scan_iter(f"{_history_key('*')}")  # type: ignore[arg-type]
     for key in list(history_keys):
         redis.delete(key)
+    for prefix in (
+        SKETCH_KEY_PREFIX,
+        SKETCH_INDEX_KEY_PREFIX,
+        FLEET_COUNTER_PREFIX,
+        TEMPLATE_JOBS_KEY_PREFIX,
+        TEMPLATE_TAG_KEY_PREFIX,
+        REPLAY_LOG_KEY_PREFIX,
+    ):
+        for key in list(redis.scan_iter(f"{prefix}:*")):
+            redis.delete(key)
@@ -224,7 +224,7 @@ export default function JobLogViewer() {
         </div>
         <footer style={{ display: 'flex', alignItems: 'center', gap: '0.75rem', flexWrap: 'wrap' }}>
           <span style={{ color: 'var(--color-text-secondary)' }}>
-            Showing {visibleJobs.length} of {totalJobs} run{totalJobs === 1 ? '' : 's'}
+            Showing {totalJobs} most recent run{totalJobs === 1 ? '' : 's'}
           </span>
           {hasMore && (
             <button
@@ -5,6 +5,31 @@ import type { HeatmapCell, LatencyHeatmap } from '../types'
 const React = getReactRuntime()
 const { useEffect, useMemo, useState } = React
 
+const RANGE_OPTIONS = [
+  { value: 'recent', label: 'Recent runs', hours: 0 },
+  { value: '24h', label: 'Last 24 hours', hours: 24 },
+  { value: '7d', label: 'Last 7 days', hours: 24 * 7 },
+  { value: '30d', label: 'Last 30 days', hours: 24 * 30 },
+]
+
+function heatmapPath(templateId: string, range: string) {
+  const base = `/toolkits/latency_sleuth/probe-templates/${templateId}/heatmap`
+  const hours = RANGE_OPTIONS.find((option) => option.value === range)?.hours ?? 0
+  if (!hours) {
+    return base
+  }
+  const start = new Date(Date.now() - hours * 3600 * 1000).toISOString()
+  return `${base}?columns=12&start=${encodeURIComponent(start)}`
+}
+
+function describeCell(cell: HeatmapCell) {
+  const when = new Date(cell.timestamp).toLocaleString()
+  if (cell.sample_count == null) {
+    return `${when} — ${cell.latency_ms} ms`
+  }
+  return `${when} — p50 ${cell.latency_ms} ms, p90 ${cell.p90_ms ?? '–'} ms, ${cell.breach_count ?? 0}/${cell.sample_count} breaches`
+}
+
 function computeHeatColor(cell: HeatmapCell, slaMs: number | undefined) {
   const sla = slaMs || 1
   const ratio = Math.max(0, Math.min(cell.latency_ms / sla, 2.5))
@@ -21,6 +46,7 @@ export default function LatencyHeatmapView() {
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
   const [refreshToken, setRefreshToken] = useState(0)
+  const [range, setRange] = useState('recent')
 
   const currentTemplate = useMemo(
     () => templates.find((template) => template.id === selectedTemplate) ?? null,
@@ -38,10 +64,7 @@ export default function LatencyHeatmapView() {
       setLoading(true)
       setError(null)
       try {
-        const response = await apiFetch<LatencyHeatmap>(
-          `/toolkits/latency_sleuth/probe-templates/${currentTemplate.id}/heatmap`,
-          { method: 'GET' },
-        )
+        const response = await apiFetch<LatencyHeatmap>(heatmapPath(currentTemplate.id, range), { method: 'GET' })
         if (!cancelled) {
           setHeatmap(response)
         }
@@ -61,7 +84,7 @@ export default function LatencyHeatmapView() {
     return () => {
       cancelled = true
     }
-  }, [currentTemplate, refreshToken])
+  }, [currentTemplate, range, refreshToken])
 
   const renderLegend = () => {
     if (!currentTemplate) {
@@ -123,7 +146,7 @@ export default function LatencyHeatmapView() {
             {row.map((cell, cellIndex) => (
               <div
                 key={cellIndex}
-                title={`${new Date(cell.timestamp).toLocaleString()} — ${cell.latency_ms} ms`}
+                title={describeCell(cell)}
                 style={{
                   padding: '0.75rem 0.5rem',
                   borderRadius: 6,
@@ -171,6 +194,17 @@ export default function LatencyHeatmapView() {
         </select>
       </label>
 
+      <label className="tk-field-label">
+        Time range
+        <select className="tk-select" value={range} onChange={(event) => setRange(event.target.value)}>
+          {RANGE_OPTIONS.map((option) => (
+            <option key={option.value} value={option.value}>
+              {option.label}
+            </option>
+          ))}
+        </select>
+      </label>
+
       {templatesError && <span style={{ color: 'var(--color-status-error)' }}>{templatesError}</span>}
       {error && <span style={{ color: 'var(--color-status-error)' }}>{error}</span>}
 
@@ -1,10 +1,9 @@
 import { getReactRuntime } from '../runtime'
-import { useProbeTemplates } from '../hooks/useProbeTemplates'
+import { useTemplateCatalog } from '../hooks/useTemplateCatalog'
 import type { NotificationRule, ProbeTemplate, ProbeTemplateCreate } from '../types'
-import { filterProbeTemplates } from './filterProbeTemplates'
 
 const React = getReactRuntime()
-const { useEffect, useMemo, useState } = React
+const { useEffect, useState } = React
 
 const methods: Required<ProbeTemplateCreate>['method'][] = ['GET', 'HEAD', 'POST']
 const channels: NotificationRule['channel'][] = ['slack', 'email', 'pagerduty', 'webhook']
@@ -58,7 +57,7 @@ function TemplateFilters({
         Search
         <input
           className="tk-input"
-          placeholder="Filter by name or URL"
+          placeholder="Filter by name prefix"
           value={searchText}
           onChange={(event) => onSearchChange(event.target.value)}
         />
@@ -96,23 +95,26 @@ function TemplateFilters({
 }
 
 export default function ProbeDesigner() {
+  const [searchText, setSearchText] = useState('')
+  const [selectedTags, setSelectedTags] = useState<string[]>([])
   const {
     templates,
     templatesById,
+    availableTags,
+    hasMore,
+    loadMore,
     createTemplate,
     updateTemplate,
     removeTemplate,
     refresh,
     loading,
     error,
-  } = useProbeTemplates()
+  } = useTemplateCatalog({ namePrefix: searchText, tags: selectedTags })
 
   const [formState, setFormState] = useState(formDefaults)
   const [status, setStatus] = useState<string | null>(null)
   const [formMode, setFormMode] = useState<FormMode>('create')
   const [activeTemplateId, setActiveTemplateId] = useState<string | null>(null)
-  const [searchText, setSearchText] = useState('')
-  const [selectedTags, setSelectedTags] = useState<string[]>([])
 
   useEffect(() => {
     if (!activeTemplateId) return
@@ -121,23 +123,6 @@ export default function ProbeDesigner() {
     setFormState(toFormState(template))
   }, [activeTemplateId, templatesById])
 
-  const sortedTemplates = useMemo(
-    () =>
-      [...templates].sort(
-        (a, b) => new Date(b.updated_at).getTime() - new Date(a.updated_at).getTime(),
-      ),
-    [templates],
-  )
-
-  const { availableTags, filteredTemplates } = useMemo(
-    () =>
-      filterProbeTemplates(sortedTemplates, {
-        searchText,
-        selectedTags,
-      }),
-    [sortedTemplates, searchText, selectedTags],
-  )
-
   const activeTemplateName = activeTemplateId ? templatesById.get(activeTemplateId)?.name ?? null : null
 
   const handleSubmit = async (event: any) => {
@@ -458,7 +443,7 @@ export default function ProbeDesigner() {
                 </tr>
               </thead>
               <tbody>
-                {filteredTemplates.map((template) => {
+                {templates.map((template) => {
                   const isEditing = formMode === 'edit' && activeTemplateId === template.id
                   return (
                     <tr key={template.id} style={isEditing ? { outline: '2px solid var(--color-accent)' } : undefined}>
@@ -501,7 +486,7 @@ export default function ProbeDesigner() {
                     </tr>
                   )
                 })}
-                {filteredTemplates.length === 0 && (
+                {templates.length === 0 && (
                   <tr>
                     <td colSpan={8} style={{ textAlign: 'center', padding: '1rem' }}>
                       {loading
@@ -515,6 +500,11 @@ export default function ProbeDesigner() {
               </tbody>
             </table>
           </div>
+          {hasMore && (
+            <button className="tk-button" type="button" onClick={() => loadMore()} disabled={loading}>
+              {loading ? 'Loading…' : 'Load more templates'}
+            </button>
+          )}
         </section>
       </div>
     </div>
@@ -24,6 +24,15 @@ function apiFetch(path, options = {}) {
   };
   return runtime.apiFetch(path, request);
 }
+async function apiStream(path, options = {}) {
+  const headers = new Headers(options.headers);
+  headers.set("Accept", "text/event-stream");
+  const response = await apiFetch(path, { ...options, headers });
+  if (!(response instanceof Response) || !response.body) {
+    throw new Error(`Runtime did not return a readable stream for ${path}`);
+  }
+  return response;
+}
 
 // ../toolkits/latency_sleuth/frontend/hooks/useProbeTemplates.ts
 var React = getReactRuntime();
@@ -112,63 +121,123 @@ function useProbeTemplates() {
   };
 }
 
-// ../toolkits/latency_sleuth/frontend/components/filterProbeTemplates.ts
-function normalizeSearch(searchText) {
-  return (searchText ?? "").trim().toLowerCase();
-}
-function normalizeTags(selectedTags) {
-  const seen = /* @__PURE__ */ new Set();
-  const normalized = [];
-  for (const raw of selectedTags ?? []) {
-    const tag = raw.trim();
-    if (!tag) continue;
-    const lower = tag.toLowerCase();
-    if (seen.has(lower)) continue;
-    seen.add(lower);
-    normalized.push(lower);
-  }
-  return normalized;
+// ../toolkits/latency_sleuth/frontend/hooks/useTemplateCatalog.ts
+var React9 = getReactRuntime();
+var { useCallback: useCallback5, useEffect: useEffect8, useMemo: useMemo6, useRef: useRef5, useState: useState8 } = React9;
+function templateSearchPath(namePrefix, tags, pageSize, cursor) {
+  const params = new URLSearchParams({ limit: String(pageSize) });
+  if (namePrefix) params.set("name_prefix", namePrefix);
+  for (const tag of tags) params.append("tag", tag);
+  if (cursor) params.set("cursor", cursor);
+  return `/toolkits/latency_sleuth/probe-templates:search?${params.toString()}`;
 }
-function collectAvailableTags(templates) {
-  const unique = /* @__PURE__ */ new Set();
-  for (const template of templates) {
-    for (const tag of template.tags ?? []) {
-      const normalized = tag.trim();
-      if (!normalized) continue;
-      unique.add(normalized);
+function useTemplateCatalog(filters = {}) {
+  const pageSize = filters.pageSize ?? 20;
+  const namePrefix = (filters.namePrefix ?? "").trim();
+  const tagKey = (filters.tags ?? []).join("\n");
+  const [templates, setTemplates] = useState8([]);
+  const [availableTags, setAvailableTags] = useState8([]);
+  const [nextCursor, setNextCursor] = useState8(null);
+  const [loading, setLoading] = useState8(true);
+  const [error, setError] = useState8(null);
+  const activeRef = useRef5(true);
+  const requestRef = useRef5(0);
+  useEffect8(() => {
+    activeRef.current = true;
+    return () => {
+      activeRef.current = false;
+    };
+  }, []);
+  const fetchPage = useCallback5(
+    async (cursor) => {
+      const request = ++requestRef.current;
+      setLoading(true);
+      setError(null);
+      try {
+        const tags = tagKey ? tagKey.split("\n") : [];
+        const page = await apiFetch(
+          templateSearchPath(namePrefix, tags, pageSize, cursor)
+        );
+        if (!activeRef.current || request !== requestRef.current) return;
+        setTemplates((prev) => cursor ? [...prev, ...page.templates] : page.templates);
+        setNextCursor(page.next_cursor);
+        setAvailableTags(page.tags);
+      } catch (err) {
+        if (!activeRef.current || request !== requestRef.current) return;
+        setError(err instanceof Error ? err.message : "Failed to load templates");
+      } finally {
+        if (activeRef.current && request === requestRef.current) {
+          setLoading(false);
+        }
+      }
+    },
+    [namePrefix, tagKey, pageSize]
+  );
+  const refresh = useCallback5(() => fetchPage(null), [fetchPage]);
+  useEffect8(() => {
+    refresh();
+  }, [refresh]);
+  const loadMore = useCallback5(async () => {
+    if (!nextCursor || loading) return;
+    await fetchPage(nextCursor);
+  }, [fetchPage, nextCursor, loading]);
+  const createTemplate = useCallback5(
+    async (payload) => {
+      const created = await apiFetch(
+        "/toolkits/latency_sleuth/probe-templates",
+        { method: "POST", json: payload }
+      );
+      if (activeRef.current) {
+        await refresh();
+      }
+      return created;
+    },
+    [refresh]
+  );
+  const updateTemplate = useCallback5(
+    async (templateId, payload) => {
+      const updated = await apiFetch(
+        `/toolkits/latency_sleuth/probe-templates/${templateId}`,
+        { method: "PUT", json: payload }
+      );
+      if (activeRef.current) {
+        setTemplates((prev) => prev.map((item) => item.id === templateId ? updated : item));
+      }
+      return updated;
+    },
+    []
+  );
+  const removeTemplate = useCallback5(async (templateId) => {
+    await apiFetch(`/toolkits/latency_sleuth/probe-templates/${templateId}`, { method: "DELETE" });
+    if (activeRef.current) {
+      setTemplates((prev) => prev.filter((item) => item.id !== templateId));
     }
-  }
-  return Array.from(unique).sort((a, b) => a.localeCompare(b));
-}
-function matchesSearch(template, search) {
-  if (!search) return true;
-  const haystack = `${template.name}
-${template.url}`.toLowerCase();
-  return haystack.includes(search);
-}
-function matchesTags(template, normalizedTags) {
-  if (normalizedTags.length === 0) return true;
-  const templateTags = new Set((template.tags ?? []).map((tag) => tag.toLowerCase()));
-  for (const tag of normalizedTags) {
-    if (!templateTags.has(tag)) {
-      return false;
+  }, []);
+  const templatesById = useMemo6(() => {
+    const map = /* @__PURE__ */ new Map();
+    for (const template of templates) {
+      map.set(template.id, template);
     }
-  }
-  return true;
-}
-function filterProbeTemplates(templates, options = {}) {
-  const search = normalizeSearch(options.searchText);
-  const normalizedTags = normalizeTags(options.selectedTags);
-  const availableTags = collectAvailableTags(templates);
-  const filteredTemplates = templates.filter(
-    (template) => matchesSearch(template, search) && matchesTags(template, normalizedTags)
-  );
-  return { availableTags, filteredTemplates };
+    return map;
+  }, [templates]);
+  return {
+    templates,
+    templatesById,
+    availableTags,
+    hasMore: Boolean(nextCursor),
+    loadMore,
+    loading,
+    error,
+    refresh,
+    createTemplate,
+    updateTemplate,
+    removeTemplate
+  };
 }
 
 // ../toolkits/latency_sleuth/frontend/components/ProbeDesigner.tsx
 var React2 = getReactRuntime();
-var { useEffect: useEffect2, useMemo: useMemo2, useState: useState2 } = React2;
+var { useEffect: useEffect2, useState: useState2 } = React2;
 var methods = ["GET", "HEAD", "POST"];
 var channels = ["slack", "email", "pagerduty", "webhook"];
 var thresholds = ["breach", "always", "recovery"];
@@ -205,7 +274,7 @@ function TemplateFilters({
     "input",
     {
       className: "tk-input",
-      placeholder: "Filter by name or URL",
+      placeholder: "Filter by name prefix",
       value: searchText,
       onChange: (event) => onSearchChange(event.target.value)
     }
@@ -226,41 +295,31 @@ function TemplateFilters({
   }), selectedTags.length > 0 && /* @__PURE__ */ React2.createElement("button", { type: "button", className: "tk-button", onClick: onClear }, "Clear"))));
 }
 function ProbeDesigner() {
+  const [searchText, setSearchText] = useState2("");
+  const [selectedTags, setSelectedTags] = useState2([]);
   const {
     templates,
     templatesById,
+    availableTags,
+    hasMore,
+    loadMore,
     createTemplate,
     updateTemplate,
     removeTemplate,
     refresh,
     loading,
     error
-  } = useProbeTemplates();
+  } = useTemplateCatalog({ namePrefix: searchText, tags: selectedTags });
   const [formState, setFormState] = useState2(formDefaults);
   const [status, setStatus] = useState2(null);
   const [formMode, setFormMode] = useState2("create");
   const [activeTemplateId, setActiveTemplateId] = useState2(null);
-  const [searchText, setSearchText] = useState2("");
-  const [selectedTags, setSelectedTags] = useState2([]);
   useEffect2(() => {
     if (!activeTemplateId) return;
     const template = templatesById.get(activeTemplateId);
     if (!template) return;
     setFormState(toFormState(template));
   }, [activeTemplateId, templatesById]);
-  const sortedTemplates = useMemo2(
-    () => [...templates].sort(
-      (a, b) => new Date(b.updated_at).getTime() - new Date(a.updated_at).getTime()
-    ),
-    [templates]
-  );
-  const { availableTags, filteredTemplates } = useMemo2(
-    () => filterProbeTemplates(sortedTemplates, {
-      searchText,
-      selectedTags
-    }),
-    [sortedTemplates, searchText, selectedTags]
-  );
   const activeTemplateName = activeTemplateId ? templatesById.get(activeTemplateId)?.name ?? null : null;
   const handleSubmit = async (event) => {
     event.preventDefault();
@@ -484,7 +543,7 @@ function ProbeDesigner() {
         onToggleTag: toggleTag,
         onClear: () => setSelectedTags([])
       }
-    ), /* @__PURE__ */ React2.createElement("div", { style: { overflowX: "auto" } }, /* @__PURE__ */ React2.createElement("table", { className: "tk-table" }, /* @__PURE__ */ React2.createElement("thead", null, /* @__PURE__ */ React2.createElement("tr", null, /* @__PURE__ */ React2.createElement("th", null, "Name"), /* @__PURE__ */ React2.createElement("th", null, "URL"), /* @__PURE__ */ React2.createElement("th", null, "SLA (ms)"), /* @__PURE__ */ React2.createElement("th", null, "Interval"), /* @__PURE__ */ React2.createElement("th", null, "Tags"), /* @__PURE__ */ React2.createElement("th", null, "Next run"), /* @__PURE__ */ React2.createElement("th", null, "Updated"), /* @__PURE__ */ React2.createElement("th", { style: { minWidth: 180 } }, "Actions"))), /* @__PURE__ */ React2.createElement("tbody", null, filteredTemplates.map((template) => {
+    ), /* @__PURE__ */ React2.createElement("div", { style: { overflowX: "auto" } }, /* @__PURE__ */ React2.createElement("table", { className: "tk-table" }, /* @__PURE__ */ React2.createElement("thead", null, /* @__PURE__ */ React2.createElement("tr", null, /* @__PURE__ */ React2.createElement("th", null, "Name"), /* @__PURE__ */ React2.createElement("th", null, "URL"), /* @__PURE__ */ React2.createElement("th", null, "SLA (ms)"), /* @__PURE__ */ React2.createElement("th", null, "Interval"), /* @__PURE__ */ React2.createElement("th", null, "Tags"), /* @__PURE__ */ React2.createElement("th", null, "Next run"), /* @__PURE__ */ React2.createElement("th", null, "Updated"), /* @__PURE__ */ React2.createElement("th", { style: { minWidth: 180 } }, "Actions"))), /* @__PURE__ */ React2.createElement("tbody", null, templates.map((template) => {
       const isEditing = formMode === "edit" && activeTemplateId === template.id;
       return /* @__PURE__ */ React2.createElement("tr", { key: template.id, style: isEditing ? { outline: "2px solid var(--color-accent)" } : void 0 }, /* @__PURE__ */ React2.createElement("td", null, template.name), /* @__PURE__ */ React2.createElement("td", { style: { maxWidth: 240, wordBreak: "break-all" } }, template.url), /* @__PURE__ */ React2.createElement("td", null, template.sla_ms), /* @__PURE__ */ React2.createElement("td", null, template.interval_seconds, "s"), /* @__PURE__ */ React2.createElement("td", null, template.tags.join(", ")), /* @__PURE__ */ React2.createElement("td", null, template.next_run_at ? new Date(template.next_run_at).toLocaleString() : "Pending"), /* @__PURE__ */ React2.createElement("td", null, new Date(template.updated_at).toLocaleString()), /* @__PURE__ */ React2.createElement("td", null, /* @__PURE__ */ React2.createElement("div", { style: { display: "flex", gap: "0.35rem", flexWrap: "wrap" } }, /* @__PURE__ */ React2.createElement(
         "button",
@@ -511,7 +570,7 @@ function ProbeDesigner() {
         },
         "Delete"
       ))));
-    }), filteredTemplates.length === 0 && /* @__PURE__ */ React2.createElement("tr", null, /* @__PURE__ */ React2.createElement("td", { colSpan: 8, style: { textAlign: "center", padding: "1rem" } }, loading ? "Loading templates\u2026" : searchText || selectedTags.length > 0 ? "No templates match the current filters." : "No templates captured yet."))))))
+    }), templates.length === 0 && /* @__PURE__ */ React2.createElement("tr", null, /* @__PURE__ */ React2.createElement("td", { colSpan: 8, style: { textAlign: "center", padding: "1rem" } }, loading ? "Loading templates\u2026" : searchText || selectedTags.length > 0 ? "No templates match the current filters." : "No templates captured yet."))))), hasMore && /* @__PURE__ */ React2.createElement("button", { className: "tk-button", type: "button", onClick: () => loadMore(), disabled: loading }, loading ? "Loading\u2026" : "Load more templates"))
   ));
 }
 
@@ -519,6 +578,45 @@ function ProbeDesigner() {
 var React3 = getReactRuntime();
 var { useCallback: useCallback2, useEffect: useEffect3, useRef: useRef2, useState: useState3 } = React3;
 var TERMINAL_STATUSES = /* @__PURE__ */ new Set(["succeeded", "failed", "cancelled"]);
+var STREAM_CONNECT_TIMEOUT_MS = 5e3;
+function applyJobDelta(job, delta) {
+  const known = Math.max(job.logs.length - delta.log_offset, 0);
+  const next = {
+    ...job,
+    logs: [...job.logs, ...delta.logs.slice(known)],
+    status: delta.status,
+    progress: delta.progress ?? job.progress
+  };
+  if ("result" in delta) next.result = delta.result;
+  if ("error" in delta) next.error = delta.error;
+  return next;
+}
+async function readServerSentEvents(body, onEvent, signal) {
+  const reader = body.getReader();
+  signal.addEventListener("abort", () => {
+    reader.cancel().catch(() => void 0);
+  });
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (; ; ) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let event = "message";
+      const data = [];
+      for (const line of frame.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data.push(line.slice(5).replace(/^ /, ""));
+      }
+      if (data.length > 0) onEvent(event, data.join("\n"));
+      boundary = buffer.indexOf("\n\n");
+    }
+  }
+}
 function useJobStream(jobId, pollInterval = 2e3) {
   const [job, setJob] = useState3(null);
   const [loading, setLoading] = useState3(false);
@@ -563,6 +661,7 @@ function useJobStream(jobId, pollInterval = 2e3) {
     }
     let cancelled = false;
     let timer;
+    const controller = new AbortController();
     const poll = async () => {
       try {
         const response = await fetchJob(jobId);
@@ -574,9 +673,48 @@ function useJobStream(jobId, pollInterval = 2e3) {
         timer = setTimeout(poll, pollInterval * 2);
       }
     };
-    poll();
+    let received = false;
+    let finished = false;
+    const handleEvent = (event, data) => {
+      if (cancelled) return;
+      let status;
+      if (event === "snapshot") {
+        const snapshot = JSON.parse(data);
+        setJob(snapshot);
+        status = snapshot.status;
+      } else if (event === "delta") {
+        const delta = JSON.parse(data);
+        setJob((current) => current ? applyJobDelta(current, delta) : current);
+        status = delta.status;
+      } else {
+        return;
+      }
+      received = true;
+      setLoading(false);
+      setError(null);
+      if (TERMINAL_STATUSES.has(status)) {
+        finished = true;
+        controller.abort();
+      }
+    };
+    setLoading(true);
+    const connectTimer = setTimeout(() => controller.abort(), STREAM_CONNECT_TIMEOUT_MS);
+    apiStream(`/toolkits/latency_sleuth/jobs/${jobId}/events`, { signal: controller.signal }).then((response) => {
+      clearTimeout(connectTimer);
+      return readServerSentEvents(response.body, handleEvent, controller.signal);
+    }).catch(() => void 0).then(() => {
+      clearTimeout(connectTimer);
+      if (cancelled || finished) return;
+      if (!received) {
+        poll();
+      } else {
+        timer = setTimeout(poll, pollInterval);
+      }
+    });
     return () => {
       cancelled = true;
+      clearTimeout(connectTimer);
+      controller.abort();
       if (timer) clearTimeout(timer);
     };
   }, [jobId, pollInterval, fetchJob]);
@@ -591,8 +729,14 @@ function useJobStream(jobId, pollInterval = 2e3) {
 // ../toolkits/latency_sleuth/frontend/hooks/useToolkitJobs.ts
 var React4 = getReactRuntime();
 var { useCallback: useCallback3, useEffect: useEffect4, useRef: useRef3, useState: useState4 } = React4;
-function useToolkitJobs(templateId, pollInterval = 1e4) {
+function jobsPath(templateId, limit, cursor) {
+  const params = new URLSearchParams({ template_id: templateId, limit: String(limit) });
+  if (cursor) params.set("cursor", cursor);
+  return `/toolkits/latency_sleuth/jobs?${params.toString()}`;
+}
+function useToolkitJobs(templateId, pageSize = 10, pollInterval = 1e4) {
   const [jobs, setJobs] = useState4([]);
+  const [nextCursor, setNextCursor] = useState4(null);
   const [loading, setLoading] = useState4(false);
   const [error, setError] = useState4(null);
   const activeRef = useRef3(true);
@@ -605,18 +749,18 @@ function useToolkitJobs(templateId, pollInterval = 1e4) {
   const fetchJobs = useCallback3(async () => {
     if (!templateId) {
       setJobs([]);
+      setNextCursor(null);
       setError(null);
       return [];
     }
     setLoading(true);
     try {
-      const response = await apiFetch(
-        `/toolkits/latency_sleuth/jobs?template_id=${encodeURIComponent(templateId)}`
-      );
-      if (!activeRef.current) return response;
-      setJobs(response);
+      const response = await apiFetch(jobsPath(templateId, pageSize));
+      if (!activeRef.current) return response.jobs;
+      setJobs(response.jobs);
+      setNextCursor(response.next_cursor);
       setError(null);
-      return response;
+      return response.jobs;
     } catch (err) {
       if (!activeRef.current) return [];
       const message = err instanceof Error ? err.message : "Failed to load jobs";
@@ -627,10 +771,11 @@ function useToolkitJobs(templateId, pollInterval = 1e4) {
         setLoading(false);
       }
     }
-  }, [templateId]);
+  }, [templateId, pageSize]);
   useEffect4(() => {
     if (!templateId) {
       setJobs([]);
+      setNextCursor(null);
       setError(null);
       return () => {
       };
@@ -655,6 +800,7 @@ function useToolkitJobs(templateId, pollInterval = 1e4) {
   }, [templateId, pollInterval, fetchJobs]);
   return {
     jobs,
+    nextCursor,
     loading,
     error,
     refresh: fetchJobs
@@ -673,43 +819,70 @@ function normalisePageSize(size) {
 function usePaginatedJobs(templateId, options = {}) {
   const pageSize = normalisePageSize(options.pageSize);
   const {
-    jobs: allJobs,
+    jobs: firstPage,
+    nextCursor: firstCursor,
     loading,
     error,
     refresh
-  } = useToolkitJobs(templateId);
-  const [pages, setPages] = useState5(1);
+  } = useToolkitJobs(templateId, pageSize);
+  const [older, setOlder] = useState5(null);
+  const [loadingMore, setLoadingMore] = useState5(false);
+  const [loadError, setLoadError] = useState5(null);
   const latestJobRef = useRef4(null);
-  const latestJobId = allJobs.length > 0 ? allJobs[0].id : null;
+  const generationRef = useRef4(0);
+  const latestJobId = firstPage.length > 0 ? firstPage[0].id : null;
+  const reset = useCallback4(() => {
+    generationRef.current += 1;
+    setOlder(null);
+    setLoadingMore(false);
+    setLoadError(null);
+  }, []);
   useEffect5(() => {
-    setPages(1);
+    reset();
     latestJobRef.current = latestJobId;
   }, [templateId]);
   useEffect5(() => {
     if (latestJobRef.current && latestJobId && latestJobRef.current !== latestJobId) {
-      setPages(1);
+      reset();
     }
     latestJobRef.current = latestJobId;
   }, [latestJobId]);
-  useEffect5(() => {
-    const maxPages = Math.max(Math.ceil(allJobs.length / pageSize), 1);
-    setPages((previous) => Math.min(previous, maxPages));
-  }, [allJobs.length, pageSize]);
-  const jobs = useMemo3(() => allJobs.slice(0, pageSize * pages), [allJobs, pageSize, pages]);
-  const hasMore = jobs.length < allJobs.length;
-  const loadMore = useCallback4(() => {
-    if (!hasMore) return;
-    setPages((previous) => previous + 1);
-  }, [hasMore]);
-  const reset = useCallback4(() => setPages(1), []);
+  const jobs = useMemo3(() => {
+    if (!older) return firstPage;
+    const seen = new Set(firstPage.map((job) => job.id));
+    return [...firstPage, ...older.jobs.filter((job) => !seen.has(job.id))];
+  }, [firstPage, older]);
+  const nextCursor = older ? older.cursor : firstCursor;
+  const hasMore = Boolean(nextCursor);
+  const loadMore = useCallback4(async () => {
+    if (!templateId || !nextCursor || loadingMore) return;
+    const generation = generationRef.current;
+    setLoadingMore(true);
+    try {
+      const page = await apiFetch(jobsPath(templateId, pageSize, nextCursor));
+      if (generation !== generationRef.current) return;
+      setOlder((previous) => ({
+        jobs: [...previous?.jobs ?? [], ...page.jobs],
+        cursor: page.next_cursor
+      }));
+      setLoadError(null);
+    } catch (err) {
+      if (generation !== generationRef.current) return;
+      setLoadError(err instanceof Error ? err.message : "Failed to load older jobs");
+    } finally {
+      if (generation === generationRef.current) {
+        setLoadingMore(false);
+      }
+    }
+  }, [templateId, nextCursor, loadingMore, pageSize]);
   return {
     jobs,
-    allJobs,
-    totalJobs: allJobs.length,
+    allJobs: jobs,
+    totalJobs: jobs.length,
     hasMore,
     loadMore,
-    loading,
-    error,
+    loading: loading || loadingMore,
+    error: error ?? loadError,
     refresh,
     pageSize,
     reset
@@ -860,7 +1033,7 @@ function JobLogViewer() {
         },
         isActive ? "Viewing" : "View logs"
       )));
-    })))), /* @__PURE__ */ React6.createElement("footer", { style: { display: "flex", alignItems: "center", gap: "0.75rem", flexWrap: "wrap" } }, /* @__PURE__ */ React6.createElement("span", { style: { color: "var(--color-text-secondary)" } }, "Showing ", visibleJobs.length, " of ", totalJobs, " run", totalJobs === 1 ? "" : "s"), hasMore && /* @__PURE__ */ React6.createElement(
+    })))), /* @__PURE__ */ React6.createElement("footer", { style: { display: "flex", alignItems: "center", gap: "0.75rem", flexWrap: "wrap" } }, /* @__PURE__ */ React6.createElement("span", { style: { color: "var(--color-text-secondary)" } }, "Showing ", totalJobs, " most recent run", totalJobs === 1 ? "" : "s"), hasMore && /* @__PURE__ */ React6.createElement(
       "button",
       {
         type: "button",
@@ -886,6 +1059,28 @@ function JobLogViewer() {
 // ../toolkits/latency_sleuth/frontend/components/LatencyHeatmap.tsx
 var React7 = getReactRuntime();
 var { useEffect: useEffect7, useMemo: useMemo5, useState: useState7 } = React7;
+var RANGE_OPTIONS = [
+  { value: "recent", label: "Recent runs", hours: 0 },
+  { value: "24h", label: "Last 24 hours", hours: 24 },
+  { value: "7d", label: "Last 7 days", hours: 24 * 7 },
+  { value: "30d", label: "Last 30 days", hours: 24 * 30 }
+];
+function heatmapPath(templateId, range) {
+  const base = `/toolkits/latency_sleuth/probe-templates/${templateId}/heatmap`;
+  const hours = RANGE_OPTIONS.find((option) => option.value === range)?.hours ?? 0;
+  if (!hours) {
+    return base;
+  }
+  const start = new Date(Date.now() - hours * 3600 * 1e3).toISOString();
+  return `${base}?columns=12&start=${encodeURIComponent(start)}`;
+}
+function describeCell(cell) {
+  const when = new Date(cell.timestamp).toLocaleString();
+  if (cell.sample_count == null) {
+    return `${when} \u2014 ${cell.latency_ms} ms`;
+  }
+  return `${when} \u2014 p50 ${cell.latency_ms} ms, p90 ${cell.p90_ms ?? "\u2013"} ms, ${cell.breach_count ?? 0}/${cell.sample_count} breaches`;
+}
 function computeHeatColor(cell, slaMs) {
   const sla = slaMs || 1;
   const ratio = Math.max(0, Math.min(cell.latency_ms / sla, 2.5));
@@ -901,6 +1096,7 @@ function LatencyHeatmapView() {
   const [loading, setLoading] = useState7(false);
   const [error, setError] = useState7(null);
   const [refreshToken, setRefreshToken] = useState7(0);
+  const [range, setRange] = useState7("recent");
   const currentTemplate = useMemo5(
     () => templates.find((template) => template.id === selectedTemplate) ?? null,
     [templates, selectedTemplate]
@@ -915,10 +1111,7 @@ function LatencyHeatmapView() {
       setLoading(true);
       setError(null);
       try {
-        const response = await apiFetch(
-          `/toolkits/latency_sleuth/probe-templates/${currentTemplate.id}/heatmap`,
-          { method: "GET" }
-        );
+        const response = await apiFetch(heatmapPath(currentTemplate.id, range), { method: "GET" });
         if (!cancelled) {
           setHeatmap(response);
         }
@@ -936,7 +1129,7 @@ function LatencyHeatmapView() {
     return () => {
       cancelled = true;
     };
-  }, [currentTemplate, refreshToken]);
+  }, [currentTemplate, range, refreshToken]);
   const renderLegend = () => {
     if (!currentTemplate) {
       return null;
@@ -993,7 +1186,7 @@ function LatencyHeatmapView() {
         "div",
         {
           key: cellIndex,
-          title: `${new Date(cell.timestamp).toLocaleString()} \u2014 ${cell.latency_ms} ms`,
+          title: describeCell(cell),
           style: {
             padding: "0.75rem 0.5rem",
             borderRadius: 6,
@@ -1018,7 +1211,7 @@ function LatencyHeatmapView() {
     },
     /* @__PURE__ */ React7.createElement("option", { value: "", disabled: true }, templatesLoading ? "Loading templates\u2026" : "Choose a template"),
     templates.map((template) => /* @__PURE__ */ React7.createElement("option", { key: template.id, value: template.id }, template.name))
-  )), templatesError && /* @__PURE__ */ React7.createElement("span", { style: { color: "var(--color-status-error)" } }, templatesError), error && /* @__PURE__ */ React7.createElement("span", { style: { color: "var(--color-status-error)" } }, error), currentTemplate && /* @__PURE__ */ React7.createElement("div", { style: { display: "flex", justifyContent: "space-between", alignItems: "center", flexWrap: "wrap", gap: "0.75rem" } }, renderLegend(), /* @__PURE__ */ React7.createElement(
+  )), /* @__PURE__ */ React7.createElement("label", { className: "tk-field-label" }, "Time range", /* @__PURE__ */ React7.createElement("select", { className: "tk-select", value: range, onChange: (event) => setRange(event.target.value) }, RANGE_OPTIONS.map((option) => /* @__PURE__ */ React7.createElement("option", { key: option.value, value: option.value }, option.label)))), templatesError && /* @__PURE__ */ React7.createElement("span", { style: { color: "var(--color-status-error)" } }, templatesError), error && /* @__PURE__ */ React7.createElement("span", { style: { color: "var(--color-status-error)" } }, error), currentTemplate && /* @__PURE__ */ React7.createElement("div", { style: { display: "flex", justifyContent: "space-between", alignItems: "center", flexWrap: "wrap", gap: "0.75rem" } }, renderLegend(), /* @__PURE__ */ React7.createElement(
     "button",
     {
       className: "tk-button",
@@ -0,0 +1,240 @@
+import { describe, expect, it, vi, beforeEach, afterEach } from 'vitest'
+
+import type { ToolkitRuntime } from '../../runtime'
+import type { JobRecord } from '../../types'
+
+let useJobStream: typeof import('../useJobStream')['useJobStream']
+const apiFetchSpy = vi.fn()
+
+if (typeof (globalThis as any).window === 'undefined') {
+  ;(globalThis as any).window = {} as any
+}
+
+let activeReact: FakeReact = createFakeReact()
+
+const reactProxy: Partial<FakeReact> = {
+  useState: (...args: Parameters<FakeReact['useState']>) => activeReact.useState(...(args as [unknown])),
+  useRef: (...args: Parameters<FakeReact['useRef']>) => activeReact.useRef(...args),
+  useMemo: (...args: Parameters<FakeReact['useMemo']>) => activeReact.useMemo(...args),
+  useCallback: (...args: Parameters<FakeReact['useCallback']>) => activeReact.useCallback(...args),
+  useEffect: (...args: Parameters<FakeReact['useEffect']>) => activeReact.useEffect(...args),
+}
+
+type StateUpdater<T> = (value: T | ((prev: T) => T)) => void
+
+type FakeReact = {
+  useState<T>(initial: T): [T, StateUpdater<T>]
+  useRef<T>(initial: T): { current: T }
+  useMemo<T>(factory: () => T, deps?: unknown[]): T
+  useCallback<T extends (...args: any[]) => any>(fn: T, deps?: unknown[]): T
+  useEffect(effect: () => void | (() => void), deps?: unknown[]): void
+  run<T>(callback: () => T): T
+}
+
+function depsChanged(prev: unknown[] | undefined, next: unknown[]): boolean {
+  if (!prev) return true
+  if (prev.length !== next.length) return true
+  for (let index = 0; index < prev.length; index += 1) {
+    if (!Object.is(prev[index], next[index])) {
+      return true
+    }
+  }
+  return false
+}
+
+function createFakeReact(): FakeReact {
+  const states: unknown[] = []
+  const refs: unknown[] = []
+  const memoValues: unknown[] = []
+  const memoDeps: (unknown[] | undefined)[] = []
+  const effectDeps: (unknown[] | undefined)[] = []
+  const cleanupFns: (void | (() => void))[] = []
+  const pendingEffects: Array<{ index: number; effect: () => void | (() => void) }> = []
+  let cursor = 0
+
+  function useState<T>(initial: T): [T, StateUpdater<T>] {
+    const index = cursor++
+    if (!(index in states)) {
+      states[index] = typeof initial === 'function' ? (initial as () => T)() : initial
+    }
+    const setState: StateUpdater<T> = (value) => {
+      const next = typeof value === 'function' ? (value as (prev: T) => T)(states[index] as T) : value
+      states[index] = next
+    }
+    return [states[index] as T, setState]
+  }
+
+  function useRef<T>(initial: T): { current: T } {
+    const index = cursor++
+    if (!(index in refs)) {
+      refs[index] = { current: initial }
+    }
+    return refs[index] as { current: T }
+  }
+
+  function useMemo<T>(factory: () => T, deps: unknown[] = []): T {
+    const index = cursor++
+    if (!memoDeps[index] || depsChanged(memoDeps[index], deps)) {
+      memoValues[index] = factory()
+      memoDeps[index] = deps.slice()
+    }
+    return memoValues[index] as T
+  }
+
+  function useCallback<T extends (...args: any[]) => any>(fn: T, deps: unknown[] = []): T {
+    return useMemo(() => fn, deps)
+  }
+
+  function useEffect(effect: () => void | (() => void), deps: unknown[] = []): void {
+    const index = cursor++
+    if (!effectDeps[index] || depsChanged(effectDeps[index], deps)) {
+      effectDeps[index] = deps.slice()
+      pendingEffects.push({ index, effect })
+    }
+  }
+
+  function run<T>(callback: () => T): T {
+    cursor = 0
+    const result = callback()
+    cursor = 0
+    while (pendingEffects.length > 0) {
+      const { index, effect } = pendingEffects.shift()!
+      if (typeof cleanupFns[index] === 'function') {
+        ;(cleanupFns[index] as () => void)()
+      }
+      cleanupFns[index] = effect()
+    }
+    return result
+  }
+
+  return {
+    useState,
+    useRef,
+    useMemo,
+    useCallback,
+    useEffect,
+    run,
+  }
+}
+
+function renderHook<T>(callback: () => T) {
+  const runtime = window.__SRE_TOOLKIT_RUNTIME!
+  const fakeReact = createFakeReact()
+  activeReact = fakeReact
+  runtime.react = reactProxy as any
+
+  let current: T
+  const rerender = () => {
+    current = fakeReact.run(callback)
+  }
+
+  rerender()
+
+  return {
+    result: {
+      get current() {
+        return current
+      },
+    },
+    rerender,
+  }
+}
+
+function buildJob(status: string): JobRecord {
+  return {
+    id: 'job-1',
+    status,
+    progress: 0,
+    logs: [{ ts: '2024-05-01T12:00:00Z', message: 'Running latency probe' }],
+    created_at: '2024-05-01T12:00:00Z',
+    updated_at: '2024-05-01T12:00:00Z',
+  }
+}
+
+function eventStream(...frames: string[]): Response {
+  const encoder = new TextEncoder()
+  const body = new ReadableStream<Uint8Array>({
+    start(controller) {
+      for (const frame of frames) controller.enqueue(encoder.encode(frame))
+      controller.close()
+    },
+  })
+  return new Response(body, { headers: { 'Content-Type': 'text/event-stream' } })
+}
+
+async function settle() {
+  for (let index = 0; index < 10; index += 1) {
+    await new Promise((resolve) => setTimeout(resolve, 0))
+  }
+}
+
+beforeEach(async () => {
+  await vi.resetModules()
+  activeReact = createFakeReact()
+  apiFetchSpy.mockReset()
+  const runtime: ToolkitRuntime = {
+    react: reactProxy as any,
+    reactRouterDom: {} as any,
+    apiFetch: apiFetchSpy,
+  }
+  window.__SRE_TOOLKIT_RUNTIME = runtime
+  useJobStream = (await import('../useJobStream')).useJobStream
+})
+
+afterEach(() => {
+  delete window.__SRE_TOOLKIT_RUNTIME
+  vi.unstubAllGlobals()
+  activeReact = createFakeReact()
+})
+
+describe('useJobStream', () => {
+  it('opens the event stream through the runtime apiFetch', async () => {
+    const eventSource = vi.fn()
+    vi.stubGlobal('EventSource', eventSource)
+    apiFetchSpy.mockResolvedValue(
+      eventStream(
+        `event: snapshot\ndata: ${JSON.stringify(buildJob('running'))}\n\n`,
+        ': keepalive\n\n',
+        `event: delta\ndata: ${JSON.stringify({
+          log_offset: 1,
+          logs: [{ ts: '2024-05-01T12:00:01Z', message: 'Attempt 1: 80.00 ms — OK' }],
+          progress: 100,
+          status: 'succeeded',
+          result: { breach_count: 0 },
+        })}\n\n`,
+      ),
+    )
+    const hook = renderHook(() => useJobStream('job-1'))
+
+    await settle()
+    hook.rerender()
+
+    expect(eventSource).not.toHaveBeenCalled()
+    expect(apiFetchSpy).toHaveBeenCalledTimes(1)
+    const [path, request] = apiFetchSpy.mock.calls[0]
+    expect(path).toBe('/toolkits/latency_sleuth/jobs/job-1/events')
+    expect((request.headers as Headers).get('Accept')).toBe('text/event-stream')
+    expect(request.signal).toBeInstanceOf(AbortSignal)
+    expect(hook.result.current.job?.status).toBe('succeeded')
+    expect(hook.result.current.job?.logs).toHaveLength(2)
+    expect(hook.result.current.job?.result).toEqual({ breach_count: 0 })
+    expect(hook.result.current.loading).toBe(false)
+  })
+
+  it('falls back to polling through apiFetch when the runtime cannot stream', async () => {
+    apiFetchSpy.mockImplementation(async (path: string) =>
+      path.endsWith('/events') ? { detail: 'not a stream' } : buildJob('succeeded'),
+    )
+    const hook = renderHook(() => useJobStream('job-1'))
+
+    await settle()
+    hook.rerender()
+
+    expect(apiFetchSpy.mock.calls.map(([path]) => path)).toEqual([
+      '/toolkits/latency_sleuth/jobs/job-1/events',
+      '/toolkits/latency_sleuth/jobs/job-1',
+    ])
+    expect(hook.result.current.job?.status).toBe('succeeded')
+    expect(hook.result.current.error).toBeNull()
+  })
+})
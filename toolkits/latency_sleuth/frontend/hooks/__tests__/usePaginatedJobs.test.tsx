@@ -6,7 +6,9 @@ import type { JobRecord } from '../../types'
 let usePaginatedJobs: typeof import('../usePaginatedJobs')['usePaginatedJobs']
 let templateId: string | null
 let jobsSignal: JobRecord[]
+let cursorSignal: string | null
 const refreshSpy = vi.fn()
+const apiFetchSpy = vi.fn()
 
 if (typeof (globalThis as any).window === 'undefined') {
   ;(globalThis as any).window = {} as any
@@ -154,8 +156,11 @@ function buildJob(index: number): JobRecord {
 }
 
 vi.mock('../useToolkitJobs', () => ({
+  jobsPath: (templateId: string, limit: number, cursor?: string | null) =>
+    `/jobs?template_id=${templateId}&limit=${limit}${cursor ? `&cursor=${cursor}` : ''}`,
   useToolkitJobs: vi.fn(() => ({
     jobs: jobsSignal,
+    nextCursor: cursorSignal,
     loading: false,
     error: null,
     refresh: refreshSpy,
@@ -166,12 +171,14 @@ beforeEach(async () => {
   await vi.resetModules()
   activeReact = createFakeReact()
   jobsSignal = []
+  cursorSignal = null
   templateId = 'template-1'
   refreshSpy.mockReset()
+  apiFetchSpy.mockReset()
   const runtime: ToolkitRuntime = {
     react: reactProxy as any,
     reactRouterDom: {} as any,
-    apiFetch: vi.fn(),
+    apiFetch: apiFetchSpy,
   }
   window.__SRE_TOOLKIT_RUNTIME = runtime
   usePaginatedJobs = (await import('../usePaginatedJobs')).usePaginatedJobs
@@ -182,37 +189,57 @@ afterEach(() => {
   activeReact = createFakeReact()
 })
 
+function page(jobs: JobRecord[], size: number, offset: number) {
+  const slice = jobs.slice(offset, offset + size)
+  return {
+    jobs: slice,
+    next_cursor: offset + size < jobs.length ? `cursor-${offset + size}` : null,
+  }
+}
+
 describe('usePaginatedJobs', () => {
-  it('limits visible jobs and loads more pages on demand', () => {
-    jobsSignal = Array.from({ length: 25 }, (_, idx) => buildJob(idx))
+  it('fetches older pages with the server cursor', async () => {
+    const all = Array.from({ length: 25 }, (_, idx) => buildJob(idx))
+    jobsSignal = all.slice(0, 10)
+    cursorSignal = 'cursor-10'
+    apiFetchSpy.mockImplementation(async (path: string) => {
+      const offset = Number(path.split('cursor=cursor-')[1])
+      return page(all, 10, offset)
+    })
     const hook = renderHook(() => usePaginatedJobs(templateId, { pageSize: 10 }))
 
     expect(hook.result.current.jobs).toHaveLength(10)
-    expect(hook.result.current.totalJobs).toBe(25)
     expect(hook.result.current.hasMore).toBe(true)
 
-    hook.result.current.loadMore()
+    await hook.result.current.loadMore()
     hook.rerender()
 
+    expect(apiFetchSpy).toHaveBeenCalledWith(
+      '/jobs?template_id=template-1&limit=10&cursor=cursor-10',
+      expect.anything(),
+    )
     expect(hook.result.current.jobs).toHaveLength(20)
     expect(hook.result.current.hasMore).toBe(true)
 
-    hook.result.current.loadMore()
+    await hook.result.current.loadMore()
     hook.rerender()
 
     expect(hook.result.current.jobs).toHaveLength(25)
     expect(hook.result.current.hasMore).toBe(false)
   })
 
-  it('resets to the first page when a new job arrives', () => {
-    jobsSignal = Array.from({ length: 18 }, (_, idx) => buildJob(idx))
+  it('drops older pages when a new job arrives', async () => {
+    const all = Array.from({ length: 18 }, (_, idx) => buildJob(idx))
+    jobsSignal = all.slice(0, 5)
+    cursorSignal = 'cursor-5'
+    apiFetchSpy.mockImplementation(async () => page(all, 5, 5))
     const hook = renderHook(() => usePaginatedJobs(templateId, { pageSize: 5 }))
 
-    hook.result.current.loadMore()
+    await hook.result.current.loadMore()
     hook.rerender()
     expect(hook.result.current.jobs).toHaveLength(10)
 
-    jobsSignal = [buildJob(99), ...jobsSignal]
+    jobsSignal = [buildJob(99), ...all.slice(0, 4)]
     hook.rerender()
     hook.rerender()
 
@@ -220,16 +247,21 @@ describe('usePaginatedJobs', () => {
     expect(hook.result.current.jobs[0].id).toBe('job-99')
   })
 
-  it('resets pagination when the template changes', () => {
-    jobsSignal = Array.from({ length: 12 }, (_, idx) => buildJob(idx))
+  it('resets pagination when the template changes', async () => {
+    const all = Array.from({ length: 12 }, (_, idx) => buildJob(idx))
+    jobsSignal = all.slice(0, 4)
+    cursorSignal = 'cursor-4'
+    apiFetchSpy.mockImplementation(async () => page(all, 4, 4))
     const hook = renderHook(() => usePaginatedJobs(templateId, { pageSize: 4 }))
 
-    hook.result.current.loadMore()
+    await hook.result.current.loadMore()
     hook.rerender()
     expect(hook.result.current.jobs).toHaveLength(8)
 
     templateId = 'template-2'
     jobsSignal = Array.from({ length: 3 }, (_, idx) => buildJob(idx))
+    cursorSignal = null
+    hook.rerender()
     hook.rerender()
 
     expect(hook.result.current.jobs).toHaveLength(3)
@@ -0,0 +1,204 @@
+import { describe, expect, it, vi, beforeEach, afterEach } from 'vitest'
+
+import type { ToolkitRuntime } from '../../runtime'
+
+let useTemplateCatalog: typeof import('../useTemplateCatalog')['useTemplateCatalog']
+
+if (typeof (globalThis as any).window === 'undefined') {
+  ;(globalThis as any).window = {} as any
+}
+
+let activeReact: FakeReact = createFakeReact()
+
+const reactProxy: Partial<FakeReact> = {
+  useState: (...args: Parameters<FakeReact['useState']>) => activeReact.useState(...(args as [unknown])),
+  useRef: (...args: Parameters<FakeReact['useRef']>) => activeReact.useRef(...args),
+  useMemo: (...args: Parameters<FakeReact['useMemo']>) => activeReact.useMemo(...args),
+  useCallback: (...args: Parameters<FakeReact['useCallback']>) => activeReact.useCallback(...args),
+  useEffect: (...args: Parameters<FakeReact['useEffect']>) => activeReact.useEffect(...args),
+}
+
+type StateUpdater<T> = (value: T | ((prev: T) => T)) => void
+
+type FakeReact = {
+  useState<T>(initial: T): [T, StateUpdater<T>]
+  useRef<T>(initial: T): { current: T }
+  useMemo<T>(factory: () => T, deps?: unknown[]): T
+  useCallback<T extends (...args: any[]) => any>(fn: T, deps?: unknown[]): T
+  useEffect(effect: () => void | (() => void), deps?: unknown[]): void
+  run<T>(callback: () => T): T
+}
+
+function depsChanged(prev: unknown[] | undefined, next: unknown[]): boolean {
+  if (!prev) return true
+  if (prev.length !== next.length) return true
+  for (let index = 0; index < prev.length; index += 1) {
+    if (!Object.is(prev[index], next[index])) {
+      return true
+    }
+  }
+  return false
+}
+
+function createFakeReact(): FakeReact {
+  const states: unknown[] = []
+  const refs: unknown[] = []
+  const memoValues: unknown[] = []
+  const memoDeps: (unknown[] | undefined)[] = []
+  const effectDeps: (unknown[] | undefined)[] = []
+  const cleanupFns: (void | (() => void))[] = []
+  const pendingEffects: Array<{ index: number; effect: () => void | (() => void) }> = []
+  let cursor = 0
+
+  function useState<T>(initial: T): [T, StateUpdater<T>] {
+    const index = cursor++
+    if (!(index in states)) {
+      states[index] = typeof initial === 'function' ? (initial as () => T)() : initial
+    }
+    const setState: StateUpdater<T> = (value) => {
+      const next = typeof value === 'function' ? (value as (prev: T) => T)(states[index] as T) : value
+      states[index] = next
+    }
+    return [states[index] as T, setState]
+  }
+
+  function useRef<T>(initial: T): { current: T } {
+    const index = cursor++
+    if (!(index in refs)) {
+      refs[index] = { current: initial }
+    }
+    return refs[index] as { current: T }
+  }
+
+  function useMemo<T>(factory: () => T, deps: unknown[] = []): T {
+    const index = cursor++
+    if (!memoDeps[index] || depsChanged(memoDeps[index], deps)) {
+      memoValues[index] = factory()
+      memoDeps[index] = deps.slice()
+    }
+    return memoValues[index] as T
+  }
+
+  function useCallback<T extends (...args: any[]) => any>(fn: T, deps: unknown[] = []): T {
+    return useMemo(() => fn, deps)
+  }
+
+  function useEffect(effect: () => void | (() => void), deps: unknown[] = []): void {
+    const index = cursor++
+    if (!effectDeps[index] || depsChanged(effectDeps[index], deps)) {
+      effectDeps[index] = deps.slice()
+      pendingEffects.push({ index, effect })
+    }
+  }
+
+  function run<T>(callback: () => T): T {
+    cursor = 0
+    const result = callback()
+    cursor = 0
+    while (pendingEffects.length > 0) {
+      const { index, effect } = pendingEffects.shift()!
+      if (typeof cleanupFns[index] === 'function') {
+        ;(cleanupFns[index] as () => void)()
+      }
+      cleanupFns[index] = effect()
+    }
+    return result
+  }
+
+  return {
+    useState,
+    useRef,
+    useMemo,
+    useCallback,
+    useEffect,
+    run,
+  }
+}
+
+function renderHook<T>(callback: () => T) {
+  const runtime = window.__SRE_TOOLKIT_RUNTIME!
+  const fakeReact = createFakeReact()
+  activeReact = fakeReact
+  runtime.react = reactProxy as any
+
+  let current: T
+  const rerender = () => {
+    current = fakeReact.run(callback)
+  }
+
+  rerender()
+
+  return {
+    result: {
+      get current() {
+        return current
+      },
+    },
+    rerender,
+  }
+}
+
+beforeEach(async () => {
+  await vi.resetModules()
+  activeReact = createFakeReact()
+  const runtime: ToolkitRuntime = {
+    react: reactProxy as any,
+    reactRouterDom: {} as any,
+    apiFetch: vi.fn(),
+  }
+  window.__SRE_TOOLKIT_RUNTIME = runtime
+  useTemplateCatalog = (await import('../useTemplateCatalog')).useTemplateCatalog
+})
+
+afterEach(() => {
+  delete window.__SRE_TOOLKIT_RUNTIME
+  activeReact = createFakeReact()
+})
+
+function buildTemplate(id: string) {
+  return {
+    id,
+    name: `Template ${id}`,
+    description: null,
+    url: 'https://example.com/healthz',
+    method: 'GET' as const,
+    sla_ms: 300,
+    interval_seconds: 60,
+    notification_rules: [],
+    tags: ['team:core'],
+    created_at: new Date().toISOString(),
+    updated_at: new Date().toISOString(),
+  }
+}
+
+describe('useTemplateCatalog', () => {
+  it('requests filtered pages from the search endpoint', async () => {
+    const apiFetch = vi.fn().mockImplementation(async (path: string) => {
+      if (path.includes('cursor=')) {
+        return { templates: [buildTemplate('t-3')], next_cursor: null, tags: ['team:core'] }
+      }
+      return { templates: [buildTemplate('t-1'), buildTemplate('t-2')], next_cursor: 'c-2', tags: ['team:core'] }
+    })
+    window.__SRE_TOOLKIT_RUNTIME!.apiFetch = apiFetch
+
+    const hook = renderHook(() => useTemplateCatalog({ namePrefix: ' chk ', tags: ['team:core'], pageSize: 2 }))
+
+    expect(apiFetch).toHaveBeenCalledWith(
+      '/toolkits/latency_sleuth/probe-templates:search?limit=2&name_prefix=chk&tag=team%3Acore',
+      expect.any(Object),
+    )
+
+    await hook.result.current.refresh()
+    hook.rerender()
+
+    expect(hook.result.current.templates.map((item) => item.id)).toEqual(['t-1', 't-2'])
+    expect(hook.result.current.availableTags).toEqual(['team:core'])
+    expect(hook.result.current.hasMore).toBe(true)
+
+    await hook.result.current.loadMore()
+    hook.rerender()
+
+    expect(hook.result.current.templates.map((item) => item.id)).toEqual(['t-1', 't-2', 't-3'])
+    expect(hook.result.current.hasMore).toBe(false)
+  })
+})
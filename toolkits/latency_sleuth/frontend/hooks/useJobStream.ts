@@ -1,10 +1,67 @@
-import { apiFetch, getReactRuntime } from '../runtime'
+import { apiFetch, apiStream, getReactRuntime } from '../runtime'
 import type { JobRecord } from '../types'
 
 const React = getReactRuntime()
 const { useCallback, useEffect, useRef, useState } = React
 
 const TERMINAL_STATUSES = new Set(['succeeded', 'failed', 'cancelled'])
+// How long to wait for the stream to open before polling instead.
+const STREAM_CONNECT_TIMEOUT_MS = 5000
+
+type JobEventDelta = {
+  log_offset: number
+  logs: JobRecord['logs']
+  progress: number | null
+  status: string
+  result?: unknown
+  error?: string | null
+}
+
+function applyJobDelta(job: JobRecord, delta: JobEventDelta): JobRecord {
+  // Lines before log_offset may already be held from the snapshot; only append new ones.
+  const known = Math.max(job.logs.length - delta.log_offset, 0)
+  const next: JobRecord = {
+    ...job,
+    logs: [...job.logs, ...delta.logs.slice(known)],
+    status: delta.status,
+    progress: delta.progress ?? job.progress,
+  }
+  if ('result' in delta) next.result = delta.result
+  if ('error' in delta) next.error = delta.error
+  return next
+}
+
+async function readServerSentEvents(
+  body: ReadableStream<Uint8Array>,
+  onEvent: (event: string, data: string) => void,
+  signal: AbortSignal,
+) {
+  const reader = body.getReader()
+  signal.addEventListener('abort', () => {
+    reader.cancel().catch(() => undefined)
+  })
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) return
+    buffer += decoder.decode(value, { stream: true })
+    let boundary = buffer.indexOf('\n\n')
+    while (boundary !== -1) {
+      const frame = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      let event = 'message'
+      const data: string[] = []
+      for (const line of frame.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim()
+        else if (line.startsWith('data:')) data.push(line.slice(5).replace(/^ /, ''))
+      }
+      // Keepalive comments carry no data.
+      if (data.length > 0) onEvent(event, data.join('\n'))
+      boundary = buffer.indexOf('\n\n')
+    }
+  }
+}
 
 export function useJobStream(jobId: string | null, pollInterval = 2000) {
   const [job, setJob] = useState<JobRecord | null>(null)
@@ -53,6 +110,7 @@ export function useJobStream(jobId: string | null, pollInterval = 2000) {
 
     let cancelled = false
     let timer: ReturnType<typeof setTimeout> | undefined
+    const controller = new AbortController()
 
     const poll = async () => {
       try {
@@ -66,10 +124,54 @@ export function useJobStream(jobId: string | null, pollInterval = 2000) {
       }
     }
 
-    poll()
+    let received = false
+    let finished = false
+    const handleEvent = (event: string, data: string) => {
+      if (cancelled) return
+      let status: string
+      if (event === 'snapshot') {
+        const snapshot = JSON.parse(data) as JobRecord
+        setJob(snapshot)
+        status = snapshot.status
+      } else if (event === 'delta') {
+        const delta = JSON.parse(data) as JobEventDelta
+        setJob((current) => (current ? applyJobDelta(current, delta) : current))
+        status = delta.status
+      } else {
+        return
+      }
+      received = true
+      setLoading(false)
+      setError(null)
+      if (TERMINAL_STATUSES.has(status)) {
+        finished = true
+        controller.abort()
+      }
+    }
+
+    setLoading(true)
+    const connectTimer = setTimeout(() => controller.abort(), STREAM_CONNECT_TIMEOUT_MS)
+    apiStream(`/toolkits/latency_sleuth/jobs/${jobId}/events`, { signal: controller.signal })
+      .then((response) => {
+        clearTimeout(connectTimer)
+        return readServerSentEvents(response.body!, handleEvent, controller.signal)
+      })
+      .catch(() => undefined)
+      .then(() => {
+        clearTimeout(connectTimer)
+        if (cancelled || finished) return
+        if (!received) {
+          // Streaming unavailable (e.g. proxy or runtime support); fall back to polling.
+          poll()
+        } else {
+          timer = setTimeout(poll, pollInterval)
+        }
+      })
 
     return () => {
       cancelled = true
+      clearTimeout(connectTimer)
+      controller.abort()
       if (timer) clearTimeout(timer)
     }
   }, [jobId, pollInterval, fetchJob])
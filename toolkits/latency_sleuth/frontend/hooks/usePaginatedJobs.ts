@@ -1,5 +1,6 @@
-import { getReactRuntime } from '../runtime'
-import { useToolkitJobs } from './useToolkitJobs'
+import { apiFetch, getReactRuntime } from '../runtime'
+import type { JobPage, JobRecord } from '../types'
+import { jobsPath, useToolkitJobs } from './useToolkitJobs'
 
 const React = getReactRuntime()
 const { useCallback, useEffect, useMemo, useRef, useState } = React
@@ -8,6 +9,11 @@ type Options = {
   pageSize?: number
 }
 
+type OlderPages = {
+  jobs: JobRecord[]
+  cursor: string | null
+}
+
 function normalisePageSize(size: number | undefined) {
   if (!size || Number.isNaN(size) || size < 1) {
     return 10
@@ -18,51 +24,79 @@ function normalisePageSize(size: number | undefined) {
 export function usePaginatedJobs(templateId: string | null, options: Options = {}) {
   const pageSize = normalisePageSize(options.pageSize)
   const {
-    jobs: allJobs,
+    jobs: firstPage,
+    nextCursor: firstCursor,
     loading,
     error,
     refresh,
-  } = useToolkitJobs(templateId)
-  const [pages, setPages] = useState(1)
+  } = useToolkitJobs(templateId, pageSize)
+  // Pages fetched with "Load older runs"; the first page keeps polling on its own.
+  const [older, setOlder] = useState<OlderPages | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [loadError, setLoadError] = useState<string | null>(null)
   const latestJobRef = useRef<string | null>(null)
+  const generationRef = useRef(0)
 
-  const latestJobId = allJobs.length > 0 ? allJobs[0].id : null
+  const latestJobId = firstPage.length > 0 ? firstPage[0].id : null
+
+  const reset = useCallback(() => {
+    generationRef.current += 1
+    setOlder(null)
+    setLoadingMore(false)
+    setLoadError(null)
+  }, [])
 
   useEffect(() => {
-    setPages(1)
+    reset()
     latestJobRef.current = latestJobId
   }, [templateId])
 
   useEffect(() => {
     if (latestJobRef.current && latestJobId && latestJobRef.current !== latestJobId) {
-      setPages(1)
+      reset()
     }
     latestJobRef.current = latestJobId
   }, [latestJobId])
 
-  useEffect(() => {
-    const maxPages = Math.max(Math.ceil(allJobs.length / pageSize), 1)
-    setPages((previous) => Math.min(previous, maxPages))
-  }, [allJobs.length, pageSize])
-
-  const jobs = useMemo(() => allJobs.slice(0, pageSize * pages), [allJobs, pageSize, pages])
-  const hasMore = jobs.length < allJobs.length
+  const jobs = useMemo(() => {
+    if (!older) return firstPage
+    const seen = new Set(firstPage.map((job) => job.id))
+    return [...firstPage, ...older.jobs.filter((job) => !seen.has(job.id))]
+  }, [firstPage, older])
 
-  const loadMore = useCallback(() => {
-    if (!hasMore) return
-    setPages((previous) => previous + 1)
-  }, [hasMore])
+  const nextCursor = older ? older.cursor : firstCursor
+  const hasMore = Boolean(nextCursor)
 
-  const reset = useCallback(() => setPages(1), [])
+  const loadMore = useCallback(async () => {
+    if (!templateId || !nextCursor || loadingMore) return
+    const generation = generationRef.current
+    setLoadingMore(true)
+    try {
+      const page = await apiFetch<JobPage>(jobsPath(templateId, pageSize, nextCursor))
+      if (generation !== generationRef.current) return
+      setOlder((previous) => ({
+        jobs: [...(previous?.jobs ?? []), ...page.jobs],
+        cursor: page.next_cursor,
+      }))
+      setLoadError(null)
+    } catch (err) {
+      if (generation !== generationRef.current) return
+      setLoadError(err instanceof Error ? err.message : 'Failed to load older jobs')
+    } finally {
+      if (generation === generationRef.current) {
+        setLoadingMore(false)
+      }
+    }
+  }, [templateId, nextCursor, loadingMore, pageSize])
 
   return {
     jobs,
-    allJobs,
-    totalJobs: allJobs.length,
+    allJobs: jobs,
+    totalJobs: jobs.length,
     hasMore,
     loadMore,
-    loading,
-    error,
+    loading: loading || loadingMore,
+    error: error ?? loadError,
     refresh,
     pageSize,
     reset,
@@ -0,0 +1,139 @@
+import { apiFetch, getReactRuntime } from '../runtime'
+import type { ProbeTemplate, ProbeTemplateCreate, ProbeTemplatePage } from '../types'
+
+const React = getReactRuntime()
+const { useCallback, useEffect, useMemo, useRef, useState } = React
+
+type CatalogFilters = {
+  namePrefix?: string
+  tags?: string[]
+  pageSize?: number
+}
+
+export function templateSearchPath(
+  namePrefix: string,
+  tags: string[],
+  pageSize: number,
+  cursor?: string | null,
+) {
+  const params = new URLSearchParams({ limit: String(pageSize) })
+  if (namePrefix) params.set('name_prefix', namePrefix)
+  for (const tag of tags) params.append('tag', tag)
+  if (cursor) params.set('cursor', cursor)
+  return `/toolkits/latency_sleuth/probe-templates:search?${params.toString()}`
+}
+
+export function useTemplateCatalog(filters: CatalogFilters = {}) {
+  const pageSize = filters.pageSize ?? 20
+  const namePrefix = (filters.namePrefix ?? '').trim()
+  const tagKey = (filters.tags ?? []).join('\n')
+  const [templates, setTemplates] = useState<ProbeTemplate[]>([])
+  const [availableTags, setAvailableTags] = useState<string[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loading, setLoading] = useState(true)
+  const [error, setError] = useState<string | null>(null)
+  const activeRef = useRef(true)
+  const requestRef = useRef(0)
+
+  useEffect(() => {
+    activeRef.current = true
+    return () => {
+      activeRef.current = false
+    }
+  }, [])
+
+  const fetchPage = useCallback(
+    async (cursor: string | null) => {
+      // Only the latest request may update state; typing in the filter supersedes older ones.
+      const request = ++requestRef.current
+      setLoading(true)
+      setError(null)
+      try {
+        const tags = tagKey ? tagKey.split('\n') : []
+        const page = await apiFetch<ProbeTemplatePage>(
+          templateSearchPath(namePrefix, tags, pageSize, cursor),
+        )
+        if (!activeRef.current || request !== requestRef.current) return
+        setTemplates((prev) => (cursor ? [...prev, ...page.templates] : page.templates))
+        setNextCursor(page.next_cursor)
+        setAvailableTags(page.tags)
+      } catch (err) {
+        if (!activeRef.current || request !== requestRef.current) return
+        setError(err instanceof Error ? err.message : 'Failed to load templates')
+      } finally {
+        if (activeRef.current && request === requestRef.current) {
+          setLoading(false)
+        }
+      }
+    },
+    [namePrefix, tagKey, pageSize],
+  )
+
+  const refresh = useCallback(() => fetchPage(null), [fetchPage])
+
+  useEffect(() => {
+    refresh()
+  }, [refresh])
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loading) return
+    await fetchPage(nextCursor)
+  }, [fetchPage, nextCursor, loading])
+
+  const createTemplate = useCallback(
+    async (payload: ProbeTemplateCreate) => {
+      const created = await apiFetch<ProbeTemplate>(
+        '/toolkits/latency_sleuth/probe-templates',
+        { method: 'POST', json: payload },
+      )
+      if (activeRef.current) {
+        await refresh()
+      }
+      return created
+    },
+    [refresh],
+  )
+
+  const updateTemplate = useCallback(
+    async (templateId: string, payload: Partial<ProbeTemplateCreate>) => {
+      const updated = await apiFetch<ProbeTemplate>(
+        `/toolkits/latency_sleuth/probe-templates/${templateId}`,
+        { method: 'PUT', json: payload },
+      )
+      if (activeRef.current) {
+        setTemplates((prev) => prev.map((item) => (item.id === templateId ? updated : item)))
+      }
+      return updated
+    },
+    [],
+  )
+
+  const removeTemplate = useCallback(async (templateId: string) => {
+    await apiFetch(`/toolkits/latency_sleuth/probe-templates/${templateId}`, { method: 'DELETE' })
+    if (activeRef.current) {
+      setTemplates((prev) => prev.filter((item) => item.id !== templateId))
+    }
+  }, [])
+
+  const templatesById = useMemo(() => {
+    const map = new Map<string, ProbeTemplate>()
+    for (const template of templates) {
+      map.set(template.id, template)
+    }
+    return map
+  }, [templates])
+
+  return {
+    templates,
+    templatesById,
+    availableTags,
+    hasMore: Boolean(nextCursor),
+    loadMore,
+    loading,
+    error,
+    refresh,
+    createTemplate,
+    updateTemplate,
+    removeTemplate,
+  }
+}
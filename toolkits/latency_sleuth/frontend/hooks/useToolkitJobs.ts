@@ -1,11 +1,18 @@
 import { apiFetch, getReactRuntime } from '../runtime'
-import type { JobRecord } from '../types'
+import type { JobPage, JobRecord } from '../types'
 
 const React = getReactRuntime()
 const { useCallback, useEffect, useRef, useState } = React
 
-export function useToolkitJobs(templateId: string | null, pollInterval = 10000) {
+export function jobsPath(templateId: string, limit: number, cursor?: string | null) {
+  const params = new URLSearchParams({ template_id: templateId, limit: String(limit) })
+  if (cursor) params.set('cursor', cursor)
+  return `/toolkits/latency_sleuth/jobs?${params.toString()}`
+}
+
+export function useToolkitJobs(templateId: string | null, pageSize = 10, pollInterval = 10000) {
   const [jobs, setJobs] = useState<JobRecord[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
   const activeRef = useRef(true)
@@ -20,19 +27,19 @@ export function useToolkitJobs(templateId: string | null, pollInterval = 10000)
   const fetchJobs = useCallback(async () => {
     if (!templateId) {
       setJobs([])
+      setNextCursor(null)
       setError(null)
       return []
     }
 
     setLoading(true)
     try {
-      const response = await apiFetch<JobRecord[]>(
-        `/toolkits/latency_sleuth/jobs?template_id=${encodeURIComponent(templateId)}`,
-      )
-      if (!activeRef.current) return response
-      setJobs(response)
+      const response = await apiFetch<JobPage>(jobsPath(templateId, pageSize))
+      if (!activeRef.current) return response.jobs
+      setJobs(response.jobs)
+      setNextCursor(response.next_cursor)
       setError(null)
-      return response
+      return response.jobs
     } catch (err) {
       if (!activeRef.current) return []
       const message = err instanceof Error ? err.message : 'Failed to load jobs'
@@ -43,11 +50,12 @@ export function useToolkitJobs(templateId: string | null, pollInterval = 10000)
         setLoading(false)
       }
     }
-  }, [templateId])
+  }, [templateId, pageSize])
 
   useEffect(() => {
     if (!templateId) {
       setJobs([])
+      setNextCursor(null)
       setError(null)
       return () => {}
     }
@@ -76,6 +84,7 @@ export function useToolkitJobs(templateId: string | null, pollInterval = 10000)
 
   return {
     jobs,
+    nextCursor,
     loading,
     error,
     refresh: fetchJobs,
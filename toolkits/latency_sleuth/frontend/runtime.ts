@@ -41,3 +41,14 @@ export function apiFetch<T = unknown>(path: string, options: RequestInit & { jso
   }
   return runtime.apiFetch(path, request) as Promise<T>
 }
+
+export async function apiStream(path: string, options: RequestInit = {}): Promise<Response> {
+  // Streams go through the shell's apiFetch too, so they get its base URL and auth headers.
+  const headers = new Headers(options.headers)
+  headers.set('Accept', 'text/event-stream')
+  const response = await apiFetch<unknown>(path, { ...options, headers })
+  if (!(response instanceof Response) || !response.body) {
+    throw new Error(`Runtime did not return a readable stream for ${path}`)
+  }
+  return response
+}
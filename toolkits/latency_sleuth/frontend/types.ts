@@ -22,6 +22,12 @@ export type ProbeTemplate = {
   next_run_at?: string | null
 }
 
+export type ProbeTemplatePage = {
+  templates: ProbeTemplate[]
+  next_cursor: string | null
+  tags: string[]
+}
+
 export type ProbeTemplateCreate = {
   name: string
   description?: string | null
@@ -33,12 +39,23 @@ export type ProbeTemplateCreate = {
   tags?: string[]
 }
 
+export type ProbePhaseTimings = {
+  dns_ms?: number | null
+  connect_ms?: number | null
+  tls_ms?: number | null
+  ttfb_ms?: number | null
+  total_ms: number
+}
+
 export type ProbeExecutionSample = {
   attempt: number
   timestamp: string
   latency_ms: number
   breach: boolean
   message?: string | null
+  status_code?: number | null
+  error?: string | null
+  phases?: ProbePhaseTimings | null
 }
 
 export type ProbeExecutionSummary = {
@@ -56,12 +73,16 @@ export type HeatmapCell = {
   timestamp: string
   latency_ms: number
   breach: boolean
+  sample_count?: number | null
+  breach_count?: number | null
+  p90_ms?: number | null
 }
 
 export type LatencyHeatmap = {
   template_id: string
   columns: number
   rows: HeatmapCell[][]
+  bucket_seconds?: number | null
 }
 
 export type JobRecord = {
@@ -78,3 +99,8 @@ export type JobRecord = {
   created_at: string
   updated_at: string
 }
+
+export type JobPage = {
+  jobs: JobRecord[]
+  next_cursor: string | null
+}
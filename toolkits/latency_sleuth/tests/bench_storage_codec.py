@@ -0,0 +1,152 @@
+"""Microbenchmark for the storage read paths behind template and history listings.
+
+Compares the previous decoding (stdlib ``json`` plus full pydantic validation)
+with the codec-backed reads, on records produced by the real encoders
+so no Redis is needed::
+
+    python -m toolkits.latency_sleuth.tests.bench_storage_codec --templates 2000 --runs 500
+
+Not collected by pytest; timings depend on the machine and installed backend.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from toolkits.latency_sleuth.backend import codec, storage  # noqa: E402
+from toolkits.latency_sleuth.backend.history_codec import decode_entry, decode_points, encode_entry  # noqa: E402
+from toolkits.latency_sleuth.backend.models import (  # noqa: E402
+    NotificationRule,
+    ProbeExecutionSample,
+    ProbeExecutionSummary,
+    ProbeHistoryEntry,
+    ProbeTemplate,
+    describe_sample,
+    utcnow,
+)
+
+
+def _template_records(count: int) -> List[str]:
+    now = utcnow()
+    return [
+        storage._dump(
+            storage._template_to_record(
+                ProbeTemplate(
+                    id=f"template-{index}",
+                    name=f"Checkout API {index}",
+                    description="Synthetic probe used by the codec benchmark",
+                    url=f"https://example.com/api/{index}",
+                    sla_ms=250,
+                    interval_seconds=60,
+                    notification_rules=[NotificationRule(channel="slack", target="#alerts")],
+                    tags=["team:payments", "prod"],
+                    created_at=now,
+                    updated_at=now,
+                    next_run_at=now,
+                )
+            )
+        )
+        for index in range(count)
+    ]
+
+
+def _history_records(count: int, samples: int) -> List[str]:
+    now = utcnow()
+    records = []
+    for run in range(count):
+        recorded_at = now - timedelta(minutes=run)
+        summary = ProbeExecutionSummary.from_samples(
+            template_id="template-0",
+            template_name="Checkout API",
+            sla_ms=250,
+            samples=[
+                ProbeExecutionSample(
+                    attempt=attempt + 1,
+                    timestamp=recorded_at + timedelta(milliseconds=attempt * 300),
+                    latency_ms=120.0 + (run * 7 + attempt * 53) % 300,
+                    breach=(run * 7 + attempt * 53) % 300 > 130,
+                    status_code=200,
+                )
+                for attempt in range(samples)
+            ],
+        )
+        entry = ProbeHistoryEntry(template_id="template-0", recorded_at=recorded_at, summary=summary)
+        records.append(storage._dump(encode_entry(entry)))
+    return records
+
+
+def _decode_per_model(template_id: str, data) -> ProbeHistoryEntry:
+    """The previous decoder, which built and validated each nested model separately."""
+
+    points = decode_points(data)
+    codes = data.get("c")
+    samples = [
+        ProbeExecutionSample(
+            attempt=index + 1,
+            timestamp=timestamp,
+            latency_ms=latency,
+            breach=breach,
+            message=describe_sample(latency, data["s"], status_code=codes[index] if codes else None),
+            status_code=codes[index] if codes else None,
+        )
+        for index, (timestamp, latency, breach) in enumerate(zip(points.timestamps, points.latencies, points.breaches))
+    ]
+    summary = ProbeExecutionSummary.from_samples(
+        template_id=template_id, template_name=data["n"], sla_ms=data["s"], samples=samples
+    )
+    return ProbeHistoryEntry(template_id=template_id, recorded_at=points.recorded_at, summary=summary)
+
+
+def _best(func: Callable[[], object], repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def _report(label: str, count: int, baseline: float, current: float) -> None:
+    print(
+        f"{label:<16} {baseline / count * 1e6:9.1f} µs/item  ->  "
+        f"{current / count * 1e6:9.1f} µs/item  ({baseline / current:.1f}x)"
+    )
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"JSON backend: {codec.JSON_BACKEND} (override with {codec.JSON_BACKEND_ENV})")
+
+    templates = _template_records(args.templates)
+    _report(
+        "list_templates",
+        len(templates),
+        _best(lambda: [ProbeTemplate.model_validate(json.loads(raw)) for raw in templates], args.repeat),
+        _best(lambda: [storage._raw_to_template(raw) for raw in templates], args.repeat),
+    )
+
+    history = _history_records(args.runs, args.samples)
+    assert decode_entry("template-0", storage._load(history[0])) == _decode_per_model(
+        "template-0", json.loads(history[0])
+    )
+    _report(
+        "list_history",
+        len(history),
+        _best(lambda: [_decode_per_model("template-0", json.loads(raw)) for raw in history], args.repeat),
+        _best(lambda: [decode_entry("template-0", storage._load(raw)) for raw in history], args.repeat),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import contextlib
 import os
-from collections import defaultdict
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Dict, Iterator, List
+from typing import Iterator
 
+import fakeredis
 import pytest
 
 ROOT = Path(__file__).resolve().parents[3]
@@ -13,108 +17,52 @@ if str(ROOT) not in os.sys.path:
 
 from toolkit_runtime import jobs as job_store
 from toolkit_runtime import redis as redis_module
+from toolkits.latency_sleuth.backend import probes as probes_module
 from toolkits.latency_sleuth.backend import storage as storage_module
 
 
-class FakeRedis:
-    def __init__(self) -> None:
-        self._hashes: Dict[str, Dict[str, str]] = defaultdict(dict)
-        self._lists: Dict[str, List[str]] = defaultdict(list)
-
-    class _Pipeline:
-        def __init__(self, redis: "FakeRedis") -> None:
-            self._redis = redis
-            self._commands: List[tuple] = []
-
-        def __enter__(self) -> "FakeRedis._Pipeline":
-            return self
-
-        def __exit__(self, exc_type, exc, tb) -> bool:
-            self._commands.clear()
-            return False
-
-        # Redis pipeline API (no-op implementations for watch/unwatch)
-        def watch(self, *names: str) -> None:  # pragma: no cover - compatibility shim
-            return None
-
-        def unwatch(self) -> None:  # pragma: no cover - compatibility shim
-            return None
-
-        def hget(self, name: str, key: str) -> str | None:
-            return self._redis.hget(name, key)
-
-        def multi(self) -> None:  # pragma: no cover - compatibility shim
-            self._commands.clear()
-
-        def hset(self, name: str, key: str, value: str) -> None:
-            self._commands.append(("hset", name, key, value))
-
-        def execute(self) -> List[None]:
-            for command, name, key, value in self._commands:
-                if command == "hset":
-                    self._redis.hset(name, key, value)
-            self._commands.clear()
-            return []
-
-    # Basic API used by the code under test
-    # Hash operations
-    def hset(self, name: str, key: str, value: str) -> None:
-        self._hashes[name][key] = value
-
-    def hget(self, name: str, key: str) -> str | None:
-        return self._hashes[name].get(key)
-
-    def hvals(self, name: str) -> List[str]:
-        return list(self._hashes[name].values())
-
-    def hdel(self, name: str, key: str) -> int:
-        if key in self._hashes[name]:
-            del self._hashes[name][key]
-            return 1
-        return 0
-
-    # List operations
-    def lpush(self, name: str, value: str) -> None:
-        self._lists[name].insert(0, value)
-
-    def lrange(self, name: str, start: int, stop: int) -> List[str]:
-        values = self._lists[name]
-        if stop == -1:
-            return values[start:]
-        return values[start : stop + 1]
-
-    def ltrim(self, name: str, start: int, stop: int) -> None:
-        values = self._lists[name]
-        self._lists[name] = values[start : stop + 1]
-
-    def delete(self, name: str) -> None:
-        self._hashes.pop(name, None)
-        self._lists.pop(name, None)
-
-    def scan_iter(self, pattern: str) -> Iterator[str]:
-        if pattern.endswith("*"):
-            prefix = pattern[:-1]
-            for key in list(self._lists.keys()):
-                if key.startswith(prefix):
-                    yield key
-        else:
-            if pattern in self._lists:
-                yield pattern
-
-    def flushall(self) -> None:
-        self._hashes.clear()
-        self._lists.clear()
-
-    def pipeline(self):
-        return self._Pipeline(self)
-
-
 @pytest.fixture(autouse=True)
-def fake_redis(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
-    fake = FakeRedis()
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> fakeredis.FakeRedis:
+    # fakeredis runs the shipped Lua scripts through lupa, so they are tested as written.
+    fake = fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
 
     monkeypatch.setattr(redis_module, "get_redis", lambda: fake)
     monkeypatch.setattr(job_store, "get_redis", lambda: fake)
     monkeypatch.setattr(storage_module, "get_redis", lambda: fake)
+    monkeypatch.setattr(probes_module, "DEFAULT_PROBE_MODE", "simulated")
+    storage_module._template_cache.clear()
 
     return fake
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib hook
+        if self.path.startswith("/slow"):
+            time.sleep(0.05)
+        elif self.path.startswith("/hang"):
+            time.sleep(1.0)
+        status = 503 if self.path.startswith("/down") else 200
+        body = b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # Cancelled probes abort their requests before the handler answers.
+        with contextlib.suppress(ConnectionError):
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - stdlib signature
+        return None
+
+
+@pytest.fixture()
+def http_server() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
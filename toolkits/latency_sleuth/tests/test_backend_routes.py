@@ -1,16 +1,39 @@
 from __future__ import annotations
 
-from datetime import datetime
+import json
+from datetime import datetime, timedelta, timezone
 
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from toolkit_runtime import jobs as job_store
 
+from toolkits.latency_sleuth.backend import app as app_module
+from toolkits.latency_sleuth.backend import probes as probes_module
 from toolkits.latency_sleuth.backend.app import router
-from toolkits.latency_sleuth.backend.models import ProbeTemplate
+from toolkits.latency_sleuth.backend.models import (
+    ProbeExecutionSample,
+    ProbeExecutionSummary,
+    ProbeTemplate,
+    ProbeTemplateCreate,
+    utcnow,
+)
 from toolkits.latency_sleuth.backend.probes import execute_probe
-from toolkits.latency_sleuth.backend.storage import record_probe_result
+from toolkits.latency_sleuth.backend.storage import (
+    JOB_INDEX_KEY,
+    SKETCH_KEY_PREFIX,
+    TEMPLATE_JOBS_KEY_PREFIX,
+    claim_job_index_backfill,
+    get_active_jobs,
+    get_template_health,
+    import_templates,
+    index_job,
+    is_job_cancellation_requested,
+    pop_notifications,
+    record_probe_result,
+    swap_template_health,
+)
 
 
 def create_client() -> TestClient:
@@ -55,6 +78,85 @@ def test_create_and_list_templates(fake_redis) -> None:
     assert payload[0]["next_run_at"] is not None
 
 
+def test_template_search_endpoint_pages_filtered_templates(fake_redis) -> None:
+    client = create_client()
+    first = _create_template(client)
+    second = _create_template(client)
+    client.put(f"/probe-templates/{second['id']}", json={"tags": ["service:search"]})
+
+    page = client.get("/probe-templates:search", params={"tag": "service:checkout"}).json()
+    assert [item["id"] for item in page["templates"]] == [first["id"]]
+    assert page["next_cursor"] is None
+    assert page["tags"] == ["service:checkout", "service:search"]
+
+    head = client.get("/probe-templates:search", params={"limit": 1}).json()
+    assert [item["id"] for item in head["templates"]] == [second["id"]]
+    tail = client.get("/probe-templates:search", params={"limit": 1, "cursor": head["next_cursor"]}).json()
+    assert [item["id"] for item in tail["templates"]] == [first["id"]]
+    assert client.get("/probe-templates:search", params={"cursor": "nope"}).status_code == 400
+
+
+def test_template_import_reports_bad_lines_and_round_trips_export(monkeypatch, fake_redis) -> None:
+    monkeypatch.setattr(app_module, "IMPORT_CHUNK_SIZE", 2)
+    client = create_client()
+    existing = _create_template(client)
+    lines = [
+        json.dumps({"name": "Search", "url": "https://example.com/search", "sla_ms": 300, "tags": ["team:search"]}),
+        "{not json",
+        json.dumps({"name": "", "url": "https://example.com/blank", "sla_ms": 300}),
+        "",
+        json.dumps({**existing, "sla_ms": 900}),
+        json.dumps(["not", "an", "object"]),
+    ]
+
+    response = client.post("/probe-templates:import", content="\n".join(lines).encode())
+    assert response.status_code == 200
+    body = response.json()
+    assert body["imported"] == 2
+    assert [error["line"] for error in body["errors"]] == [2, 3, 6]
+    assert body["errors"][1]["error"].startswith("name:")
+
+    replaced = client.get(f"/probe-templates/{existing['id']}").json()
+    assert replaced["sla_ms"] == 900
+    assert replaced["created_at"] == existing["created_at"]
+    page = client.get("/probe-templates:search", params={"tag": "team:search"}).json()
+    assert [item["name"] for item in page["templates"]] == ["Search"]
+
+    export = client.get("/probe-templates:export")
+    assert export.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in export.text.splitlines()]
+    assert sorted(item["name"] for item in exported) == ["Checkout", "Search"]
+
+    fake_redis.flushall()
+    reimported = client.post("/probe-templates:import", content=export.text.encode()).json()
+    assert reimported == {"imported": 2, "errors": []}
+    assert sorted(item["id"] for item in client.get("/probe-templates").json()) == sorted(
+        item["id"] for item in exported
+    )
+
+
+def test_template_import_rejects_ids_unsafe_in_keys(fake_redis) -> None:
+    client = create_client()
+    existing = _create_template(client)
+    record_probe_result(execute_probe(ProbeTemplate.model_validate(existing), sample_size=1, overrides=[100]))
+    sketch_pattern = f"{SKETCH_KEY_PREFIX}:{existing['id']}:*"
+    sketches = len(list(fake_redis.scan_iter(sketch_pattern)))
+    template = {"name": "Search", "url": "https://example.com/search", "sla_ms": 300}
+    lines = [json.dumps({**template, "id": unsafe}) for unsafe in ("*", "a:b", "x\x00y", "a" * 129)]
+    lines.append(json.dumps({**template, "id": "search-api_2"}))
+
+    body = client.post("/probe-templates:import", content="\n".join(lines).encode()).json()
+    assert body["imported"] == 1
+    assert [error["line"] for error in body["errors"]] == [1, 2, 3, 4]
+    assert all(error["error"].startswith("id:") for error in body["errors"])
+    with pytest.raises(ValueError):
+        import_templates([("*", ProbeTemplateCreate.model_validate(template))])
+
+    # The reported repro: deleting "*" used to wipe every template's sketches.
+    assert client.delete("/probe-templates/*").status_code == 404
+    assert len(list(fake_redis.scan_iter(sketch_pattern))) == sketches == 3
+
+
 def test_preview_endpoint_returns_summary(fake_redis) -> None:
     client = create_client()
     template = _create_template(client)
@@ -70,6 +172,37 @@ def test_preview_endpoint_returns_summary(fake_redis) -> None:
     assert data["breach_count"] == 1
 
 
+def test_preview_lists_channels_without_moving_alert_state(fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    url = f"/probe-templates/{template['id']}/actions/preview"
+    breaching = {"sample_size": 1, "latency_overrides": [480]}
+
+    assert client.post(url, json=breaching).json()["notified_channels"] == ["slack"]
+    assert client.post(url, json=breaching).json()["notified_channels"] == ["slack"]
+    assert get_template_health(template["id"]) is None
+    assert pop_notifications(10) == []
+
+    # Breach rules fire when a streak starts, so a preview during one stays quiet.
+    swap_template_health(template["id"], "breach")
+    assert client.post(url, json=breaching).json()["notified_channels"] == []
+
+
+def test_preview_stays_simulated_under_live_default(monkeypatch, fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    monkeypatch.setattr(probes_module, "DEFAULT_PROBE_MODE", "live")
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("preview must not send requests unless asked to")
+
+    monkeypatch.setattr(probes_module, "execute_probe_async", no_network)
+
+    preview = client.post(f"/probe-templates/{template['id']}/actions/preview", json={"sample_size": 2})
+    assert preview.status_code == 200
+    assert len(preview.json()["samples"]) == 2
+
+
 def test_run_endpoint_enqueues_job(monkeypatch, fake_redis) -> None:
     client = create_client()
     template = _create_template(client)
@@ -92,6 +225,7 @@ def test_run_endpoint_enqueues_job(monkeypatch, fake_redis) -> None:
     assert captured["args"][0] == "latency-sleuth"
     assert captured["args"][1] == "run_probe"
     assert captured["args"][2]["sample_size"] == 4
+    assert get_active_jobs([template["id"]]) == {template["id"]: "job-123"}
 
 
 def test_heatmap_endpoint_returns_cells(fake_redis) -> None:
@@ -117,7 +251,7 @@ def test_job_endpoints(fake_redis) -> None:
 
     listing = client.get("/jobs")
     assert listing.status_code == 200
-    jobs = listing.json()
+    jobs = listing.json()["jobs"]
     assert any(item["id"] == job["id"] for item in jobs)
 
     detail = client.get(f"/jobs/{job['id']}")
@@ -125,6 +259,303 @@ def test_job_endpoints(fake_redis) -> None:
     assert detail.json()["id"] == job["id"]
 
 
+def test_job_listing_pages_with_filters(fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    other = _create_template(client)
+    claim_job_index_backfill()
+    created = []
+    for index in range(5):
+        job = job_store.create_job("latency-sleuth", "run_probe", {"template_id": template["id"]})
+        job["created_at"] = datetime(2024, 5, 1, 12, index, tzinfo=timezone.utc).isoformat()
+        job["status"] = "failed" if index == 1 else "succeeded"
+        index_job(job_store.save_job(job))
+        created.append(job["id"])
+    index_job(job_store.create_job("latency-sleuth", "run_probe_batch", {"template_ids": [other["id"]]}))
+
+    seen, cursor = [], None
+    while True:
+        params = {"template_id": template["id"], "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/jobs", params=params).json()
+        assert len(page["jobs"]) <= 2
+        seen.extend(job["id"] for job in page["jobs"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == list(reversed(created))
+
+    failed = client.get("/jobs", params={"template_id": template["id"], "status": "failed"}).json()
+    assert [job["id"] for job in failed["jobs"]] == [created[1]]
+
+    recent = client.get(
+        "/jobs", params={"template_id": template["id"], "since": "2024-05-01T12:03:00+00:00"}
+    ).json()
+    assert [job["id"] for job in recent["jobs"]] == [created[4], created[3]]
+
+    batch = client.get("/jobs", params={"template_id": other["id"]}).json()
+    assert len(batch["jobs"]) == 1
+    assert client.get("/jobs", params={"cursor": "garbage"}).status_code == 400
+
+
+def test_job_listing_ends_on_an_exactly_full_last_page(fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    claim_job_index_backfill()
+    for _ in range(4):
+        index_job(job_store.create_job("latency-sleuth", "run_probe", {"template_id": template["id"]}))
+
+    first = client.get("/jobs", params={"limit": 2}).json()
+    assert len(first["jobs"]) == 2 and first["next_cursor"]
+    last = client.get("/jobs", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert len(last["jobs"]) == 2
+    assert last["next_cursor"] is None
+
+    queued = client.get("/jobs", params={"status": "queued", "limit": 4}).json()
+    assert len(queued["jobs"]) == 4
+    assert queued["next_cursor"] is None
+
+
+def test_job_listing_reads_a_page_in_one_bulk_call(monkeypatch, fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    claim_job_index_backfill()
+    for _ in range(5):
+        index_job(job_store.create_job("latency-sleuth", "run_probe", {"template_id": template["id"]}))
+    bulk_reads = []
+
+    def get_jobs(job_ids):
+        bulk_reads.append(list(job_ids))
+        return [job_store.get_job(job_id) for job_id in job_ids]
+
+    monkeypatch.setattr(job_store, "get_jobs", get_jobs, raising=False)
+    page = client.get("/jobs", params={"limit": 3}).json()
+
+    assert len(page["jobs"]) == 3
+    assert [len(ids) for ids in bulk_reads] == [4]
+
+
+def test_job_listing_drops_pruned_jobs_from_the_index_it_reads(fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    other = _create_template(client)
+    claim_job_index_backfill()
+    pruned = {
+        "id": "pruned",
+        "created_at": "2024-05-01T12:00:00+00:00",
+        "payload": {"template_ids": [template["id"], other["id"]]},
+    }
+    index_job(pruned)
+
+    assert client.get("/jobs", params={"template_id": template["id"]}).json()["jobs"] == []
+    assert fake_redis.zscore(JOB_INDEX_KEY, "pruned") is None
+    assert fake_redis.zscore(f"{TEMPLATE_JOBS_KEY_PREFIX}:{template['id']}", "pruned") is None
+    assert fake_redis.zscore(f"{TEMPLATE_JOBS_KEY_PREFIX}:{other['id']}", "pruned") is not None
+
+
+def test_failed_job_index_backfill_is_retried(monkeypatch, fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    job = job_store.create_job("latency-sleuth", "run_probe", {"template_id": template["id"]})
+    list_jobs = job_store.list_jobs
+
+    def failing_list_jobs(**kwargs):
+        raise ConnectionError("job store unavailable")
+
+    monkeypatch.setattr(job_store, "list_jobs", failing_list_jobs)
+    with pytest.raises(ConnectionError):
+        client.get("/jobs")
+    monkeypatch.setattr(job_store, "list_jobs", list_jobs)
+
+    listing = client.get("/jobs").json()
+    assert [item["id"] for item in listing["jobs"]] == [job["id"]]
+
+
+def test_cancel_endpoint_signals_running_job(fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    job = job_store.create_job("latency-sleuth", "run_probe", {"template_id": template["id"]})
+
+    response = client.post(f"/jobs/{job['id']}/actions/cancel")
+    assert response.status_code == 202
+    assert response.json()["job"]["status"] == "cancelling"
+    assert is_job_cancellation_requested(job["id"])
+
+    finished = job_store.get_job(job["id"])
+    finished["status"] = "succeeded"
+    job_store.save_job(finished)
+    assert client.post(f"/jobs/{job['id']}/actions/cancel").status_code == 409
+    assert client.post("/jobs/missing/actions/cancel").status_code == 404
+
+
+def test_job_events_endpoint_streams_snapshot_for_finished_job(fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    job = job_store.create_job("latency-sleuth", "run_probe", {"template_id": template["id"]})
+    job["status"] = "succeeded"
+    job_store.save_job(job)
+
+    with client.stream("GET", f"/jobs/{job['id']}/events") as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+
+    assert body.startswith("event: snapshot\n")
+    snapshot = json.loads(body.split("data: ", 1)[1].split("\n", 1)[0])
+    assert snapshot["id"] == job["id"]
+    assert snapshot["status"] == "succeeded"
+    assert client.get("/jobs/missing/events").status_code == 404
+
+
+def test_percentiles_endpoint_reports_window(fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    summary = execute_probe(ProbeTemplate.model_validate(template), sample_size=4, overrides=[100, 200, 300, 900])
+    record_probe_result(summary)
+
+    drift = client.get(f"/probe-templates/{template['id']}/drift").json()
+    assert (drift["status"], drift["runs"], drift["latest_ms"]) == ("learning", 1, 375.0)
+    assert client.get("/probe-templates/missing/drift").status_code == 404
+
+    response = client.get(f"/probe-templates/{template['id']}/percentiles")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["sample_count"] == 4
+    assert body["breach_count"] == 1
+    assert abs(body["p99_ms"] - 900) <= 9
+
+    invalid = client.get(
+        f"/probe-templates/{template['id']}/percentiles",
+        params={"start": "2024-01-02T00:00:00", "end": "2024-01-01T00:00:00"},
+    )
+    assert invalid.status_code == 400
+
+
+def test_sla_replay_endpoint_sweeps_candidates(fake_redis) -> None:
+    client = create_client()
+    template = client.post(
+        "/probe-templates",
+        json={
+            "name": "Checkout",
+            "url": "https://example.com/checkout",
+            "sla_ms": 450,
+            "notification_rules": [
+                {"channel": "slack", "target": "#alerts", "threshold": "breach"},
+                {"channel": "webhook", "target": "https://hooks.example.com/ok", "threshold": "recovery"},
+                {"channel": "email", "target": "ops@example.com", "threshold": "always"},
+            ],
+        },
+    ).json()
+    # Run maxima 200, 500, 300, failed, 100: a failed sample breaches at any SLA.
+    for latencies in ([100, 200], [500, 100], [300], [100, None], [100]):
+        samples = [
+            ProbeExecutionSample(
+                attempt=index + 1,
+                timestamp=utcnow(),
+                latency_ms=latency or 50,
+                breach=latency is None or latency > 450,
+                status_code=200 if latency else None,
+                error=None if latency else "connect timeout",
+            )
+            for index, latency in enumerate(latencies)
+        ]
+        record_probe_result(ProbeExecutionSummary.from_samples(template["id"], "Checkout", 450, samples))
+
+    response = client.get(
+        f"/probe-templates/{template['id']}/sla-replay",
+        params={"sla_ms": [250, 600], "sweep_start": 150, "sweep_stop": 400, "sweep_step": 250},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["current_sla_ms"], body["run_count"], body["sample_count"]) == (450, 5, 8)
+    assert [
+        (item["sla_ms"], item["breach_count"], item["breaching_runs"], item["notifications_by_channel"])
+        for item in body["candidates"]
+    ] == [
+        (150, 4, 4, {"slack": 1, "webhook": 1, "email": 5}),
+        (250, 3, 3, {"slack": 1, "webhook": 1, "email": 5}),
+        (400, 2, 2, {"slack": 2, "webhook": 2, "email": 5}),
+        (600, 1, 1, {"slack": 1, "webhook": 1, "email": 5}),
+    ]
+    assert body["candidates"][2]["breach_rate"] == 0.25
+
+    (current,) = client.get(f"/probe-templates/{template['id']}/sla-replay").json()["candidates"]
+    assert (current["sla_ms"], current["notifications"]) == (450, 9)
+    future = client.get(
+        f"/probe-templates/{template['id']}/sla-replay", params={"start": "2999-01-01T00:00:00"}
+    ).json()
+    assert (future["run_count"], future["candidates"][0]["breach_rate"]) == (0, 0.0)
+
+    for params in (
+        {"sweep_start": 100},
+        {"sweep_start": 500, "sweep_stop": 100},
+        {"sweep_start": 1, "sweep_stop": 100_000, "sweep_step": 1},
+        {"sla_ms": 0},
+        {"start": "2024-01-02T00:00:00", "end": "2024-01-01T00:00:00"},
+    ):
+        assert client.get(f"/probe-templates/{template['id']}/sla-replay", params=params).status_code == 400
+    assert client.get("/probe-templates/missing/sla-replay").status_code == 404
+
+
+def test_history_export_streams_ndjson_and_csv(fake_redis) -> None:
+    client = create_client()
+    first = _create_template(client)
+    second = _create_template(client)
+    for template, overrides in ((first, [100, 200]), (second, [300]), (first, [400])):
+        summary = execute_probe(ProbeTemplate.model_validate(template), sample_size=len(overrides), overrides=overrides)
+        for sample in summary.samples[1:]:
+            sample.timestamp = summary.samples[0].timestamp + timedelta(milliseconds=250 * (sample.attempt - 1))
+        record_probe_result(summary)
+
+    response = client.get("/probe-history:export", params={"template_id": first["id"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["attempt"], row["latency_ms"], row["failed"]) for row in rows] == [
+        (1, 100.0, False),
+        (2, 200.0, False),
+        (1, 400.0, False),
+    ]
+    sampled = [datetime.fromisoformat(row["recorded_at"]) for row in rows]
+    assert sampled[0].tzinfo is not None
+    # Each sample keeps its own time, to the millisecond, rather than its run's second.
+    assert sampled[1] - sampled[0] == timedelta(milliseconds=250)
+
+    fleet = client.get("/probe-history:export", params={"format": "csv"})
+    assert fleet.headers["content-type"].startswith("text/csv")
+    lines = fleet.text.splitlines()
+    assert lines[0] == "template_id,recorded_at,attempt,latency_ms,failed"
+    assert sorted(line.split(",")[3] for line in lines[1:]) == ["100.0", "200.0", "300.0", "400.0"]
+
+    future = client.get("/probe-history:export", params={"start": "2999-01-01T00:00:00"})
+    assert future.text == ""
+    invalid = client.get(
+        "/probe-history:export", params={"start": "2024-01-02T00:00:00", "end": "2024-01-01T00:00:00"}
+    )
+    assert invalid.status_code == 400
+    assert client.get("/probe-history:export", params={"template_id": "missing"}).status_code == 404
+
+
+def test_heatmap_endpoint_serves_long_ranges_from_rollups(fake_redis) -> None:
+    client = create_client()
+    template = _create_template(client)
+    summary = execute_probe(ProbeTemplate.model_validate(template), sample_size=3, overrides=[100, 120, 900])
+    record_probe_result(summary)
+
+    response = client.get(
+        f"/probe-templates/{template['id']}/heatmap",
+        params={"start": "2000-01-01T00:00:00Z", "bucket_seconds": 60},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["bucket_seconds"] == 604_800
+    (row,) = body["rows"]
+    (cell,) = row
+    assert cell["sample_count"] == 3
+    assert cell["breach_count"] == 1
+
+
 def test_interval_update_resets_next_run(fake_redis) -> None:
     client = create_client()
     template = _create_template(client)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from datetime import timedelta
+
+from toolkits.latency_sleuth.backend import storage
 from toolkits.latency_sleuth.backend.dashboard import build_context
-from toolkits.latency_sleuth.backend.models import ProbeTemplateCreate
+from toolkits.latency_sleuth.backend.models import ProbeTemplateCreate, utcnow
 from toolkits.latency_sleuth.backend.probes import execute_probe
 from toolkits.latency_sleuth.backend.storage import create_template, record_probe_result
 
@@ -27,3 +30,28 @@ def test_dashboard_metrics(fake_redis) -> None:
     assert metrics["Templates"]["value"] == 1
     assert metrics["24h runs"]["value"] == 1
     assert "breach" in metrics["24h runs"]["description"].lower()
+    assert metrics["Drifting"]["value"] == 0
+
+
+def test_dashboard_reads_counters_instead_of_history(monkeypatch, fake_redis) -> None:
+    template = create_template(
+        ProbeTemplateCreate(name="API", url="https://example.com/api", sla_ms=200, interval_seconds=3600)
+    )
+    record_probe_result(execute_probe(template, sample_size=3, overrides=[250, 300, 100]))
+    # Runs older than the window still sitting in Redis must not be counted.
+    stale_bucket = int((utcnow() - timedelta(hours=30)).timestamp()) // storage.FLEET_COUNTER_BUCKET_SECONDS
+    fake_redis.incrby(storage._fleet_counter_key("runs", stale_bucket), 5)
+    storage.reserve_template_for_run(template.id, now=utcnow())
+
+    def _no_history(*args, **kwargs):
+        raise AssertionError("dashboard must not scan history")
+
+    monkeypatch.setattr(storage, "list_history", _no_history)
+    monkeypatch.setattr(storage, "list_history_stats", _no_history)
+
+    metrics = {metric["label"]: metric for metric in build_context()["metrics"]}
+
+    assert metrics["Templates"]["value"] == 1
+    assert metrics["24h runs"]["value"] == 1
+    assert metrics["24h runs"]["description"].startswith("2 breach(es)")
+    assert metrics["24h runs"]["description"].endswith("Upcoming runs (15m): 0.")
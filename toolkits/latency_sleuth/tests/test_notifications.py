@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List
+
+import pytest
+
+from toolkits.latency_sleuth.backend.models import (
+    NotificationRule,
+    ProbeExecutionSample,
+    ProbeExecutionSummary,
+    ProbeTemplate,
+    utcnow,
+)
+from toolkits.latency_sleuth.backend.notifications import (
+    NotificationDispatcher,
+    TokenBucket,
+    queue_notifications,
+)
+from toolkits.latency_sleuth.backend.storage import NOTIFICATION_DEAD_LETTER_KEY, pop_notifications
+
+
+class _Webhook(ThreadingHTTPServer):
+    """Local webhook stand-in recording every POST body; ``failures`` paths answer 503 first."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _WebhookHandler)
+        self.received: List[tuple[str, dict]] = []
+        self.failures: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _Webhook
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib hook
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            if self.path.startswith("/reject"):
+                status = 400
+            elif self.server.failures.get(self.path, 0) > 0:
+                self.server.failures[self.path] -= 1
+                status = 503
+            else:
+                self.server.received.append((self.path, body))
+                status = 204
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - stdlib signature
+        return None
+
+
+@pytest.fixture()
+def webhook() -> Iterator[_Webhook]:
+    server = _Webhook()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _template(*rules: NotificationRule, template_id: str = "checkout") -> ProbeTemplate:
+    now = utcnow()
+    return ProbeTemplate(
+        id=template_id,
+        name=template_id.title(),
+        url="https://example.com/api",
+        sla_ms=200,
+        notification_rules=list(rules),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _summary(template: ProbeTemplate, *latencies: float) -> ProbeExecutionSummary:
+    samples = [
+        ProbeExecutionSample(attempt=index + 1, timestamp=utcnow(), latency_ms=latency, breach=latency > 200)
+        for index, latency in enumerate(latencies)
+    ]
+    return ProbeExecutionSummary.from_samples(template.id, template.name, template.sla_ms, samples)
+
+
+class _Sleeps:
+    def __init__(self) -> None:
+        self.calls: List[float] = []
+
+    async def __call__(self, seconds: float) -> None:
+        self.calls.append(seconds)
+
+
+def test_rules_fire_on_state_changes(fake_redis) -> None:
+    template = _template(
+        NotificationRule(channel="webhook", target="https://hooks.example.com/breach", threshold="breach"),
+        NotificationRule(channel="slack", target="#sre", threshold="recovery"),
+        NotificationRule(channel="email", target="ops@example.com", threshold="always"),
+    )
+
+    fired = [
+        [(event.channel, event.kind) for event in queue_notifications(template, _summary(template, *latencies))]
+        for latencies in ([50], [250], [300], [50], [60])
+    ]
+
+    assert fired == [
+        [("email", "ok")],
+        [("webhook", "breach"), ("email", "breach")],
+        [("email", "breach")],
+        [("slack", "recovery"), ("email", "recovery")],
+        [("email", "ok")],
+    ]
+    assert len(pop_notifications(100)) == 7
+
+
+def test_dispatcher_batches_and_deduplicates_per_target(fake_redis, webhook) -> None:
+    alerts = NotificationRule(channel="webhook", target=webhook.url("/alerts"), threshold="always")
+    audit = NotificationRule(channel="webhook", target=webhook.url("/audit"), threshold="breach")
+    checkout = _template(alerts, audit)
+    search = _template(alerts, template_id="search")
+    for latencies in ([250], [300], [320]):
+        queue_notifications(checkout, _summary(checkout, *latencies))
+    queue_notifications(search, _summary(search, 50))
+
+    assert asyncio.run(NotificationDispatcher().dispatch_once()) == 5
+
+    received = {path: body["events"] for path, body in webhook.received}
+    assert len(webhook.received) == 2
+    assert [(event["template_id"], event["kind"], event["occurrences"]) for event in received["/alerts"]] == [
+        ("checkout", "breach", 3),
+        ("search", "ok", 1),
+    ]
+    assert [(event["template_id"], event["occurrences"]) for event in received["/audit"]] == [("checkout", 1)]
+    assert pop_notifications(10) == []
+
+
+def test_dispatcher_retries_with_backoff_and_parks_rejected_batches(fake_redis, webhook) -> None:
+    webhook.failures["/flaky"] = 2
+    flaky = _template(NotificationRule(channel="webhook", target=webhook.url("/flaky"), threshold="always"))
+    rejected = _template(
+        NotificationRule(channel="webhook", target=webhook.url("/reject"), threshold="always"), template_id="search"
+    )
+    queue_notifications(flaky, _summary(flaky, 50))
+    queue_notifications(rejected, _summary(rejected, 50))
+    sleeps = _Sleeps()
+
+    asyncio.run(NotificationDispatcher(sleep=sleeps, backoff_seconds=0.5).dispatch_once())
+
+    assert [path for path, _ in webhook.received] == ["/flaky"]
+    assert sleeps.calls == [0.5, 1.0]
+    (dead,) = fake_redis.lrange(NOTIFICATION_DEAD_LETTER_KEY, 0, -1)
+    assert json.loads(dead)["event"]["template_id"] == "search"
+    assert "400" in json.loads(dead)["error"]
+
+
+def test_channel_rate_limits_space_out_requests(fake_redis, webhook) -> None:
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, burst=2, clock=lambda: now[0])
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    now[0] = 10.0
+    assert bucket.reserve() == 0.0
+
+    for index in range(3):
+        template = _template(
+            NotificationRule(channel="webhook", target=webhook.url(f"/t{index}"), threshold="always"),
+            template_id=f"t{index}",
+        )
+        queue_notifications(template, _summary(template, 50))
+    sleeps = _Sleeps()
+    dispatcher = NotificationDispatcher(rate_limits={"webhook": (4.0, 1)}, sleep=sleeps, clock=lambda: 0.0)
+
+    asyncio.run(dispatcher.dispatch_once())
+
+    assert len(webhook.received) == 3
+    assert sorted(sleeps.calls) == [0.25, 0.5]
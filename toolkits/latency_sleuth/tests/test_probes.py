@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from toolkits.latency_sleuth.backend.models import ProbeTemplate, utcnow
+from toolkits.latency_sleuth.backend.probes import ProbeCancelled, execute_probe, execute_probes
+
+
+def _template(url: str, sla_ms: int = 1000, template_id: str = "live") -> ProbeTemplate:
+    now = utcnow()
+    return ProbeTemplate(
+        id=template_id,
+        name="Live",
+        url=url,
+        sla_ms=sla_ms,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_live_probe_records_phase_timings(http_server) -> None:
+    summary = execute_probe(_template(f"{http_server}/"), sample_size=3, mode="live")
+
+    assert len(summary.samples) == 3
+    assert [sample.attempt for sample in summary.samples] == [1, 2, 3]
+    for sample in summary.samples:
+        assert sample.status_code == 200
+        assert sample.error is None
+        assert sample.phases is not None
+        assert sample.phases.total_ms == sample.latency_ms
+        assert sample.phases.ttfb_ms is not None
+        assert sample.phases.tls_ms is None
+    assert any(sample.phases.connect_ms is not None for sample in summary.samples)
+    assert summary.met_sla
+
+
+def test_live_probe_flags_slow_and_failing_targets(http_server) -> None:
+    slow = execute_probe(_template(f"{http_server}/slow", sla_ms=10), sample_size=2, mode="live")
+    assert slow.breach_count == 2
+    assert all(sample.latency_ms >= 50 for sample in slow.samples)
+
+    down = execute_probe(_template(f"{http_server}/down"), sample_size=1, mode="live")
+    assert down.samples[0].status_code == 503
+    assert down.samples[0].breach
+
+
+def test_live_probe_reports_connection_errors() -> None:
+    summary = execute_probe(_template("http://127.0.0.1:9/"), sample_size=1, mode="live")
+
+    sample = summary.samples[0]
+    assert sample.breach
+    assert sample.status_code is None
+    assert sample.error
+
+
+def test_overrides_use_simulated_mode(http_server) -> None:
+    summary = execute_probe(_template(f"{http_server}/"), sample_size=2, overrides=[5, 2000], mode="live")
+
+    assert [sample.latency_ms for sample in summary.samples] == [5, 2000]
+    assert summary.samples[0].phases is None
+
+
+def test_live_batch_probes_share_one_loop(http_server) -> None:
+    templates = [
+        _template(f"{http_server}/", template_id="fast"),
+        _template(f"{http_server}/down", template_id="down"),
+        _template(f"{http_server}/slow", sla_ms=10, template_id="slow"),
+    ]
+    completed = []
+
+    outcomes = execute_probes(
+        templates,
+        sample_size=2,
+        mode="live",
+        on_result=lambda template, outcome: completed.append(template.id),
+    )
+
+    assert sorted(completed) == ["down", "fast", "slow"]
+    by_id = {outcome.template_id: outcome for outcome in outcomes}
+    assert by_id["fast"].met_sla
+    assert by_id["down"].breach_count == 2
+    assert by_id["slow"].breach_count == 2
+
+
+def test_batch_results_are_handled_off_the_event_loop(http_server) -> None:
+    templates = [_template(f"{http_server}/", template_id="fast"), _template(f"{http_server}/slow", template_id="slow")]
+    handled = {}
+
+    def _on_result(template, outcome) -> None:
+        handled[template.id] = threading.current_thread()
+        if template.id == "fast":
+            # Stands in for the Redis writes a worker makes per result.
+            time.sleep(0.3)
+
+    outcomes = execute_probes(templates, sample_size=1, mode="live", on_result=_on_result)
+
+    assert set(handled) == {"fast", "slow"}
+    assert threading.main_thread() not in handled.values()
+    slow = next(outcome for outcome in outcomes if outcome.template_id == "slow")
+    assert slow.samples[0].latency_ms < 250
+
+
+def test_cancellation_interrupts_in_flight_requests(http_server) -> None:
+    deadline = time.monotonic() + 0.1
+    started = time.monotonic()
+
+    with pytest.raises(ProbeCancelled):
+        execute_probe(
+            _template(f"{http_server}/hang"),
+            sample_size=2,
+            mode="live",
+            should_cancel=lambda: time.monotonic() >= deadline,
+        )
+
+    assert time.monotonic() - started < 0.9
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import math
+import random
+
+from toolkits.latency_sleuth.backend.sketches import RELATIVE_ACCURACY, LatencySketch
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q * len(ordered)), 1) - 1]
+
+
+def test_quantiles_stay_within_relative_accuracy() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(5, 1) for _ in range(5000)]
+    sketch = LatencySketch()
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.9, 0.99):
+        exact = _exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= exact * RELATIVE_ACCURACY
+
+
+def test_sketches_merge_through_hash_fields() -> None:
+    left, right = LatencySketch(), LatencySketch()
+    for value in (10.0, 20.0, 30.0):
+        left.add(value, breach=value > 25)
+    for value in (40.0, 50.0):
+        right.add(value, breach=True)
+
+    encoded = {key: str(value) for key, value in left.to_fields().items()}
+    merged = LatencySketch.merged([LatencySketch.from_fields(encoded), right])
+
+    assert merged.count == 5
+    assert merged.breaches == 3
+    assert merged.mean == 30.0
+    assert abs(merged.quantile(0.5) - 30.0) <= 30.0 * RELATIVE_ACCURACY
+    assert LatencySketch().quantile(0.5) is None
@@ -0,0 +1,548 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+
+import pytest
+
+from toolkits.latency_sleuth.backend import codec
+from toolkits.latency_sleuth.backend import storage as storage_module
+from toolkits.latency_sleuth.backend.history_codec import encode_entry
+from toolkits.latency_sleuth.backend.models import (
+    ProbeExecutionSample,
+    ProbeExecutionSummary,
+    ProbeHistoryEntry,
+    ProbePhaseTimings,
+    ProbeTemplateCreate,
+    ProbeTemplateUpdate,
+    utcnow,
+)
+from toolkits.latency_sleuth.backend.replay import encode_samples
+from toolkits.latency_sleuth.backend.storage import (
+    SCHEDULE_KEY,
+    SCHEDULER_LEASE_KEY,
+    TEMPLATE_CREATED_KEY,
+    TEMPLATE_NAMES_KEY,
+    TEMPLATE_TAG_KEY_PREFIX,
+    TEMPLATE_VERSIONS_KEY,
+    _history_key,
+    MAX_ROLLUP_HEATMAP_CELLS,
+    _plan_sketch_buckets,
+    bootstrap_schedule,
+    build_heatmap,
+    build_rollup_heatmap,
+    create_template,
+    delete_template,
+    get_drift_state,
+    get_template,
+    iter_history_samples,
+    get_templates,
+    hold_scheduler_lease,
+    latency_percentiles,
+    list_due_templates,
+    list_history,
+    list_history_points,
+    list_template_tags,
+    parse_retention,
+    load_replay_log,
+    record_probe_result,
+    release_scheduler_lease,
+    reserve_due_templates,
+    reserve_template_for_run,
+    search_templates,
+    update_template,
+)
+
+
+def _make_template(name: str = "API"):
+    return create_template(
+        ProbeTemplateCreate(
+            name=name,
+            url="https://example.com/api",
+            sla_ms=200,
+            interval_seconds=120,
+        )
+    )
+
+
+def test_due_index_tracks_template_lifecycle(fake_redis) -> None:
+    template = _make_template()
+    assert fake_redis.zscore(SCHEDULE_KEY, template.id) == template.next_run_at.timestamp()
+
+    reserved = reserve_template_for_run(template.id, now=utcnow())
+    assert reserved is not None
+    assert fake_redis.zscore(SCHEDULE_KEY, template.id) == reserved.next_run_at.timestamp()
+
+    updated = update_template(template.id, ProbeTemplateUpdate(interval_seconds=60))
+    assert updated is not None
+    assert fake_redis.zscore(SCHEDULE_KEY, template.id) == updated.next_run_at.timestamp()
+
+    assert delete_template(template.id)
+    assert fake_redis.zscore(SCHEDULE_KEY, template.id) is None
+
+
+def test_list_due_templates_only_returns_due_entries(fake_redis) -> None:
+    first = _make_template("First")
+    second = _make_template("Second")
+    reserve_template_for_run(second.id, now=utcnow())
+
+    due = list_due_templates(now=utcnow())
+    assert [template.id for template in due] == [first.id]
+
+    later = utcnow() + timedelta(minutes=5)
+    assert {template.id for template in list_due_templates(now=later)} == {first.id, second.id}
+    assert len(list_due_templates(limit=1, now=later)) == 1
+
+
+def test_bootstrap_schedule_rebuilds_index(fake_redis) -> None:
+    template = _make_template()
+    fake_redis.delete(SCHEDULE_KEY)
+    assert list_due_templates(now=utcnow()) == []
+
+    bootstrap_schedule()
+
+    assert [due.id for due in list_due_templates(now=utcnow())] == [template.id]
+
+
+def test_reserve_due_templates_claims_batch_once(fake_redis) -> None:
+    templates = [_make_template(f"Template {index}") for index in range(3)]
+    now = utcnow()
+
+    first_batch = reserve_due_templates(2, now=now)
+    second_batch = reserve_due_templates(2, now=now)
+
+    claimed = [template.id for template in first_batch + second_batch]
+    assert len(first_batch) == 2
+    assert len(second_batch) == 1
+    assert sorted(claimed) == sorted(template.id for template in templates)
+    assert reserve_due_templates(2, now=now) == []
+    for template in first_batch + second_batch:
+        assert template.next_run_at == now + timedelta(seconds=template.interval_seconds)
+        assert template.updated_at == now
+
+
+def _live_summary(template_id: str) -> ProbeExecutionSummary:
+    started = utcnow()
+    samples = [
+        ProbeExecutionSample(
+            attempt=1,
+            timestamp=started,
+            latency_ms=123.456,
+            breach=False,
+            message="123.46 ms (within SLA)",
+            status_code=200,
+            phases=ProbePhaseTimings(dns_ms=1.5, connect_ms=3.25, tls_ms=None, ttfb_ms=120.0, total_ms=123.456),
+        ),
+        ProbeExecutionSample(
+            attempt=2,
+            timestamp=started + timedelta(milliseconds=250, microseconds=7),
+            latency_ms=410.0,
+            breach=True,
+            message="410.00 ms (HTTP 503)",
+            status_code=503,
+            phases=ProbePhaseTimings(ttfb_ms=400.0, total_ms=410.0),
+        ),
+        ProbeExecutionSample(
+            attempt=3,
+            timestamp=started + timedelta(seconds=1),
+            latency_ms=30000.0,
+            breach=True,
+            message="30000.00 ms (request failed: ReadTimeout)",
+            error="ReadTimeout",
+            phases=ProbePhaseTimings(total_ms=30000.0),
+        ),
+    ]
+    return ProbeExecutionSummary.from_samples(
+        template_id=template_id,
+        template_name="API",
+        sla_ms=200,
+        samples=samples,
+        notified_channels=["email"],
+    )
+
+
+def test_scheduler_lease_scripts_compare_owner_before_renewing_or_releasing(fake_redis) -> None:
+    assert hold_scheduler_lease("worker-a", 10)
+    assert 9_000 < fake_redis.pttl(SCHEDULER_LEASE_KEY) <= 10_000
+    assert not hold_scheduler_lease("worker-b", 10)
+
+    # Renewal by the owner extends the TTL instead of failing on NX.
+    fake_redis.pexpire(SCHEDULER_LEASE_KEY, 500)
+    assert hold_scheduler_lease("worker-a", 30)
+    assert fake_redis.pttl(SCHEDULER_LEASE_KEY) > 29_000
+
+    assert not release_scheduler_lease("worker-b")
+    assert fake_redis.get(SCHEDULER_LEASE_KEY) == "worker-a"
+    assert release_scheduler_lease("worker-a")
+    assert fake_redis.get(SCHEDULER_LEASE_KEY) is None
+    assert not release_scheduler_lease("worker-a")
+    assert hold_scheduler_lease("worker-b", 10)
+
+
+def test_search_templates_filters_through_indexes(fake_redis) -> None:
+    def make(name: str, sla_ms: int, tags: list[str]):
+        return create_template(
+            ProbeTemplateCreate(
+                name=name, url="https://example.com/api", sla_ms=sla_ms, interval_seconds=120, tags=tags
+            )
+        )
+
+    checkout = make("Checkout API", 300, ["team:payments", "Prod"])
+    cart = make("Cart", 150, ["team:payments"])
+    search = make("Search", 800, ["prod"])
+
+    def names(**filters) -> list[str]:
+        templates, _ = search_templates(limit=10, **filters)
+        return [template.name for template in templates]
+
+    assert names() == ["Search", "Cart", "Checkout API"]
+    assert names(tags=["TEAM:payments"]) == ["Cart", "Checkout API"]
+    assert names(tags=["prod", "team:payments"]) == ["Checkout API"]
+    assert names(name_prefix="c") == ["Cart", "Checkout API"]
+    assert names(name_prefix="check", sla_max=300) == ["Checkout API"]
+    assert names(sla_min=200) == ["Search", "Checkout API"]
+
+    first, cursor = search_templates(limit=2)
+    rest, end = search_templates(limit=2, cursor=cursor)
+    assert [t.id for t in first + rest] == [search.id, cart.id, checkout.id]
+    assert end is None
+
+    update_template(cart.id, ProbeTemplateUpdate(name="Basket", tags=["team:growth"]))
+    delete_template(search.id)
+    assert names(name_prefix="c") == ["Checkout API"]
+    assert names(tags=["team:payments"]) == ["Checkout API"]
+    assert list_template_tags() == ["Prod", "team:growth", "team:payments"]
+
+
+def test_search_templates_backfills_indexes_once(fake_redis) -> None:
+    template = _make_template("Legacy")
+    for key in list(fake_redis.scan_iter(f"{TEMPLATE_TAG_KEY_PREFIX}:*")):
+        fake_redis.delete(key)
+    fake_redis.delete(TEMPLATE_CREATED_KEY, TEMPLATE_NAMES_KEY)
+
+    templates, _ = search_templates(name_prefix="leg", limit=5)
+    assert [item.id for item in templates] == [template.id]
+
+
+def test_template_cache_serves_current_versions_only(monkeypatch, fake_redis) -> None:
+    template = _make_template()
+    other = _make_template("Other")
+    decoded = []
+    original = storage_module._raw_to_template
+    monkeypatch.setattr(
+        storage_module, "_raw_to_template", lambda raw: decoded.append(json.loads(raw)["id"]) or original(raw)
+    )
+
+    first = get_template(template.id)
+    assert get_template(template.id) is first
+    assert [item.id for item in get_templates([other.id, template.id, "missing"])] == [other.id, template.id]
+    assert decoded == [template.id, other.id]
+
+    # Another process rewrote the template: its version moved on.
+    fake_redis.hincrby(TEMPLATE_VERSIONS_KEY, template.id, 1)
+    assert get_template(template.id) is not first
+    assert decoded == [template.id, other.id, template.id]
+
+    update_template(template.id, ProbeTemplateUpdate(sla_ms=900))
+    assert get_template(template.id).sla_ms == 900
+    assert delete_template(template.id)
+    assert get_template(template.id) is None
+
+
+def test_history_round_trips_through_compact_encoding(fake_redis) -> None:
+    template = _make_template()
+    summary = _live_summary(template.id)
+
+    recorded = record_probe_result(summary)
+
+    raw = fake_redis.lrange(_history_key(template.id), 0, 0)[0]
+    assert json.loads(raw)["v"] == 2
+    assert len(raw) < len(json.dumps(recorded.model_dump(mode="json")))
+    (entry,) = list_history(template.id)
+    assert entry.recorded_at == recorded.recorded_at
+    assert entry.summary.model_dump() == summary.model_dump()
+
+    (points,) = list_history_points(template.id)
+    assert points.latencies == [123.456, 410.0, 30000.0]
+    assert points.breaches == [False, True, True]
+    assert points.timestamps == [sample.timestamp for sample in summary.samples]
+
+
+def test_legacy_history_entries_still_decode(fake_redis) -> None:
+    template = _make_template()
+    legacy = ProbeHistoryEntry(template_id=template.id, recorded_at=utcnow(), summary=_live_summary(template.id))
+    fake_redis.lpush(_history_key(template.id), json.dumps(legacy.model_dump(mode="json")))
+    record_probe_result(_live_summary(template.id))
+
+    history = list_history(template.id)
+    assert len(history) == 2
+    assert history[1].summary.model_dump() == legacy.summary.model_dump()
+
+    heatmap = build_heatmap(template.id, columns=3)
+    assert [cell.latency_ms for row in heatmap.rows for cell in row] == [123.456, 410.0, 30000.0] * 2
+
+
+def test_wide_runs_keep_every_breach_bit(fake_redis) -> None:
+    template = _make_template()
+    latencies = [100.0 if index % 3 else 500.0 for index in range(80)]
+    record_probe_result(_summary_at(template.id, utcnow(), latencies))
+
+    (entry,) = list_history(template.id)
+    assert [sample.breach for sample in entry.summary.samples] == [latency > 200 for latency in latencies]
+    assert entry.summary.breach_count == 27
+
+
+def test_codec_backends_read_each_others_records() -> None:
+    record = {"id": "t-1", "name": "Caf\u00e9", "next_run_at": None, "l": [1.5, 2]}
+    backends = [codec._select(name) for name in ("json", "orjson", "msgspec")]
+    for _, dumps, _ in backends:
+        raw = dumps(record)
+        assert '"next_run_at":null' in raw
+        for _, _, loads in backends:
+            assert loads(raw) == json.loads(raw)
+
+
+def _summary_at(template_id: str, timestamp, latencies) -> ProbeExecutionSummary:
+    samples = [
+        ProbeExecutionSample(attempt=index + 1, timestamp=timestamp, latency_ms=latency, breach=latency > 200)
+        for index, latency in enumerate(latencies)
+    ]
+    return ProbeExecutionSummary.from_samples(template_id=template_id, template_name="API", sla_ms=200, samples=samples)
+
+
+def test_latency_percentiles_merge_sketches_over_window(fake_redis) -> None:
+    template = _make_template()
+    now = utcnow().replace(second=0, microsecond=0)
+    for minutes_ago in range(0, 180, 10):
+        latencies = [100.0 + minutes_ago, 150.0, 300.0]
+        record_probe_result(_summary_at(template.id, now - timedelta(minutes=minutes_ago), latencies))
+
+    recent = latency_percentiles(template.id, now - timedelta(minutes=30), now + timedelta(minutes=1), now=now)
+    assert recent.sample_count == 12
+    assert recent.breach_count == 4
+    assert abs(recent.p99_ms - 300.0) <= 3.0
+
+    whole = latency_percentiles(template.id, now - timedelta(days=1), now + timedelta(minutes=1), now=now)
+    assert whole.sample_count == 54
+    assert abs(whole.p50_ms - 180.0) <= 1.8
+
+    # A window ending mid-second still covers the bucket that second falls in.
+    partial = latency_percentiles(template.id, now - timedelta(minutes=1), now + timedelta(milliseconds=500), now=now)
+    assert partial.sample_count == 3
+
+    assert delete_template(template.id)
+    empty = latency_percentiles(template.id, now - timedelta(days=1), now, now=now)
+    assert empty.sample_count == 0
+    assert empty.p50_ms is None
+
+
+def test_delete_template_removes_sketches_without_a_keyspace_scan(monkeypatch, fake_redis) -> None:
+    doomed, kept = _make_template(), _make_template()
+    for template in (doomed, kept):
+        record_probe_result(_summary_at(template.id, utcnow(), [100.0, 150.0]))
+    sketch_keys = f"{storage_module.SKETCH_KEY_PREFIX}:{{}}:*"
+
+    def _no_scan(*args, **kwargs):
+        raise AssertionError("deleting a template must not scan the keyspace")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(fake_redis, "scan_iter", _no_scan)
+        assert delete_template(doomed.id)
+
+    assert list(fake_redis.scan_iter(sketch_keys.format(doomed.id))) == []
+    assert not fake_redis.exists(storage_module._sketch_index_key(doomed.id))
+    assert len(list(fake_redis.scan_iter(sketch_keys.format(kept.id)))) == 3
+
+
+def test_sketch_plan_stays_bounded_for_long_windows() -> None:
+    now = 1_700_000_000
+    keys = _plan_sketch_buckets("t", now - 30 * 86_400 + 17, now + 1, now)
+    assert len(keys) < 30 + 2 * 24 + 2 * 60
+    assert any(":day:" in key for key in keys)
+    # Minute buckets that old have expired, so the ragged start falls back to hours.
+    assert ":hour:" in keys[0]
+    assert ":minute:" in keys[-1]
+
+
+def test_rollup_heatmap_buckets_history_and_stays_bounded(fake_redis) -> None:
+    template = _make_template()
+    now = utcnow().replace(minute=0, second=0, microsecond=0)
+    for hours_ago in range(6):
+        timestamp = now - timedelta(hours=hours_ago, minutes=-5)
+        record_probe_result(_summary_at(template.id, timestamp, [100.0, 120.0, 250.0 if hours_ago == 2 else 140.0]))
+
+    heatmap = build_rollup_heatmap(
+        template.id, now - timedelta(hours=6), now + timedelta(hours=1), bucket_seconds=3600, columns=4, now=now
+    )
+    cells = [cell for row in heatmap.rows for cell in row]
+    assert heatmap.bucket_seconds == 3600
+    assert len(cells) == 6
+    assert [cell.sample_count for cell in cells] == [3] * 6
+    assert [cell.breach for cell in cells] == [False, False, False, True, False, False]
+    assert abs(cells[0].latency_ms - 120.0) <= 1.2
+    assert [len(row) for row in heatmap.rows] == [4, 2]
+
+    month = build_rollup_heatmap(template.id, now - timedelta(days=30), now + timedelta(hours=1), now=now)
+    assert month.bucket_seconds == 21_600
+    assert sum(len(row) for row in month.rows) <= MAX_ROLLUP_HEATMAP_CELLS
+    assert sum(cell.sample_count for row in month.rows for cell in row) == 18
+
+
+def test_rollup_heatmap_falls_back_once_fine_sketches_expire(fake_redis) -> None:
+    template = _make_template()
+    now = utcnow().replace(minute=0, second=0, microsecond=0)
+    for recorded_at in (now - timedelta(days=2, hours=12), now - timedelta(hours=1)):
+        record_probe_result(_summary_at(template.id, recorded_at + timedelta(minutes=20), [100.0, 250.0]))
+
+    start, end = now - timedelta(days=3), now + timedelta(hours=1)
+    heatmap = build_rollup_heatmap(template.id, start, end, bucket_seconds=900, now=now)
+    cells = [cell for row in heatmap.rows for cell in row]
+    assert heatmap.bucket_seconds == 900
+    # The older run's minute sketches are past retention; its hour bucket fills in, once.
+    assert [cell.sample_count for cell in cells] == [2, 2]
+    assert cells[0].timestamp == now - timedelta(days=2, hours=12)
+    assert cells[1].timestamp == now - timedelta(minutes=45)
+    assert sum(cell.sample_count for cell in cells) == latency_percentiles(template.id, start, end, now=now).sample_count
+
+
+def test_replay_log_trims_whole_runs_and_backfills_history(monkeypatch, fake_redis) -> None:
+    template = _make_template()
+    hour_ago = utcnow() - timedelta(hours=1)
+    older = ProbeHistoryEntry(
+        template_id=template.id, recorded_at=hour_ago, summary=_summary_at(template.id, hour_ago, [90.0])
+    )
+    fake_redis.lpush(_history_key(template.id), storage_module._dump(encode_entry(older)))
+    record_probe_result(_summary_at(template.id, utcnow(), [100.0, 250.0]))
+    record_probe_result(_summary_at(template.id, utcnow(), [110.0, 115.0]))
+
+    # Runs recorded within the same second stay separate; history older than the log is replayed too.
+    log = load_replay_log(template.id)
+    assert log.run_count == 3
+    assert log.latencies == [90.0, 100.0, 250.0, 110.0, 115.0]
+    recent = load_replay_log(template.id, start=utcnow() - timedelta(minutes=5))
+    assert (recent.run_count, recent.latencies) == (2, [100.0, 250.0, 110.0, 115.0])
+
+    monkeypatch.setattr(storage_module, "REPLAY_LOG_MAX_SAMPLES", 4)
+    record_probe_result(_summary_at(template.id, utcnow(), [120.0, 130.0, 140.0]))
+    assert fake_redis.strlen(storage_module._replay_log_key(template.id)) == 4 * storage_module.RECORD_CHARS
+    # The trimmed run's leftover sample has no timestamp and is dropped rather than misattributed.
+    trimmed = load_replay_log(template.id, start=utcnow() - timedelta(minutes=5))
+    assert (trimmed.run_count, trimmed.latencies) == (1, [120.0, 130.0, 140.0])
+
+    assert delete_template(template.id)
+    assert not fake_redis.exists(storage_module._replay_log_key(template.id))
+
+
+def test_replay_log_drops_runs_past_the_raw_tier(fake_redis) -> None:
+    template = _make_template()
+    key = storage_module._replay_log_key(template.id)
+    now = utcnow()
+    expired = now - timedelta(seconds=storage_module.RETENTION["raw"] * 1.1)
+    trimmed_run = encode_samples(expired, _summary_at(template.id, expired, [90.0, 95.0]).samples)
+    fake_redis.append(key, trimmed_run[storage_module.RECORD_CHARS :])
+    fake_redis.append(key, encode_samples(expired, _summary_at(template.id, expired, [80.0]).samples))
+    kept = now - timedelta(hours=1)
+    fake_redis.append(key, encode_samples(kept, _summary_at(template.id, kept, [70.0]).samples))
+
+    record_probe_result(_summary_at(template.id, now, [100.0]))
+
+    # The leftover of a trimmed run goes with the expired run after it.
+    assert fake_redis.strlen(key) == 2 * storage_module.RECORD_CHARS
+    assert load_replay_log(template.id).latencies == [70.0, 100.0]
+
+
+def test_drift_detector_flags_regression_before_sla_breach(monkeypatch, fake_redis) -> None:
+    template = _make_template()
+    for _ in range(12):
+        record_probe_result(_summary_at(template.id, utcnow(), [98.0, 102.0]))
+    steady = get_drift_state(template.id)
+    assert (steady.status, steady.runs, steady.baseline_ms) == ("stable", 12, 100.0)
+
+    def _no_history(*args, **kwargs):
+        raise AssertionError("drift detection must not rescan history")
+
+    monkeypatch.setattr(storage_module, "list_history", _no_history)
+    # Still well within the 200 ms SLA, so no sample breaches.
+    statuses = []
+    for _ in range(3):
+        record_probe_result(_summary_at(template.id, utcnow(), [150.0, 160.0]))
+        statuses.append(get_drift_state(template.id).status)
+    assert statuses == ["stable", "regressing", "regressing"]
+    drifting = get_drift_state(template.id)
+    assert drifting.regression_score > 1.0
+    assert drifting.latest_ms == 155.0
+    assert drifting.since is not None
+    assert fake_redis.scard(storage_module.REGRESSING_TEMPLATES_KEY) == 1
+
+    # Runs without a successful sample carry no latency signal.
+    failed = _summary_at(template.id, utcnow(), [50.0])
+    failed.samples[0].error = "connect timeout"
+    record_probe_result(failed)
+    assert get_drift_state(template.id).runs == 15
+
+    assert delete_template(template.id)
+    assert get_drift_state(template.id).status == "learning"
+    assert fake_redis.scard(storage_module.REGRESSING_TEMPLATES_KEY) == 0
+
+
+def test_history_export_streams_log_in_slices_after_older_history(fake_redis) -> None:
+    template = _make_template()
+    hour_ago = utcnow() - timedelta(hours=1)
+    older = ProbeHistoryEntry(
+        template_id=template.id, recorded_at=hour_ago, summary=_summary_at(template.id, hour_ago, [90.0])
+    )
+    fake_redis.lpush(_history_key(template.id), storage_module._dump(encode_entry(older)))
+    record_probe_result(_summary_at(template.id, utcnow(), [100.0, 200.0, 300.0]))
+    failing = _summary_at(template.id, utcnow(), [400.0, 500.0])
+    failing.samples[1].status_code = 503
+    record_probe_result(failing)
+
+    exported = [
+        (sample.attempt, sample.latency_ms, sample.failed)
+        for sample in iter_history_samples(template.id, chunk_records=2)
+    ]
+    assert exported == [
+        (1, 90.0, False),
+        (1, 100.0, False),
+        (2, 200.0, False),
+        (3, 300.0, False),
+        (1, 400.0, False),
+        (2, 500.0, True),
+    ]
+    oldest = next(iter_history_samples(template.id))
+    assert (oldest.recorded_at, oldest.sampled_at_ms) == (int(hour_ago.timestamp()), round(hour_ago.timestamp() * 1000))
+
+    recent = list(iter_history_samples(template.id, start=utcnow() - timedelta(minutes=5), chunk_records=4))
+    assert [sample.latency_ms for sample in recent] == [100.0, 200.0, 300.0, 400.0, 500.0]
+    assert list(iter_history_samples(template.id, end=hour_ago - timedelta(minutes=1))) == []
+
+
+def test_retention_tiers_parse_over_defaults() -> None:
+    retention = parse_retention("raw=6h, minute=90m,day=1000")
+    assert retention == {"raw": 21_600, "minute": 5_400, "hour": 35 * 86_400, "day": 1000}
+    for spec in ("week=2d", "raw=soon", "hour=0"):
+        with pytest.raises(ValueError):
+            parse_retention(spec)
+
+
+def test_history_compacts_past_raw_tier_while_sketches_keep_aggregates(monkeypatch, fake_redis) -> None:
+    monkeypatch.setitem(storage_module.RETENTION, "raw", 2 * 3600)
+    template = _make_template()
+    now = utcnow()
+    for hours_ago in (5, 4, 3, 1, 0):
+        recorded_at = now - timedelta(hours=hours_ago)
+        monkeypatch.setattr(storage_module, "utcnow", lambda recorded_at=recorded_at: recorded_at)
+        record_probe_result(_summary_at(template.id, recorded_at, [100.0 + hours_ago]))
+
+    history = list_history(template.id)
+    assert [entry.recorded_at for entry in history] == [now, now - timedelta(hours=1)]
+    window = latency_percentiles(template.id, now - timedelta(hours=6), now + timedelta(minutes=1), now=now)
+    assert window.sample_count == 5
+
+    key = _history_key(template.id)
+    later = now + timedelta(minutes=90)
+    assert storage_module._compact_history(fake_redis, key, fake_redis.lindex(key, -1), later) == 1
+    # A writer that lost the race leaves the list alone.
+    script = fake_redis.register_script(storage_module.COMPACT_HISTORY_SCRIPT)
+    assert script(keys=[key], args=[1, "stale"]) == 0
+    assert len(list_history(template.id)) == 1
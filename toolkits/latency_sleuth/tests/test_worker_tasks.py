@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import threading
+import time
 from datetime import timedelta
 
 from toolkit_runtime import jobs as job_store
 
+from toolkits.latency_sleuth.backend.app import _job_event_stream
+from toolkits.latency_sleuth.backend.job_events import job_event_hub
 from toolkits.latency_sleuth.backend.models import ProbeTemplateCreate, utcnow
 from toolkits.latency_sleuth.backend.storage import (
     create_template,
+    get_active_jobs,
     get_template,
+    is_job_cancellation_requested,
     list_history,
+    pop_notifications,
+    request_job_cancellation,
+    set_active_job,
 )
 from toolkits.latency_sleuth.worker import tasks
+from toolkits.latency_sleuth.worker.progress import ProgressReporter
 
 
 def _make_template() -> str:
@@ -27,6 +39,11 @@ def _make_template() -> str:
     return template.id
 
 
+def _event_data(event: str) -> dict:
+    assert event.startswith("event: delta\n")
+    return json.loads(event.split("data: ", 1)[1])
+
+
 def test_handle_run_probe_success(fake_redis) -> None:
     template_id = _make_template()
     job = job_store.create_job(
@@ -45,6 +62,40 @@ def test_handle_run_probe_success(fake_redis) -> None:
     assert len(history) == 1
     assert history[0].summary.template_id == template_id
 
+    (event,) = pop_notifications(10)
+    assert (event.channel, event.target, event.kind) == ("email", "ops@example.com", "breach")
+    assert any("Notifications queued for: email (breach)" in line["message"] for line in result["logs"])
+
+
+def test_notified_channels_follow_queued_alerts(fake_redis) -> None:
+    template_id = _make_template()
+    results = []
+    for _ in range(2):
+        job = job_store.create_job(
+            "latency-sleuth",
+            "run_probe",
+            {"template_id": template_id, "sample_size": 1, "latency_overrides": [250]},
+        )
+        results.append(tasks._handle_run_probe(job)["result"])
+
+    # The breach rule fires when the streak starts, not on every breaching run.
+    assert [result["notified_channels"] for result in results] == [["email"], []]
+    assert [entry.summary.notified_channels for entry in list_history(template_id)] == [[], ["email"]]
+
+
+def test_handle_run_probe_clears_active_job(fake_redis) -> None:
+    template_id = _make_template()
+    job = job_store.create_job(
+        "latency-sleuth",
+        "run_probe",
+        {"template_id": template_id, "sample_size": 1, "latency_overrides": [50]},
+    )
+    set_active_job(template_id, job["id"])
+
+    tasks._handle_run_probe(job)
+
+    assert get_active_jobs([template_id]) == {}
+
 
 def test_handle_run_probe_honours_cancellation(monkeypatch, fake_redis) -> None:
     template_id = _make_template()
@@ -75,6 +126,142 @@ def test_handle_run_probe_honours_cancellation(monkeypatch, fake_redis) -> None:
     assert history == []
 
 
+def test_handle_run_probe_stops_on_cancel_signal(fake_redis) -> None:
+    template_ids = [_make_template() for _ in range(2)]
+    single = job_store.create_job(
+        "latency-sleuth", "run_probe", {"template_id": template_ids[0], "sample_size": 2}
+    )
+    batch = job_store.create_job(
+        "latency-sleuth", "run_probe_batch", {"template_ids": template_ids, "sample_size": 2}
+    )
+    request_job_cancellation(single["id"])
+    request_job_cancellation(batch["id"])
+
+    assert tasks._handle_run_probe(single)["status"] == "cancelled"
+    assert tasks._handle_run_probe_batch(batch)["status"] == "cancelled"
+
+    assert all(list_history(template_id) == [] for template_id in template_ids)
+    assert not is_job_cancellation_requested(single["id"])
+    assert not is_job_cancellation_requested(batch["id"])
+
+
+def test_platform_cancel_stops_in_flight_live_probe(fake_redis, http_server) -> None:
+    template = create_template(
+        ProbeTemplateCreate(name="Hang", url=f"{http_server}/hang", sla_ms=200, interval_seconds=120)
+    )
+    job = job_store.create_job(
+        "latency-sleuth", "run_probe", {"template_id": template.id, "sample_size": 2, "mode": "live"}
+    )
+
+    def cancel_from_platform() -> None:
+        time.sleep(0.1)
+        job_store.mark_cancelling(job_store.get_job(job["id"]), "Operator requested cancellation")
+
+    canceller = threading.Thread(target=cancel_from_platform)
+    started = time.monotonic()
+    canceller.start()
+    result = tasks._handle_run_probe(job)
+    canceller.join()
+
+    assert result["status"] == "cancelled"
+    assert time.monotonic() - started < 0.9
+    assert list_history(template.id) == []
+
+
+def test_handle_run_probe_writes_do_not_scale_with_samples(monkeypatch, fake_redis) -> None:
+    template_id = _make_template()
+    job = job_store.create_job(
+        "latency-sleuth",
+        "run_probe",
+        {"template_id": template_id, "sample_size": 60, "latency_overrides": [50] * 60},
+    )
+    calls = {"get": 0, "save": 0}
+    original_get, original_save = job_store.get_job, job_store.save_job
+
+    def counting_get(job_id):
+        calls["get"] += 1
+        return original_get(job_id)
+
+    def counting_save(record, *args, **kwargs):
+        calls["save"] += 1
+        return original_save(record, *args, **kwargs)
+
+    monkeypatch.setattr(job_store, "get_job", counting_get)
+    monkeypatch.setattr(job_store, "save_job", counting_save)
+
+    result = tasks._handle_run_probe(job)
+
+    assert result["status"] == "succeeded"
+    assert len([entry for entry in result["logs"] if entry["message"].startswith("Attempt")]) == 60
+    # Start, two count-triggered flushes, the pre-record checkpoint and the final write.
+    assert calls["save"] <= 6
+    assert calls["get"] <= 6
+
+
+def test_progress_reporter_flushes_on_interval(fake_redis) -> None:
+    job = job_store.create_job("latency-sleuth", "run_probe", {})
+    now = {"value": 0.0}
+    reporter = ProgressReporter(job, flush_interval=5.0, max_pending=100, clock=lambda: now["value"])
+
+    reporter.log("first")
+    reporter.progress(40)
+    assert job_store.get_job(job["id"])["logs"] == []
+
+    now["value"] = 6.0
+    reporter.log("second")
+    stored = job_store.get_job(job["id"])
+    assert [entry["message"] for entry in stored["logs"]] == ["first", "second"]
+    assert stored["progress"] == 40
+
+
+def test_progress_reporter_preserves_cancellation(fake_redis) -> None:
+    job = job_store.create_job("latency-sleuth", "run_probe", {})
+    reporter = ProgressReporter(job)
+    job_store.mark_cancelling(job_store.get_job(job["id"]), "Operator requested cancellation")
+
+    reporter.log("still running")
+    reporter.flush()
+
+    stored = job_store.get_job(job["id"])
+    assert reporter.cancel_requested
+    assert stored["status"] == "cancelling"
+    assert [entry["message"] for entry in stored["logs"]] == ["Operator requested cancellation", "still running"]
+
+
+def test_progress_reporter_streams_deltas_to_job_events(fake_redis) -> None:
+    job = job_store.create_job("latency-sleuth", "run_probe", {})
+
+    async def _stream() -> None:
+        stream, other = _job_event_stream(job["id"]), _job_event_stream(job["id"])
+        for opened in (stream, other):
+            assert (await opened.__anext__()).startswith("event: snapshot\n")
+        # Every open stream is served by one pattern subscription.
+        assert fake_redis.pubsub_numpat() == 1
+
+        reporter = ProgressReporter(job, flush_interval=60)
+        reporter.log("sample 1")
+        reporter.progress(50)
+        reporter.flush()
+        delta = _event_data(await asyncio.wait_for(stream.__anext__(), timeout=5))
+        assert delta["log_offset"] == 0
+        assert [entry["message"] for entry in delta["logs"]] == ["sample 1"]
+        assert delta["progress"] == 50
+        assert _event_data(await asyncio.wait_for(other.__anext__(), timeout=5)) == delta
+        await other.aclose()
+
+        reporter.finish("succeeded", result={"ok": True}, message="done")
+        final = _event_data(await asyncio.wait_for(stream.__anext__(), timeout=5))
+        assert final["log_offset"] == 1
+        assert final["status"] == "succeeded"
+        assert final["result"] == {"ok": True}
+        assert [event async for event in stream] == []
+
+    asyncio.run(_stream())
+    # The last stream closing releases the shared subscription.
+    assert job_event_hub._queues == {}
+    assert job_event_hub._subscription is None
+
+
 class _DummyAsyncResult:
     def __init__(self, task_id: str) -> None:
         self.id = task_id
@@ -83,6 +270,7 @@ class _DummyAsyncResult:
 class _DummyCelery:
     def __init__(self) -> None:
         self.sent = []
+        self.options = []
         self._counter = 0
         self.tasks = {}
 
@@ -90,6 +278,7 @@ class _DummyCelery:
         self._counter += 1
         task_id = f"task-{self._counter}"
         self.sent.append((name, args, kwargs))
+        self.options.append(options)
         return _DummyAsyncResult(task_id)
 
 
@@ -125,6 +314,7 @@ def test_scheduler_dispatches_due_template(fake_redis) -> None:
 
     tasks._dispatch_due_probes(celery)
     assert len(celery.sent) == 1
+    assert get_active_jobs([template_id]) == {template_id: jobs[0]["id"]}
 
 
 def test_scheduler_skips_when_job_active(fake_redis) -> None:
@@ -138,6 +328,7 @@ def test_scheduler_skips_when_job_active(fake_redis) -> None:
     )
     active_job["status"] = "running"
     job_store.save_job(active_job)
+    set_active_job(template_id, active_job["id"])
 
     before = get_template(template_id)
     assert before is not None
@@ -172,3 +363,135 @@ def test_scheduler_resubmits_stale_job(fake_redis) -> None:
     assert reloaded is not None
     assert reloaded.get("celery_task_id") == "task-1"
     assert any("Resubmitted" in entry["message"] for entry in reloaded.get("logs", []))
+
+
+def test_scheduler_ignores_finished_active_job(fake_redis) -> None:
+    template_id = _make_template()
+    celery = _DummyCelery()
+
+    finished = job_store.create_job("latency-sleuth", "run_probe", {"template_id": template_id})
+    finished["status"] = "succeeded"
+    job_store.save_job(finished)
+    set_active_job(template_id, finished["id"])
+
+    tasks._dispatch_due_probes(celery)
+
+    assert len(celery.sent) == 1
+    assert get_active_jobs([template_id]) != {template_id: finished["id"]}
+
+
+def test_scheduler_spreads_burst_of_due_templates(monkeypatch, fake_redis) -> None:
+    monkeypatch.setattr(tasks, "SCHEDULE_BATCH_SIZE", 1)
+    for _ in range(3):
+        _make_template()
+    celery = _DummyCelery()
+
+    tasks._dispatch_due_probes(celery)
+
+    assert len(celery.sent) == 3
+    countdowns = [options.get("countdown", 0) for options in celery.options]
+    assert all(0 <= countdown <= tasks._jitter_window(3) for countdown in countdowns)
+
+
+def test_scheduler_groups_due_templates_into_batches(monkeypatch, fake_redis) -> None:
+    monkeypatch.setattr(tasks, "SCHEDULE_BATCH_SIZE", 2)
+    template_ids = [_make_template() for _ in range(3)]
+    celery = _DummyCelery()
+
+    tasks._dispatch_due_probes(celery)
+
+    assert len(celery.sent) == 2
+    jobs, _ = job_store.list_jobs(toolkits=["latency-sleuth"])
+    types = sorted(job["type"] for job in jobs)
+    assert types == ["latency-sleuth.run_probe", "latency-sleuth.run_probe_batch"]
+    batch = next(job for job in jobs if job["type"] == "latency-sleuth.run_probe_batch")
+    assert len(batch["payload"]["template_ids"]) == 2
+    active = get_active_jobs(template_ids)
+    assert set(active) == set(template_ids)
+    assert [active[template_id] for template_id in batch["payload"]["template_ids"]] == [batch["id"]] * 2
+
+
+def test_active_templates_read_each_batch_job_once(monkeypatch, fake_redis) -> None:
+    template_ids = [_make_template() for _ in range(5)]
+    running = job_store.create_job("latency-sleuth", "run_probe_batch", {"template_ids": template_ids[:3]})
+    running["status"] = "running"
+    job_store.save_job(running)
+    finished = job_store.create_job("latency-sleuth", "run_probe_batch", {"template_ids": template_ids[3:]})
+    finished["status"] = "succeeded"
+    job_store.save_job(finished)
+    for template_id in template_ids:
+        set_active_job(template_id, running["id"] if template_id in template_ids[:3] else finished["id"])
+    reads = []
+    get_job = job_store.get_job
+    monkeypatch.setattr(job_store, "get_job", lambda job_id: reads.append(job_id) or get_job(job_id))
+
+    assert tasks._active_template_ids(template_ids) == set(template_ids[:3])
+    assert sorted(reads) == sorted([running["id"], finished["id"]])
+    assert set(get_active_jobs(template_ids)) == set(template_ids[:3])
+
+
+def test_handle_run_probe_batch_records_each_template(fake_redis) -> None:
+    template_ids = [_make_template() for _ in range(3)]
+    job = job_store.create_job(
+        "latency-sleuth",
+        "run_probe_batch",
+        {"template_ids": [*template_ids, "missing"], "sample_size": 2},
+    )
+    for template_id in template_ids:
+        set_active_job(template_id, job["id"])
+
+    result = tasks._handle_run_probe_batch(job)
+
+    assert result["status"] == "succeeded"
+    assert result["progress"] == 100
+    assert result["result"]["probed"] == 3
+    assert {summary["template_id"] for summary in result["result"]["summaries"]} == set(template_ids)
+    for template_id in template_ids:
+        assert len(list_history(template_id)) == 1
+    assert get_active_jobs(template_ids) == {}
+    assert any("Skipped 1 template" in entry["message"] for entry in result["logs"])
+
+
+def test_next_tick_delay_tracks_earliest_run(fake_redis) -> None:
+    template_id = _make_template()
+    now = utcnow()
+
+    assert tasks._next_tick_delay(now=now) == tasks.SCHEDULE_MAX_SLEEP_SECONDS
+
+    tasks._dispatch_due_probes(_DummyCelery(), now=now)
+    template = get_template(template_id)
+    assert template is not None
+
+    soon = template.next_run_at - timedelta(seconds=5)
+    assert abs(tasks._next_tick_delay(now=soon) - 5) < 0.01
+    assert tasks._next_tick_delay(now=template.next_run_at - timedelta(hours=1)) == tasks.SCHEDULE_MAX_SLEEP_SECONDS
+
+
+def test_scheduler_tick_only_dispatches_from_leader(monkeypatch, fake_redis) -> None:
+    _make_template()
+    leader_celery = _DummyCelery()
+    standby_celery = _DummyCelery()
+
+    monkeypatch.setattr(tasks, "_is_leader", False)
+    monkeypatch.setattr(tasks, "_scheduler_owner", "worker-a")
+    assert tasks._scheduler_tick(leader_celery) <= tasks.SCHEDULER_RENEW_SECONDS
+    assert tasks._is_leader is True
+
+    monkeypatch.setattr(tasks, "_is_leader", False)
+    monkeypatch.setattr(tasks, "_scheduler_owner", "worker-b")
+    assert tasks._scheduler_tick(standby_celery) == tasks.SCHEDULER_RENEW_SECONDS
+    assert tasks._is_leader is False
+
+    assert len(leader_celery.sent) == 1
+    assert standby_celery.sent == []
+
+
+def test_released_lease_fails_over_to_standby(monkeypatch, fake_redis) -> None:
+    monkeypatch.setattr(tasks, "_is_leader", False)
+    monkeypatch.setattr(tasks, "_scheduler_owner", "worker-a")
+    assert tasks._refresh_leadership()
+
+    tasks._release_leadership()
+
+    monkeypatch.setattr(tasks, "_scheduler_owner", "worker-b")
+    assert tasks._refresh_leadership()
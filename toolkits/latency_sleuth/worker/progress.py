@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from toolkit_runtime import jobs as job_store
+
+try:
+    from ..backend.storage import publish_job_event
+except ImportError:  # pragma: no cover - toolkit runtime import path
+    from backend.storage import publish_job_event
+
+JobRecord = Dict[str, Any]
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_FLUSH_MAX_PENDING = 25
+DEFAULT_STATUS_POLL_SECONDS = 0.25
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """Buffer job log lines and progress, persisting them in batches.
+
+    Each flush costs one read and one write regardless of how many lines were
+    buffered. The stored record is authoritative for status and existing logs,
+    so a cancellation recorded on the job is picked up (and never overwritten)
+    at the next flush. Between flushes :attr:`cancel_requested` consults the
+    cheaper *cancel_check* signal and re-reads the record at most every
+    *status_poll_interval* seconds, since the platform's cancel path only
+    marks the record. Every write is also
+    published as a delta for ``/jobs/{job_id}/events`` subscribers.
+    """
+
+    def __init__(
+        self,
+        job: JobRecord,
+        *,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = DEFAULT_FLUSH_MAX_PENDING,
+        clock: Callable[[], float] = time.monotonic,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        status_poll_interval: float = DEFAULT_STATUS_POLL_SECONDS,
+    ) -> None:
+        self.job = job
+        self.flush_interval = flush_interval
+        self.max_pending = max(max_pending, 1)
+        self._clock = clock
+        self._pending: List[Dict[str, str]] = []
+        self._progress: int | None = None
+        self._last_flush = clock()
+        self._cancel_check = cancel_check
+        self._cancelled = job.get("status") == "cancelling"
+        self.status_poll_interval = status_poll_interval
+        self._last_status_read = self._last_flush
+
+    @property
+    def cancel_requested(self) -> bool:
+        if not self._cancelled and self._cancel_check is not None and self._cancel_check():
+            self._cancelled = True
+        if not self._cancelled and self._clock() - self._last_status_read >= self.status_poll_interval:
+            current = job_store.get_job(self.job["id"])
+            self._last_status_read = self._clock()
+            self._cancelled = bool(current) and current.get("status") == "cancelling"
+        return self._cancelled
+
+    def log(self, message: str) -> None:
+        self._pending.append({"ts": datetime.now(timezone.utc).isoformat(), "message": message})
+        self._maybe_flush()
+
+    def progress(self, value: int) -> None:
+        self._progress = max(0, min(int(value), 100))
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if len(self._pending) >= self.max_pending or self._clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> JobRecord:
+        """Write buffered lines and progress, refreshing the cancellation flag."""
+
+        current = job_store.get_job(self.job["id"]) or self.job
+        if current.get("status") == "cancelling":
+            self._cancelled = True
+        logs = current.setdefault("logs", [])
+        offset = len(logs)
+        logs.extend(self._pending)
+        if self._progress is not None:
+            current["progress"] = self._progress
+        self.job = job_store.save_job(current) or current
+        self._publish(offset)
+        self._last_flush = self._last_status_read = self._clock()
+        return self.job
+
+    def finish(self, status: str, *, result: Any = None, message: str | None = None) -> JobRecord:
+        """Flush outstanding lines together with the job's terminal state."""
+
+        if message:
+            self._pending.append({"ts": datetime.now(timezone.utc).isoformat(), "message": message})
+        current = job_store.get_job(self.job["id"]) or self.job
+        logs = current.setdefault("logs", [])
+        offset = len(logs)
+        logs.extend(self._pending)
+        current["status"] = status
+        if status == "succeeded":
+            current["progress"] = 100
+            current["result"] = result
+        elif self._progress is not None:
+            current["progress"] = self._progress
+        self.job = job_store.save_job(current) or current
+        self._publish(offset, final=True)
+        return self.job
+
+    def _publish(self, offset: int, *, final: bool = False) -> None:
+        event: Dict[str, Any] = {
+            "log_offset": offset,
+            "logs": self._pending,
+            "progress": self.job.get("progress"),
+            "status": self.job.get("status"),
+        }
+        if final:
+            event["result"] = self.job.get("result")
+            event["error"] = self.job.get("error")
+        self._pending = []
+        self._progress = None
+        try:
+            publish_job_event(self.job["id"], event)
+        except Exception:  # pragma: no cover - streaming is best effort
+            logger.warning("latency-sleuth failed to publish job event for %s", self.job["id"], exc_info=True)
+
+
+__all__ = ["ProgressReporter"]
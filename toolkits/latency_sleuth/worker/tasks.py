@@ -1,32 +1,66 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import logging
+import os
+import random
+import socket
 import threading
 import time
 from datetime import datetime, timezone
 from typing import Any, Callable, Dict, Iterable, List, Sequence
+from uuid import uuid4
 
 from toolkit_runtime import jobs as job_store
 
+from .progress import ProgressReporter
+
 try:
     from ..backend.models import utcnow
-    from ..backend.probes import execute_probe
+    from ..backend.notifications import NotificationDispatcher, queue_notifications
+    from ..backend.probes import ProbeCancelled, execute_probe, execute_probes
     from ..backend.storage import (
         bootstrap_schedule,
+        clear_active_job,
+        clear_active_jobs,
+        clear_job_cancellation,
+        get_active_jobs,
         get_template,
-        list_due_templates,
+        get_templates,
+        hold_scheduler_lease,
+        index_job,
+        is_job_cancellation_requested,
+        list_due_template_ids,
+        next_due_at,
         record_probe_result,
-        reserve_template_for_run,
+        release_scheduler_lease,
+        reserve_templates_for_run,
+        set_active_job,
+        subscribe_schedule_changes,
     )
 except ImportError:  # pragma: no cover - toolkit runtime import path
     from backend.models import utcnow
-    from backend.probes import execute_probe
+    from backend.notifications import NotificationDispatcher, queue_notifications
+    from backend.probes import ProbeCancelled, execute_probe, execute_probes
     from backend.storage import (
         bootstrap_schedule,
+        clear_active_job,
+        clear_active_jobs,
+        clear_job_cancellation,
+        get_active_jobs,
         get_template,
-        list_due_templates,
+        get_templates,
+        hold_scheduler_lease,
+        index_job,
+        is_job_cancellation_requested,
+        list_due_template_ids,
+        next_due_at,
         record_probe_result,
-        reserve_template_for_run,
+        release_scheduler_lease,
+        reserve_templates_for_run,
+        set_active_job,
+        subscribe_schedule_changes,
     )
 
 JobPayload = Dict[str, Any]
@@ -34,13 +68,23 @@ JobRecord = Dict[str, Any]
 JobHandler = Callable[[JobRecord], JobRecord]
 
 
-SCHEDULE_INTERVAL_SECONDS = 30
+SCHEDULE_MAX_SLEEP_SECONDS = 30
+SCHEDULE_MIN_SLEEP_SECONDS = 0.05
+SCHEDULE_JITTER_PER_RUN_SECONDS = 0.05
+SCHEDULE_MAX_JITTER_SECONDS = 5.0
 DEFAULT_SCHEDULE_SAMPLE_SIZE = 3
+# Due templates are grouped into jobs of up to this many runs; 1 restores one job per template.
+SCHEDULE_BATCH_SIZE = max(int(os.getenv("LATENCY_SLEUTH_BATCH_SIZE", "200")), 1)
 STALE_JOB_GRACE_SECONDS = 120
+SCHEDULER_LEASE_SECONDS = 10
+SCHEDULER_RENEW_SECONDS = SCHEDULER_LEASE_SECONDS / 3
 
 _scheduler_registered = False
 _scheduler_thread: threading.Thread | None = None
 _scheduler_lock = threading.Lock()
+_scheduler_owner: str | None = None
+_is_leader = False
+_notifier_thread: threading.Thread | None = None
 
 logger = logging.getLogger(__name__)
 
@@ -60,16 +104,28 @@ def _normalise_overrides(payload: JobPayload) -> Sequence[float] | None:
     return result
 
 
-def _handle_run_probe(job: JobRecord) -> JobRecord:
-    payload = job.get("payload", {})
-    template_id = payload.get("template_id")
-    if not template_id:
-        raise ValueError("template_id is required")
+def _reporter(job: JobRecord) -> ProgressReporter:
+    job_id = job["id"]
+    return ProgressReporter(job, cancel_check=lambda: is_job_cancellation_requested(job_id))
+
+
+def _queue_notifications(template, summary) -> List[str]:
+    """Queue alerts for a finished run and list their channels on *summary*.
+
+    Called before the run is recorded so its history entry names the channels
+    actually alerted. Delivery failures never fail the probe.
+    """
+
+    try:
+        events = queue_notifications(template, summary)
+    except Exception:  # pragma: no cover - alerting is best effort
+        logger.warning("latency-sleuth failed to queue notifications for %s", template.id, exc_info=True)
+        events = []
+    summary.notified_channels = [event.channel for event in events]
+    return [f"{event.channel} ({event.kind})" for event in events]
 
-    template = get_template(template_id)
-    if not template:
-        raise ValueError(f"Probe template {template_id} not found")
 
+def _sample_size(payload: JobPayload) -> int:
     sample_size = payload.get("sample_size") or 3
     try:
         sample_size = int(sample_size)
@@ -77,89 +133,238 @@ def _handle_run_probe(job: JobRecord) -> JobRecord:
         raise ValueError("sample_size must be an integer") from exc
     if sample_size <= 0:
         raise ValueError("sample_size must be positive")
+    return sample_size
+
+
+def _handle_run_probe(job: JobRecord) -> JobRecord:
+    payload = job.get("payload", {})
+    template_id = payload.get("template_id")
+    if not template_id:
+        raise ValueError("template_id is required")
+
+    try:
+        return _run_probe(job, template_id)
+    finally:
+        clear_active_job(template_id, job["id"])
+        clear_job_cancellation(job["id"])
+
+
+def _run_probe(job: JobRecord, template_id: str) -> JobRecord:
+    payload = job.get("payload", {})
+    template = get_template(template_id)
+    if not template:
+        raise ValueError(f"Probe template {template_id} not found")
 
+    sample_size = _sample_size(payload)
     overrides = _normalise_overrides(payload)
 
-    job = job_store.append_log(job, f"Running latency probe '{template.name}' ({sample_size} samples)")
+    reporter = _reporter(job)
+    reporter.log(f"Running latency probe '{template.name}' ({sample_size} samples)")
+    reporter.flush()
 
-    summary = execute_probe(template, sample_size=sample_size, overrides=overrides)
+    try:
+        summary = execute_probe(
+            template,
+            sample_size=sample_size,
+            overrides=overrides,
+            mode=payload.get("mode"),
+            should_cancel=lambda: reporter.cancel_requested,
+        )
+    except ProbeCancelled:
+        return reporter.finish("cancelled", message="Probe cancellation requested; aborted in-flight requests")
 
     total_samples = max(len(summary.samples), 1)
     for idx, sample in enumerate(summary.samples, start=1):
-        current = job_store.get_job(job["id"])
-        if current and current.get("status") == "cancelling":
-            return job_store.mark_cancelled(current, "Probe cancellation requested; stopping remaining samples")
-
-        job["progress"] = int(idx / total_samples * 100)
-        job = job_store.append_log(
-            job,
-            f"Attempt {sample.attempt}: {sample.latency_ms:.2f} ms — {'BREACH' if sample.breach else 'OK'}",
-        )
-        job_store.save_job(job)
+        reporter.progress(int(idx / total_samples * 100))
+        reporter.log(f"Attempt {sample.attempt}: {sample.latency_ms:.2f} ms — {'BREACH' if sample.breach else 'OK'}")
+
+    # Last chance to honour a cancellation before the result becomes history.
+    reporter.flush()
+    if reporter.cancel_requested:
+        return reporter.finish("cancelled", message="Probe cancellation requested; discarding results")
 
+    queued = _queue_notifications(template, summary)
     record_probe_result(summary)
+    if queued:
+        reporter.log(f"Notifications queued for: {', '.join(queued)}")
 
-    if summary.notified_channels:
-        channels = ", ".join(summary.notified_channels)
-        job = job_store.append_log(job, f"Notifications dispatched to: {channels}")
+    return reporter.finish("succeeded", result=summary.model_dump(mode="json"))
 
-    job["status"] = "succeeded"
-    job["progress"] = 100
-    job["result"] = summary.model_dump(mode="json")
-    job_store.save_job(job)
-    return job
 
+def _handle_run_probe_batch(job: JobRecord) -> JobRecord:
+    payload = job.get("payload", {})
+    template_ids = payload.get("template_ids")
+    if not template_ids or not isinstance(template_ids, list):
+        raise ValueError("template_ids must be a non-empty list")
 
-def _has_active_job(template_id: str) -> bool:
-    candidates, _ = job_store.list_jobs(limit=200, toolkits=["latency-sleuth"])
-    for candidate in candidates:
-        if candidate.get("type") != "latency-sleuth.run_probe":
-            continue
-        payload = candidate.get("payload") or {}
-        if payload.get("template_id") != template_id:
-            continue
-        if candidate.get("status") not in job_store.TERMINAL_STATUSES:
-            return True
-    return False
+    try:
+        return _run_probe_batch(job, template_ids)
+    finally:
+        clear_active_jobs(template_ids, job["id"])
+        clear_job_cancellation(job["id"])
 
 
-def _dispatch_due_probes(celery_app, *, now=None) -> None:
-    timestamp = now or utcnow()
-    for template in list_due_templates(now=timestamp):
-        if _has_active_job(template.id):
-            continue
-        reserved = reserve_template_for_run(template.id, now=timestamp)
-        if not reserved:
-            continue
+def _run_probe_batch(job: JobRecord, template_ids: List[str]) -> JobRecord:
+    payload = job.get("payload", {})
+    sample_size = _sample_size(payload)
+    templates = get_templates(template_ids)
+
+    reporter = _reporter(job)
+    reporter.log(f"Running {len(templates)} latency probes as one batch ({sample_size} samples each)")
+    missing = len(template_ids) - len(templates)
+    if missing:
+        reporter.log(f"Skipped {missing} template(s) deleted before the batch started")
+    reporter.flush()
+
+    results: List[Dict[str, Any]] = []
+    failures = 0
+    discarded = 0
+    total = max(len(templates), 1)
+
+    def _on_result(template, outcome) -> None:
+        nonlocal failures, discarded
+        if reporter.cancel_requested:
+            discarded += 1
+        elif isinstance(outcome, Exception):
+            failures += 1
+            reporter.log(f"Probe '{template.name}' failed: {outcome}")
+        else:
+            _queue_notifications(template, outcome)
+            record_probe_result(outcome)
+            results.append(
+                {
+                    "template_id": outcome.template_id,
+                    "average_latency_ms": outcome.average_latency_ms,
+                    "breach_count": outcome.breach_count,
+                    "met_sla": outcome.met_sla,
+                    "notified_channels": list(outcome.notified_channels),
+                }
+            )
+            reporter.log(
+                f"Probe '{template.name}': {outcome.average_latency_ms:.2f} ms average — "
+                f"{outcome.breach_count} breach(es)"
+            )
+        reporter.progress(int((len(results) + failures + discarded) / total * 100))
+
+    try:
+        execute_probes(
+            templates,
+            sample_size,
+            mode=payload.get("mode"),
+            on_result=_on_result,
+            should_cancel=lambda: reporter.cancel_requested,
+        )
+    except ProbeCancelled:
+        pass
+
+    reporter.flush()
+    if reporter.cancel_requested:
+        return reporter.finish(
+            "cancelled",
+            message=f"Batch cancellation requested; recorded {len(results)} of {len(templates)} probes",
+        )
+    return reporter.finish(
+        "succeeded",
+        result={"probed": len(results), "failed": failures, "summaries": results},
+    )
+
+
+def _active_template_ids(template_ids: Sequence[str]) -> set[str]:
+    """Return the templates whose recorded job is still running.
+
+    Mappings left behind by jobs that finished without clearing them (for
+    example a crashed worker) are dropped as they are found.
+    """
+
+    by_job: Dict[str, List[str]] = {}
+    for template_id, job_id in get_active_jobs(template_ids).items():
+        by_job.setdefault(job_id, []).append(template_id)
+
+    # A batch job covers many templates, so each job is read once.
+    active: set[str] = set()
+    for job_id, job_template_ids in by_job.items():
+        job = job_store.get_job(job_id)
+        if job and job.get("status") not in job_store.TERMINAL_STATUSES:
+            active.update(job_template_ids)
+        else:
+            clear_active_jobs(job_template_ids, job_id)
+    return active
+
+
+def _submit_run_job(celery_app, job_id: str, *, countdown: float | None = None):
+    queue = getattr(getattr(celery_app, "conf", None), "task_default_queue", None) or "celery"
+    options: Dict[str, Any] = {"countdown": countdown} if countdown else {}
+    task = celery_app.tasks.get("worker.tasks.run_job")
+    if task is not None:
+        try:
+            return task.apply_async(args=[job_id], queue=queue, **options)
+        except TypeError:
+            return task.apply_async(args=[job_id], **options)
+    try:
+        return celery_app.send_task("worker.tasks.run_job", args=[job_id], queue=queue, **options)
+    except TypeError:  # pragma: no cover - defensive
+        return celery_app.send_task("worker.tasks.run_job", args=[job_id], **options)
+
+
+def _jitter_window(run_count: int) -> float:
+    """Spread a burst of simultaneous runs; a lone run starts immediately."""
+
+    return min(SCHEDULE_JITTER_PER_RUN_SECONDS * max(run_count - 1, 0), SCHEDULE_MAX_JITTER_SECONDS)
+
+
+def _batched(items: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _create_scheduled_job(templates) -> JobRecord:
+    if len(templates) == 1:
         job = job_store.create_job(
             "latency-sleuth",
             "run_probe",
             {
-                "template_id": template.id,
+                "template_id": templates[0].id,
                 "sample_size": DEFAULT_SCHEDULE_SAMPLE_SIZE,
                 "latency_overrides": None,
             },
         )
+    else:
+        job = job_store.create_job(
+            "latency-sleuth",
+            "run_probe_batch",
+            {
+                "template_ids": [template.id for template in templates],
+                "sample_size": DEFAULT_SCHEDULE_SAMPLE_SIZE,
+            },
+        )
+    index_job(job)
+    return job
+
+
+def _dispatch_due_probes(celery_app, *, now=None) -> None:
+    timestamp = now or utcnow()
+    due_ids = list_due_template_ids(now=timestamp)
+    active = _active_template_ids(due_ids)
+    candidates = [template_id for template_id in due_ids if template_id not in active]
+    reserved = reserve_templates_for_run(candidates, now=timestamp)
+    batches = list(_batched(reserved, SCHEDULE_BATCH_SIZE))
+    jitter_window = _jitter_window(len(batches))
+    for batch in batches:
+        template_ids = [template.id for template in batch]
+        job = _create_scheduled_job(batch)
+        for template_id in template_ids:
+            set_active_job(template_id, job["id"])
         job = job_store.append_log(job, "Scheduled run enqueued by Latency Sleuth interval")
-        queue = getattr(getattr(celery_app, "conf", None), "task_default_queue", None) or "celery"
+        countdown = random.uniform(0, jitter_window) if jitter_window else None
         try:
-            task = celery_app.tasks.get("worker.tasks.run_job")
-            if task is not None:
-                try:
-                    result = task.apply_async(args=[job["id"]], queue=queue)
-                except TypeError:
-                    result = task.apply_async(args=[job["id"]])
-            else:  # pragma: no cover - defensive
-                try:
-                    result = celery_app.send_task("worker.tasks.run_job", args=[job["id"]], queue=queue)
-                except TypeError:
-                    result = celery_app.send_task("worker.tasks.run_job", args=[job["id"]])
+            result = _submit_run_job(celery_app, job["id"], countdown=countdown)
         except Exception as exc:  # pragma: no cover - defensive guard
             job["status"] = "failed"
             job["error"] = str(exc)
             job_store.append_log(job, f"Error dispatching scheduled run: {exc}")
             job_store.save_job(job)
-            logger.exception("latency-sleuth scheduler failed to dispatch run for template %s", template.id)
+            clear_active_jobs(template_ids, job["id"])
+            logger.exception("latency-sleuth scheduler failed to dispatch run for templates %s", template_ids)
             continue
         job_store.attach_celery_task(job, result.id)
         job_store.append_log(job, f"Scheduled job submitted to worker task {result.id}")
@@ -177,11 +382,14 @@ def _parse_timestamp(value) -> datetime | None:
     return None
 
 
+_RUN_JOB_TYPES = {"latency-sleuth.run_probe", "latency-sleuth.run_probe_batch"}
+
+
 def _resubmit_stale_jobs(celery_app, *, now=None) -> None:
     timestamp = now or utcnow()
     candidates, _ = job_store.list_jobs(limit=200, toolkits=["latency-sleuth"])
     for job in candidates:
-        if job.get("type") != "latency-sleuth.run_probe":
+        if job.get("type") not in _RUN_JOB_TYPES:
             continue
         if job.get("status") != "queued":
             continue
@@ -191,19 +399,8 @@ def _resubmit_stale_jobs(celery_app, *, now=None) -> None:
         if (timestamp - updated_at).total_seconds() < STALE_JOB_GRACE_SECONDS:
             continue
 
-        queue = getattr(getattr(celery_app, "conf", None), "task_default_queue", None) or "celery"
         try:
-            task = celery_app.tasks.get("worker.tasks.run_job")
-            if task is not None:
-                try:
-                    result = task.apply_async(args=[job["id"]], queue=queue)
-                except TypeError:
-                    result = task.apply_async(args=[job["id"]])
-            else:  # pragma: no cover - defensive
-                try:
-                    result = celery_app.send_task("worker.tasks.run_job", args=[job["id"]], queue=queue)
-                except TypeError:
-                    result = celery_app.send_task("worker.tasks.run_job", args=[job["id"]])
+            result = _submit_run_job(celery_app, job["id"])
         except Exception as exc:  # pragma: no cover - defensive guard
             job["status"] = "failed"
             job["error"] = str(exc)
@@ -216,24 +413,118 @@ def _resubmit_stale_jobs(celery_app, *, now=None) -> None:
         job_store.append_log(job, f"Resubmitted queued probe to worker task {result.id}")
 
 
+def _next_tick_delay(*, now=None) -> float:
+    """Seconds until the earliest upcoming run, clamped to the scheduler bounds."""
+
+    timestamp = now or utcnow()
+    upcoming = next_due_at(after=timestamp)
+    if upcoming is None:
+        return SCHEDULE_MAX_SLEEP_SECONDS
+    delay = (upcoming - timestamp).total_seconds()
+    return min(max(delay, SCHEDULE_MIN_SLEEP_SECONDS), SCHEDULE_MAX_SLEEP_SECONDS)
+
+
+def _wait_for_wakeup(subscription, delay: float):
+    """Block for *delay* seconds or until a schedule change is published.
+
+    Returns the subscription to reuse on the next tick, or ``None`` when it
+    could not be (re)established, in which case the wait degrades to a sleep.
+    """
+
+    try:
+        if subscription is None:
+            subscription = subscribe_schedule_changes()
+        deadline = time.monotonic() + delay
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return subscription
+            if subscription.get_message(timeout=remaining):
+                # Coalesce bursts of edits into a single wake-up.
+                while subscription.get_message(timeout=0):
+                    pass
+                return subscription
+    except Exception as exc:  # pragma: no cover - defensive guard
+        logger.warning("latency-sleuth scheduler lost schedule subscription: %s", exc)
+        time.sleep(delay)
+        return None
+
+
+def _refresh_leadership() -> bool:
+    """Acquire or renew the scheduler lease; only the holder drives scheduling."""
+
+    global _is_leader
+    leader = bool(_scheduler_owner) and hold_scheduler_lease(_scheduler_owner, SCHEDULER_LEASE_SECONDS)
+    if leader and not _is_leader:
+        logger.info("latency-sleuth scheduler %s acquired leadership", _scheduler_owner)
+        bootstrap_schedule()
+    elif _is_leader and not leader:
+        logger.warning("latency-sleuth scheduler %s lost leadership", _scheduler_owner)
+    _is_leader = leader
+    return leader
+
+
+def _release_leadership() -> None:
+    global _is_leader
+    if _is_leader and _scheduler_owner:
+        try:
+            release_scheduler_lease(_scheduler_owner)
+        except Exception:  # pragma: no cover - best effort during shutdown
+            logger.warning("latency-sleuth scheduler failed to release leadership", exc_info=True)
+    _is_leader = False
+
+
+def _scheduler_tick(celery_app) -> float:
+    """Run one scheduler iteration and return the seconds to wait before the next.
+
+    Standby processes only retry the lease; the leader never waits longer than
+    the renewal interval so its lease cannot lapse while idle.
+    """
+
+    if not _refresh_leadership():
+        return SCHEDULER_RENEW_SECONDS
+    _resubmit_stale_jobs(celery_app)
+    _dispatch_due_probes(celery_app)
+    return min(_next_tick_delay(), SCHEDULER_RENEW_SECONDS)
+
+
 def _scheduler_loop(celery_app) -> None:
     logger.info("latency-sleuth scheduler loop started")
+    subscription = None
     while True:
+        delay = SCHEDULER_RENEW_SECONDS
         try:
-            _resubmit_stale_jobs(celery_app)
-            _dispatch_due_probes(celery_app)
+            delay = _scheduler_tick(celery_app)
         except Exception as exc:  # pragma: no cover - defensive guard
             logger.exception("latency-sleuth scheduler tick failed: %s", exc)
-        time.sleep(SCHEDULE_INTERVAL_SECONDS)
+        subscription = _wait_for_wakeup(subscription, delay)
+
+
+def _notifier_loop() -> None:
+    """Deliver queued notifications from the scheduler leader only, so channel rate limits hold globally."""
+
+    logger.info("latency-sleuth notification dispatcher started")
+    asyncio.run(NotificationDispatcher().run(active=lambda: _is_leader))
+
+
+def _ensure_notifier() -> None:
+    global _notifier_thread
+    with _scheduler_lock:
+        if _notifier_thread and _notifier_thread.is_alive():
+            return
+        thread = threading.Thread(target=_notifier_loop, name="latency_sleuth_notifier", daemon=True)
+        thread.start()
+        _notifier_thread = thread
 
 
 def _ensure_scheduler(celery_app) -> None:
-    global _scheduler_thread
+    global _scheduler_thread, _scheduler_owner
     with _scheduler_lock:
         if _scheduler_thread and _scheduler_thread.is_alive():
             return
 
-        bootstrap_schedule()
+        _scheduler_owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex}"
+        atexit.register(_release_leadership)
 
         thread = threading.Thread(
             target=_scheduler_loop,
@@ -243,20 +534,22 @@ def _ensure_scheduler(celery_app) -> None:
         )
         thread.start()
         _scheduler_thread = thread
-        logger.info("latency-sleuth scheduler thread started")
+        logger.info("latency-sleuth scheduler thread started as %s", _scheduler_owner)
 
 
 def register(celery_app, register_handler: Callable[[str, JobHandler], None]) -> None:  # noqa: D401
     """Register worker handlers for the Latency Sleuth toolkit."""
 
     register_handler("latency-sleuth.run_probe", _handle_run_probe)
+    register_handler("latency-sleuth.run_probe_batch", _handle_run_probe_batch)
 
     global _scheduler_registered
     if _scheduler_registered:
         return
 
     _ensure_scheduler(celery_app)
+    _ensure_notifier()
     _scheduler_registered = True
 
 
-__all__ = ["register", "_handle_run_probe"]
+__all__ = ["register", "_handle_run_probe", "_handle_run_probe_batch"]